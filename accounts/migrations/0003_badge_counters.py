@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:23
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Umbrales vigentes al crear los contadores (ver core/services/badges.py)
+TIERS = [('leyenda', 10, 20), ('maestro', 6, 10), ('experto', 3, 5), ('novato', 1, 1)]
+
+
+def fill_badge_counters(apps, schema_editor):
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    Review = apps.get_model('reviews', 'Review')
+    UserAchievement = apps.get_model('achievements', 'UserAchievement')
+
+    reviews = dict(Review.objects.values_list('user_profile').annotate(total=Count('id')))
+    achievements = dict(UserAchievement.objects.values_list('user_profile').annotate(total=Count('id')))
+    profiles = []
+    for profile in UserProfile.objects.all():
+        profile.review_count = reviews.get(profile.pk, 0)
+        profile.achievement_count = achievements.get(profile.pk, 0)
+        profile.badge_tier = next(
+            (tier for tier, min_achievements, min_reviews in TIERS
+             if profile.achievement_count >= min_achievements or profile.review_count >= min_reviews),
+            'principiante',
+        )
+        profiles.append(profile)
+    UserProfile.objects.bulk_update(profiles, ['review_count', 'achievement_count', 'badge_tier'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_availability_status_userprofile_city_and_more'),
+        ('reviews', '0006_interview_questions'),
+        ('achievements', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='achievement_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Logros obtenidos'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='badge_tier',
+            field=models.CharField(choices=[('principiante', 'Principiante'), ('novato', 'Novato'), ('experto', 'Experto'), ('maestro', 'Maestro'), ('leyenda', 'Leyenda')], default='principiante', max_length=20, verbose_name='Insignia'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Reseñas escritas'),
+        ),
+        migrations.RunPython(fill_badge_counters, migrations.RunPython.noop),
+    ]
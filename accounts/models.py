@@ -154,17 +154,65 @@ class UserProfile(models.Model):
         help_text="Imagen opcional para tu perfil"
     )
     
+    # ===== CONTADORES DE INSIGNIA =====
+    # Se mantienen desde las señales de reseñas y logros (core/services/badges.py)
+    BADGE_TIER_CHOICES = [
+        ('principiante', 'Principiante'),
+        ('novato', 'Novato'),
+        ('experto', 'Experto'),
+        ('maestro', 'Maestro'),
+        ('leyenda', 'Leyenda'),
+    ]
+    
+    review_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Reseñas escritas"
+    )
+    
+    achievement_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Logros obtenidos"
+    )
+    
+    badge_tier = models.CharField(
+        max_length=20,
+        choices=BADGE_TIER_CHOICES,
+        default='principiante',
+        verbose_name="Insignia"
+    )
+    
     # ===== CAMPOS DE FECHA =====
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Fecha de creación"
     )
     
+    # Solo se escriben con UPDATE ... F() (core/services/badges.py)
+    COUNTER_FIELDS = ('review_count', 'achievement_count', 'badge_tier')
+
     # ===== MÉTODOS =====
     def __str__(self):
         """Representación en string del modelo"""
         return f"{self.user.username} - {self.get_role_display()}"
-    
+
+    def save(self, *args, **kwargs):
+        """
+        Un guardado completo de un perfil existente no escribe los contadores
+        de insignia: la instancia puede haberse cargado antes de que las
+        señales los ajustaran y los pisaría con valores viejos.
+        """
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+            and not args
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         """Configuración del modelo"""
         verbose_name = "Perfil de Usuario"
@@ -0,0 +1,65 @@
+# accounts/tests.py
+"""
+Pruebas de los contadores de insignia de UserProfile.
+
+Los contadores solo se escriben con UPDATE ... F() desde las señales
+(core/services/badges.py); un guardado completo de un perfil cargado antes
+no debe pisarlos con valores viejos.
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from accounts.models import UserProfile
+from companies.models import Company
+from core.services import badges
+from reviews.models import Review
+
+
+class BadgeCountersSaveTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='candidata', password='clave-segura-123')
+        self.company = Company.objects.create(
+            name='Empresa de Prueba', sector='Tecnología', location='Bogotá', is_active=True,
+        )
+
+    def _add_review(self):
+        return Review.objects.create(
+            user_profile_id=self.user.profile.pk,
+            company=self.company,
+            job_title='Desarrolladora',
+            modality='remoto',
+            communication_rating='good',
+            difficulty_rating='moderate',
+            response_time_rating='same_day',
+            overall_rating=4,
+            pros='Proceso claro',
+            cons='Demoras',
+            status='approved',
+        )
+
+    def test_user_save_keeps_counters_updated_after_load(self):
+        user = User.objects.select_related('profile').get(pk=self.user.pk)
+        self.assertEqual(user.profile.review_count, 0)
+
+        self._add_review()
+        # save_user_profile guarda user.profile, cargado antes de la reseña
+        user.save()
+
+        profile = UserProfile.objects.get(pk=user.profile.pk)
+        self.assertEqual(profile.review_count, 1)
+        self.assertEqual(profile.badge_tier, 'novato')
+        self.assertEqual(badges.reconcile(dry_run=True, profile_ids=[profile.pk]), 0)
+
+    def test_profile_save_writes_other_fields(self):
+        profile = UserProfile.objects.get(user=self.user)
+        self._add_review()
+
+        profile.bio = 'Nueva biografía'
+        profile.save()
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.bio, 'Nueva biografía')
+        self.assertEqual(profile.review_count, 1)
+        self.assertEqual(badges.reconcile(dry_run=True, profile_ids=[profile.pk]), 0)
@@ -19,6 +19,8 @@ from django.contrib.auth.models import User
 from django.db.models import Q
 from .models import UserProfile, OnboardingStatus
 from .forms import ProfileUpdateForm
+from core.services.badges import get_badge
+from core.services.profile_summary import get_profile_summary
 
 
 def login_view(request):
@@ -146,70 +148,13 @@ def logout_view(request):
     return redirect('login')
 
 
-def get_user_badge(user_profile):
-    """
-    Determina el badge del usuario basado en sus logros obtenidos.
-    Retorna un diccionario con nombre, icono y color del badge.
-    """
-    if user_profile.role != 'candidate':
-        return None
-    
-    from achievements.models import UserAchievement
-    from reviews.models import Review
-    
-    achievement_count = UserAchievement.objects.filter(user_profile=user_profile).count()
-    total_reviews = Review.objects.filter(user_profile=user_profile).count()
-    
-    # Determinar badge basado en logros y reseñas
-    if achievement_count >= 10 or total_reviews >= 20:
-        return {
-            'name': 'Leyenda',
-            'icon': 'fas fa-crown',
-            'color': 'warning',
-            'bg_color': 'bg-warning',
-            'text_color': 'text-dark'
-        }
-    elif achievement_count >= 6 or total_reviews >= 10:
-        return {
-            'name': 'Maestro',
-            'icon': 'fas fa-trophy',
-            'color': 'warning',
-            'bg_color': 'bg-warning',
-            'text_color': 'text-dark'
-        }
-    elif achievement_count >= 3 or total_reviews >= 5:
-        return {
-            'name': 'Experto',
-            'icon': 'fas fa-star',
-            'color': 'info',
-            'bg_color': 'bg-info',
-            'text_color': 'text-white'
-        }
-    elif achievement_count >= 1 or total_reviews >= 1:
-        return {
-            'name': 'Novato',
-            'icon': 'fas fa-seedling',
-            'color': 'success',
-            'bg_color': 'bg-success',
-            'text_color': 'text-white'
-        }
-    else:
-        return {
-            'name': 'Principiante',
-            'icon': 'fas fa-circle',
-            'color': 'secondary',
-            'bg_color': 'bg-secondary',
-            'text_color': 'text-white'
-        }
-
-
 @login_required
 def my_profile_view(request):
     """Vista para mostrar el perfil del usuario - Muestra la misma información para todos los roles"""
     user_profile = request.user.profile
     
     # Obtener badge del usuario
-    user_badge = get_user_badge(user_profile)
+    user_badge = get_badge(user_profile)
     
     # Para todos los roles, mostrar la misma información básica del perfil
     # Las estadísticas de candidato (logros, reseñas, etc.) solo se muestran si el usuario es candidato
@@ -219,58 +164,20 @@ def my_profile_view(request):
         'show_stats': user_profile.role == 'candidate',  # Solo mostrar stats para candidatos
     }
     
-    # Si es candidato, agregar estadísticas adicionales
+    # Si es candidato, agregar estadísticas adicionales (resumen cacheado)
     if user_profile.role == 'candidate':
-        # Importar modelos necesarios
-        from reviews.models import Review, PendingReview
-        from work_history.models import WorkHistory
-        from achievements.models import UserAchievement
-        
-        # Estadísticas para candidatos
-        total_reviews = Review.objects.filter(user_profile=user_profile).count()
-        approved_reviews = Review.objects.filter(
-            user_profile=user_profile,
-            status='approved'
-        ).count()
-        pending_approval = Review.objects.filter(
-            user_profile=user_profile,
-            status='pending'
-        ).count()
-        
-        pending_reviews = PendingReview.objects.filter(
-            user_profile=user_profile,
-            is_reviewed=False
-        ).select_related('company')
-        
-        # Historial laboral
-        work_history = WorkHistory.objects.filter(
-            user_profile=user_profile
-        ).select_related('company').order_by('-start_date')[:3]  # Solo las 3 más recientes para el perfil
-        
-        # Últimas 3 reseñas para el perfil
-        latest_reviews = Review.objects.filter(
-            user_profile=user_profile
-        ).select_related('company').order_by('-submission_date')[:3]
-        
-        # Contar logros obtenidos
-        achievement_count = UserAchievement.objects.filter(user_profile=user_profile).count()
-        user_achievements = UserAchievement.objects.filter(user_profile=user_profile).select_related('achievement').order_by('-earned_at')
-        
-        # Estadísticas adicionales para logros
-        companies_reviewed = Review.objects.filter(user_profile=user_profile).values('company').distinct().count()
-        work_experiences = WorkHistory.objects.filter(user_profile=user_profile).count()
-        
+        summary = get_profile_summary(user_profile)
         context.update({
-            'total_reviews': total_reviews,
-            'approved_reviews': approved_reviews,
-            'pending_approval': pending_approval,
-            'pending_reviews': pending_reviews,
-            'work_history': work_history,
-            'latest_reviews': latest_reviews,
-            'achievement_count': achievement_count,
-            'user_achievements': user_achievements,
-            'companies_reviewed': companies_reviewed,
-            'work_experiences': work_experiences,
+            'total_reviews': summary['total_reviews'],
+            'approved_reviews': summary['approved_reviews'],
+            'pending_approval': summary['pending_approval'],
+            'pending_reviews': summary['pending_reviews'],
+            'work_history': summary['work_history'][:3],  # Solo las 3 más recientes para el perfil
+            'latest_reviews': summary['latest_reviews'][:3],
+            'achievement_count': summary['achievement_count'],
+            'user_achievements': summary['user_achievements'],
+            'companies_reviewed': summary['companies_reviewed'],
+            'work_experiences': summary['work_experiences'],
         })
     else:
         # Para company_rep y staff, no mostrar estadísticas de candidato
@@ -300,7 +207,7 @@ def view_user_profile_view(request, user_id):
     from django.contrib.auth.models import User
     
     try:
-        target_user = User.objects.get(id=user_id)
+        target_user = User.objects.select_related('profile').get(id=user_id)
         target_profile = target_user.profile
         
         # No permitir ver tu propio perfil desde esta vista (deben usar my_profile)
@@ -312,62 +219,24 @@ def view_user_profile_view(request, user_id):
         return redirect('dashboard')
     
     # Obtener badge del usuario
-    user_badge = get_user_badge(target_profile)
-    
-    # Obtener información del usuario
-    from reviews.models import Review
-    from work_history.models import WorkHistory
-    from achievements.models import UserAchievement
-    
-    # Estadísticas del usuario
-    total_reviews = Review.objects.filter(user_profile=target_profile).count()
-    approved_reviews = Review.objects.filter(
-        user_profile=target_profile,
-        status='approved'
-    ).count()
-    rejected_reviews = Review.objects.filter(
-        user_profile=target_profile,
-        status='rejected'
-    ).count()
-    pending_reviews = Review.objects.filter(
-        user_profile=target_profile,
-        status='pending'
-    ).count()
-    
-    # Últimas reseñas
-    latest_reviews = Review.objects.filter(
-        user_profile=target_profile
-    ).select_related('company').order_by('-submission_date')[:5]
-    
-    # Historial laboral
-    work_history = WorkHistory.objects.filter(
-        user_profile=target_profile
-    ).select_related('company').order_by('-start_date')
-    
-    # Logros
-    achievement_count = UserAchievement.objects.filter(user_profile=target_profile).count()
-    user_achievements = UserAchievement.objects.filter(
-        user_profile=target_profile
-    ).select_related('achievement').order_by('-earned_at')[:10]
+    user_badge = get_badge(target_profile)
     
-    # Empresas reseñadas
-    companies_reviewed = Review.objects.filter(
-        user_profile=target_profile
-    ).values('company').distinct().count()
+    # Estadísticas, reseñas, historial y logros del usuario (resumen cacheado)
+    summary = get_profile_summary(target_profile)
     
     context = {
         'user_profile': target_profile,
         'target_user': target_user,
         'user_badge': user_badge,
-        'total_reviews': total_reviews,
-        'approved_reviews': approved_reviews,
-        'rejected_reviews': rejected_reviews,
-        'pending_reviews': pending_reviews,
-        'latest_reviews': latest_reviews,
-        'work_history': work_history,
-        'achievement_count': achievement_count,
-        'user_achievements': user_achievements,
-        'companies_reviewed': companies_reviewed,
+        'total_reviews': summary['total_reviews'],
+        'approved_reviews': summary['approved_reviews'],
+        'rejected_reviews': summary['rejected_reviews'],
+        'pending_reviews': summary['pending_approval'],
+        'latest_reviews': summary['latest_reviews'],
+        'work_history': summary['work_history'],
+        'achievement_count': summary['achievement_count'],
+        'user_achievements': summary['user_achievements'][:10],
+        'companies_reviewed': summary['companies_reviewed'],
         'is_viewing_other_profile': True,  # Flag para indicar que es perfil de otro usuario
     }
     
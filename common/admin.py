@@ -2,6 +2,18 @@
 # Configuración del admin para los modelos de common
 
 from django.contrib import admin
+from .models import CacheGeneration
 
-# Por ahora este archivo está vacío, pero puede contener
-# configuración de admin para modelos compartidos en el futuro
\ No newline at end of file
+
+# ===== ADMIN: GENERACIONES DE CACHÉ =====
+@admin.register(CacheGeneration)
+class CacheGenerationAdmin(admin.ModelAdmin):
+    """
+    Configuración del admin para el modelo CacheGeneration.
+    Solo lectura: los contadores se incrementan desde las señales.
+    """
+
+    list_display = ['namespace', 'generation', 'updated_at']
+    search_fields = ['namespace']
+    readonly_fields = ['namespace', 'generation', 'updated_at']
+    ordering = ['namespace']
@@ -0,0 +1,141 @@
+# =============================================================================
+# MIDDLEWARE DE LA APLICACIÓN COMMON - SelecLoop
+# =============================================================================
+# CompressionMiddleware: comprime con brotli o gzip (según Accept-Encoding)
+# las respuestas de la API, feeds y archivos de texto.
+#
+# - Solo tipos de contenido de COMPRESSION_CONTENT_TYPES. Las páginas HTML
+#   quedan fuera: llevan el token CSRF junto a texto del usuario y
+#   comprimirlas las expone a ataques tipo BREACH.
+# - Solo respuestas de al menos COMPRESSION_MIN_SIZE bytes; en las pequeñas
+#   el encabezado gzip cuesta más de lo que ahorra.
+# - Las respuestas en streaming (NDJSON, CSV) se comprimen por bloques.
+# - Brotli se usa si está instalado el paquete 'brotli' y el cliente lo
+#   acepta; si no, gzip.
+# - Las respuestas que ya traen Content-Encoding (documentos precalculados
+#   .gz, CSV con ?gzip=1) se envían tal cual.
+# =============================================================================
+
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+DEFAULT_CONTENT_TYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/xml',
+    'text/csv',
+    'text/plain',
+    'text/xml',
+)
+
+# Compresión moderada: en respuestas dinámicas importa más la CPU que el
+# último porcentaje de tamaño
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+_accept_encoding_re = re.compile(r'\s*([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$', re.IGNORECASE)
+
+
+def accepted_encodings(header):
+    """Codificaciones aceptadas (q > 0) de un encabezado Accept-Encoding"""
+    accepted = set()
+    for item in (header or '').split(','):
+        match = _accept_encoding_re.match(item)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+        if quality > 0:
+            accepted.add(match.group(1).lower())
+    return accepted
+
+
+def choose_encoding(header):
+    """'br', 'gzip' o None según lo que acepta el cliente"""
+    accepted = accepted_encodings(header)
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_stream(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressionMiddleware:
+    """Compresión negociada (brotli/gzip) de las respuestas de texto"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.content_types = tuple(getattr(settings, 'COMPRESSION_CONTENT_TYPES', DEFAULT_CONTENT_TYPES))
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self._compressible(response):
+            return response
+
+        # La respuesta depende de Accept-Encoding aunque este cliente no comprima
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = _compress_stream(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            compressed = _compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # El ETag fuerte identifica los bytes sin comprimir; como en
+        # GZipMiddleware de Django se convierte en débil
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compressible(self, response):
+        if response.has_header('Content-Encoding') or response.status_code < 200 or response.status_code == 304:
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type in self.content_types
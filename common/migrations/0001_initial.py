@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('namespace', models.CharField(help_text='Identificador del grupo de datos cacheados (ej: company:12)', max_length=100, unique=True, verbose_name='Espacio de nombres')),
+                ('generation', models.BigIntegerField(default=0, help_text='Se incrementa cada vez que cambian los datos del espacio', verbose_name='Generación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+            ],
+            options={
+                'verbose_name': 'Generación de Caché',
+                'verbose_name_plural': 'Generaciones de Caché',
+            },
+        ),
+    ]
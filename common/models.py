@@ -3,11 +3,48 @@
 # =============================================================================
 # Este archivo define modelos y utilidades compartidas
 #
-# Nota: Esta app no contiene modelos específicos por ahora,
-# pero puede contener modelos base o utilidades compartidas en el futuro
+# Modelos:
+# - CacheGeneration: Contador de generación para invalidar cachés entre nodos
 # =============================================================================
 
-# Por ahora este archivo está vacío, pero puede contener:
-# - Modelos base abstractos
-# - Utilidades compartidas
-# - Mixins para otros modelos
\ No newline at end of file
+from django.db import models
+
+
+# ===== MODELO: GENERACIÓN DE CACHÉ =====
+class CacheGeneration(models.Model):
+    """
+    Contador de generación por espacio de nombres (ej: 'company:12',
+    'user:5', 'platform').
+
+    Las claves de caché incluyen la generación de su espacio de nombres.
+    Incrementar el contador invalida todas las entradas del espacio en
+    todos los nodos, ya que todos leen la misma base de datos.
+    """
+
+    namespace = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="Espacio de nombres",
+        help_text="Identificador del grupo de datos cacheados (ej: company:12)"
+    )
+
+    generation = models.BigIntegerField(
+        default=0,
+        verbose_name="Generación",
+        help_text="Se incrementa cada vez que cambian los datos del espacio"
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Última actualización"
+    )
+
+    # ===== MÉTODOS =====
+    def __str__(self):
+        """Representación en string del modelo"""
+        return f"{self.namespace} (gen {self.generation})"
+
+    class Meta:
+        """Configuración del modelo"""
+        verbose_name = "Generación de Caché"
+        verbose_name_plural = "Generaciones de Caché"
@@ -10,6 +10,11 @@ urlpatterns = [
     # Robots.txt para motores de búsqueda
     path('robots.txt', views.robots_txt_view, name='robots_txt'),
 
-    # Sitemap.xml para motores de búsqueda
+    # Sitemap.xml para motores de búsqueda (índice de las partes)
     path('sitemap.xml', views.sitemap_xml_view, name='sitemap'),
+
+    # Partes del sitemap: comprimidas (.xml.gz, las que lista el índice) o XML
+    path('sitemap-<slug:section>-<int:chunk>.xml.gz', views.sitemap_chunk_view, name='sitemap_chunk'),
+    path('sitemap-<slug:section>-<int:chunk>.xml', views.sitemap_chunk_view, {'compressed': False},
+         name='sitemap_chunk_xml'),
 ]
@@ -5,14 +5,26 @@
 #
 # Vistas principales:
 # - robots_txt_view: Robots.txt para SEO
-# - sitemap_xml_view: Sitemap.xml para SEO
+# - sitemap_xml_view: Índice del sitemap para SEO
+# - sitemap_chunk_view: Partes del sitemap (comprimidas con gzip)
 # =============================================================================
 
-from django.http import HttpResponse
+import gzip
+
+from django.http import Http404, HttpResponse
 from django.template.loader import render_to_string
-from companies.models import Company
+from django.utils.cache import patch_vary_headers
+from core.services import sitemaps
+from core.services.http_caching import conditional, host_etag, make_etag, seo_policy
+
 
+def _base_url(request):
+    """Protocolo y dominio para URLs absolutas"""
+    protocol = 'https' if request.is_secure() else 'http'
+    return f"{protocol}://{request.get_host()}"
 
+
+@conditional(etag_func=host_etag, policy=seo_policy)
 def robots_txt_view(request):
     """
     Vista para servir el archivo robots.txt - Guía para motores de búsqueda
@@ -27,46 +39,75 @@ def robots_txt_view(request):
     - Evita indexación de áreas sensibles (admin, staff)
     - Referencia al sitemap para mejor crawling
     """
-    # Obtener el protocolo y dominio para URLs absolutas
-    protocol = 'https' if request.is_secure() else 'http'
-    domain = request.get_host()
+    robots_content = render_to_string('core/robots.txt', {'request': request})
+    return HttpResponse(robots_content, content_type='text/plain')
 
-    context = {
-        'protocol': protocol,
-        'domain': domain,
-    }
 
-    robots_content = render_to_string('core/robots.txt', context)
-    return HttpResponse(robots_content, content_type='text/plain')
+# ===== SITEMAP =====
+
+def _index_etag(request):
+    signature = ','.join(sitemaps.entry_signature(entry) for entry in sitemaps.sitemap_entries())
+    return make_etag('sitemap-index', _base_url(request), sitemaps.chunk_size(), signature)
+
+
+def _index_last_modified(request):
+    dates = [entry['lastmod'] for entry in sitemaps.sitemap_entries() if entry['lastmod']]
+    return max(dates) if dates else None
 
 
+@conditional(etag_func=_index_etag, last_modified_func=_index_last_modified, policy=seo_policy)
 def sitemap_xml_view(request):
     """
-    Vista para servir el archivo sitemap.xml - Mapa del sitio para SEO
+    Vista para servir el índice del sitemap - Mapa del sitio para SEO
 
-    Genera dinámicamente el sitemap XML que incluye:
-    - Página principal y páginas estáticas
-    - Todas las empresas activas con sus URLs
-    - Metadatos de última modificación y prioridad
+    Lista las partes del sitemap (páginas fijas y empresas activas en
+    bloques de hasta 50.000 URLs) con la fecha de su último cambio, para
+    que los motores de búsqueda descarguen solo las partes que cambiaron.
+    Ver core/services/sitemaps.py.
 
     SEO Benefits:
     - Ayuda a motores de búsqueda a encontrar todas las páginas
     - Proporciona información sobre frecuencia de actualización
     - Prioriza páginas importantes para crawling
-    - Incluye datos geo-localizados para SEO local
     """
-    # Obtener todas las empresas activas para incluir en sitemap
-    companies = Company.objects.filter(is_active=True).order_by('name')
+    return HttpResponse(sitemaps.render_index(_base_url(request)), content_type='application/xml')
 
-    # Obtener el protocolo y dominio para URLs absolutas
-    protocol = 'https' if request.is_secure() else 'http'
-    domain = request.get_host()
 
-    context = {
-        'companies': companies,
-        'protocol': protocol,
-        'domain': domain,
-    }
+def _chunk_etag(request, section, chunk, compressed=True):
+    entry = sitemaps.find_entry(section, chunk)
+    if entry is None:
+        return None
+    return make_etag(
+        'sitemap', section, chunk, sitemaps.chunk_size(), _base_url(request), sitemaps.entry_signature(entry),
+        compressed, request.headers.get('Accept-Encoding', '') if not compressed else '',
+    )
+
+
+def _chunk_last_modified(request, section, chunk, compressed=True):
+    entry = sitemaps.find_entry(section, chunk)
+    return entry['lastmod'] if entry else None
+
+
+@conditional(etag_func=_chunk_etag, last_modified_func=_chunk_last_modified, policy=seo_policy)
+def sitemap_chunk_view(request, section, chunk, compressed=True):
+    """
+    Vista para servir una parte del sitemap.
+
+    En .xml.gz se entrega el archivo gzip tal cual (así lo lista el índice);
+    en .xml se envía comprimido con Content-Encoding si el cliente lo acepta.
+    """
+    entry = sitemaps.find_entry(section, chunk)
+    if entry is None:
+        raise Http404("Parte del sitemap inexistente")
+
+    data = sitemaps.chunk_gzip(_base_url(request), entry)
+    if compressed:
+        return HttpResponse(data, content_type='application/gzip')
 
-    sitemap_content = render_to_string('core/sitemap.xml', context)
-    return HttpResponse(sitemap_content, content_type='application/xml')
\ No newline at end of file
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(data, content_type='application/xml')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(gzip.decompress(data), content_type='application/xml')
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
@@ -0,0 +1,756 @@
+# =============================================================================
+# ANALÍTICA DE EMPRESAS - SelecLoop
+# =============================================================================
+# Este archivo contiene el cálculo de estadísticas y datos para gráficos
+# que muestran company_detail_view y company_dashboard_view.
+#
+# Las funciones son puras respecto al request: reciben la empresa y el
+# queryset a analizar y retornan diccionarios serializables, lo que permite
+# guardarlos en caché (ver core/services/analytics_cache.py).
+# =============================================================================
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Q, Avg, Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from reviews.models import Review
+from core.services.review_snapshot import (
+    COMMUNICATION_SCORES, DIFFICULTY_SCORES, RESPONSE_TIME_SCORES,
+)
+
+# Escalas para promediar las calificaciones por categoría (las mismas del
+# snapshot de reseñas, ver core/services/review_snapshot.py)
+RATING_SCORES = {
+    'communication_rating': COMMUNICATION_SCORES,
+    'difficulty_rating': DIFFICULTY_SCORES,
+    'response_time_rating': RESPONSE_TIME_SCORES,
+}
+
+
+def build_company_detail_analytics(company, reviews_for_stats, user_role):
+    """
+    Calcula company_stats, chart_data y role_kpis para la vista de detalle.
+
+    reviews_for_stats: reseñas sobre las que se calculan las estadísticas
+    (depende del rol del usuario que visita la página).
+    user_role: rol del usuario, determina qué KPIs se incluyen.
+    """
+    # Promedios numéricos
+
+    avg_overall = reviews_for_stats.aggregate(v=Avg('overall_rating'))['v'] or 0
+
+    def avg_from_choices(qs, field, scores):
+        total = 0
+        count = 0
+        for val, c in qs.values_list(field).annotate(cnt=Count('pk')):
+            if val in scores:
+                total += scores[val] * qs.filter(**{field: val}).count()
+                count += qs.filter(**{field: val}).count()
+        return (total / count) if count else 0
+
+    avg_communication = avg_from_choices(reviews_for_stats, 'communication_rating', COMMUNICATION_SCORES)
+    avg_difficulty = avg_from_choices(reviews_for_stats, 'difficulty_rating', DIFFICULTY_SCORES)
+    avg_response_time = avg_from_choices(reviews_for_stats, 'response_time_rating', RESPONSE_TIME_SCORES)
+
+    total_reviews_stats = reviews_for_stats.count()
+    company_stats = {
+        'avg_overall': avg_overall,
+        'avg_communication': avg_communication,
+        'avg_difficulty': avg_difficulty,
+        'avg_response_time': avg_response_time,
+        'total_reviews': total_reviews_stats,
+    }
+
+    # ===== DATOS PARA GRÁFICOS =====
+    chart_data = {
+        'ratings': {},
+        'modality': {},
+        'status': {},
+        'timeline': {},
+        'strengths_weaknesses': {}
+    }
+    
+    if reviews_for_stats.exists():
+        # Datos de distribución de calificaciones
+        rating_counts = {}
+        for i in range(1, 6):
+            count = reviews_for_stats.filter(overall_rating=i).count()
+            rating_counts[f'{i} estrella{"s" if i > 1 else ""}'] = count
+        chart_data['ratings'] = rating_counts
+        
+        # Datos de modalidad
+        modality_counts = {}
+        for modality, _ in Review.MODALITY_CHOICES:
+            count = reviews_for_stats.filter(modality=modality).count()
+            if count > 0:
+                modality_counts[modality.title()] = count
+        chart_data['modality'] = modality_counts
+        
+        # Datos de estado
+        status_counts = {}
+        for status, _ in Review.STATUS_CHOICES:
+            count = reviews_for_stats.filter(status=status).count()
+            if count > 0:
+                status_counts[status.title()] = count
+        chart_data['status'] = status_counts
+        
+        # Datos de timeline - obtener todos los meses donde hay reseñas
+        timeline_data = {}
+        
+        # Obtener todos los meses únicos donde hay reseñas
+        timeline_months = reviews_for_stats.annotate(
+            month=TruncMonth('submission_date')
+        ).values('month').annotate(
+            count=Count('id')
+        ).order_by('month')
+        
+        # Crear diccionario con formato de fecha legible
+        for item in timeline_months:
+            month_date = item['month']
+            if month_date:
+                month_name = month_date.strftime('%b %Y')
+                timeline_data[month_name] = item['count']
+        
+        chart_data['timeline'] = timeline_data
+        
+        # Debug: Agregar información adicional para verificar
+        chart_data['debug_info'] = {
+            'total_reviews': reviews_for_stats.count(),
+            'latest_review_date': reviews_for_stats.order_by('-submission_date').first().submission_date if reviews_for_stats.exists() else None,
+            'current_time': timezone.now().isoformat(),
+            'ratings_data': chart_data['ratings'],
+            'modality_data': chart_data['modality'],
+            'status_data': chart_data['status'],
+            'timeline_data': chart_data['timeline'],
+            'strengths_data': chart_data['strengths_weaknesses']
+        }
+        
+        # Gráfico de Fortalezas y Debilidades (Radar Chart)
+        strengths_weaknesses = {}
+        
+        # Calcular promedios por aspecto (usando solo campos disponibles)
+        aspects = {
+            'communication_rating': 'Comunicación',
+            'difficulty_rating': 'Dificultad del Proceso', 
+            'response_time_rating': 'Tiempo de Respuesta',
+            'overall_rating': 'Calificación General'
+        }
+        
+        for field, label in aspects.items():
+            if field == 'overall_rating':
+                # Para overall_rating usamos Avg directamente
+                avg_rating = reviews_for_stats.aggregate(
+                    avg=Avg(field)
+                )['avg']
+                if avg_rating is not None:
+                    strengths_weaknesses[label] = round(avg_rating, 1)
+            else:
+                # Para los otros campos, necesitamos convertir las opciones a números
+                # Calcular promedio manualmente
+                total_score = 0
+                count = 0
+                for review in reviews_for_stats:
+                    rating_value = RATING_SCORES[field].get(getattr(review, field), 0)
+                    if rating_value > 0:
+                        total_score += rating_value
+                        count += 1
+                
+                if count > 0:
+                    avg_rating = total_score / count
+                    strengths_weaknesses[label] = round(avg_rating, 1)
+        
+        chart_data['strengths_weaknesses'] = strengths_weaknesses
+        
+        # Datos de distribución de tiempo de respuesta
+        response_time_counts = {}
+        response_time_labels = {
+            'immediate': 'Inmediata',
+            'same_day': 'Mismo día',
+            'next_day': 'Al día siguiente',
+            'few_days': 'En pocos días',
+            'slow': 'Lenta'
+        }
+        for response_time, _ in Review.RESPONSE_TIME_CHOICES:
+            count = reviews_for_stats.filter(response_time_rating=response_time).count()
+            if count > 0:
+                response_time_counts[response_time_labels[response_time]] = count
+        chart_data['response_time_distribution'] = response_time_counts
+    
+    # ===== Estadísticas específicas por rol =====
+    role_kpis = {}
+
+    if user_role == 'candidate':
+        # Estadísticas útiles para candidatos
+        since_90 = timezone.now() - timedelta(days=90)
+        last90_reviews = reviews_for_stats.filter(submission_date__gte=since_90)
+
+        # Tasa de respuesta rápida (últimos 90 días)
+        fast_responses = last90_reviews.filter(response_time_rating__in=['immediate', 'same_day']).count()
+        fast_response_rate = (fast_responses / last90_reviews.count()) * 100 if last90_reviews.count() > 0 else 0
+
+        # Modalidad más recomendada
+        top_modality = reviews_for_stats.values('modality').annotate(
+            count=Count('id'),
+            avg_rating=Avg('overall_rating')
+        ).order_by('-avg_rating', '-count').first()
+
+        # Calcular promedios para todas las modalidades (para rotación en el mensaje)
+        # Asegurar que siempre incluimos las 3 modalidades principales si tienen datos
+        all_modalities = reviews_for_stats.values('modality').annotate(
+            count=Count('id'),
+            avg_rating=Avg('overall_rating')
+        ).order_by('modality')
+        
+        modalities_data = []
+        # Mapeo de modalidades para normalizar nombres (remoto = online)
+        modality_map = {
+            'presencial': 'presencial',
+            'remoto': 'online',
+            'online': 'online',
+            'hibrido': 'híbrido',
+            'hybrid': 'híbrido',
+            'híbrido': 'híbrido'
+        }
+        
+        for mod in all_modalities:
+            if mod['modality'] and mod['count'] > 0:
+                # Normalizar el nombre de la modalidad
+                normalized_modality = modality_map.get(mod['modality'].lower(), mod['modality'].lower())
+                modalities_data.append({
+                    'modality': normalized_modality,
+                    'avg_rating': round(mod['avg_rating'], 1),
+                    'count': mod['count']
+                })
+        
+        # Ordenar por orden específico: presencial, online, híbrido
+        modality_order = {'presencial': 0, 'online': 1, 'híbrido': 2}
+        modalities_data.sort(key=lambda x: modality_order.get(x['modality'], 999))
+
+        # Nivel de dificultad promedio
+        difficulty_distribution = reviews_for_stats.values('difficulty_rating').annotate(
+            count=Count('id')
+        ).order_by('difficulty_rating')
+
+        # Calidad de comunicación
+        comm_distribution = reviews_for_stats.values('communication_rating').annotate(
+            count=Count('id')
+        ).order_by('communication_rating')
+        
+        # Calcular promedios para las métricas de calidad (usar la misma función que más arriba)
+        avg_communication = avg_from_choices(reviews_for_stats, 'communication_rating', COMMUNICATION_SCORES)
+        avg_difficulty = avg_from_choices(reviews_for_stats, 'difficulty_rating', DIFFICULTY_SCORES)
+        avg_response_time = avg_from_choices(reviews_for_stats, 'response_time_rating', RESPONSE_TIME_SCORES)
+
+        role_kpis = {
+            'role': 'candidate',
+            'avg_overall': avg_overall,
+            'last90_reviews_count': last90_reviews.count(),
+            'fast_response_rate': round(fast_response_rate, 1),
+            'top_modality': top_modality['modality'] if top_modality else None,
+            'top_modality_rating': round(top_modality['avg_rating'], 1) if top_modality else 0,
+            'modalities_data': modalities_data,  # Datos de todas las modalidades para rotación
+            'difficulty_distribution': list(difficulty_distribution),
+            'communication_distribution': list(comm_distribution),
+            'total_reviews': reviews_for_stats.count(),
+            'avg_communication': avg_communication,  # Promedio de comunicación (1-5)
+            'avg_difficulty': avg_difficulty,  # Promedio de dificultad (1-5)
+            'avg_response_time': avg_response_time,  # Promedio de tiempo de respuesta (1-5)
+        }
+    elif user_role == 'company_rep':
+        # Estadísticas útiles para representantes de empresa
+        all_company_reviews = Review.objects.filter(company=company)
+
+        # Ratios de aprobación
+        total_reviews = all_company_reviews.count()
+        approved_count = all_company_reviews.filter(status='approved').count()
+        rejected_count = all_company_reviews.filter(status='rejected').count()
+
+        approval_rate = (approved_count / total_reviews) * 100 if total_reviews > 0 else 0
+        rejection_rate = (rejected_count / total_reviews) * 100 if total_reviews > 0 else 0
+
+        # Compromiso de tiempo de respuesta (aprobadas con respuesta rápida)
+        compromiso_compliant = all_company_reviews.filter(
+            status='approved',
+            response_time_rating__in=['immediate', 'same_day']
+        ).count()
+        compromiso_rate = (compromiso_compliant / approved_count) * 100 if approved_count > 0 else 0
+
+        # Tendencia mensual - obtener todos los meses donde hay reseñas
+        # Obtener todos los meses únicos donde hay reseñas, sin límite de tiempo
+        monthly_trend = all_company_reviews.annotate(
+            month=TruncMonth('submission_date')
+        ).values('month').annotate(
+            count=Count('id'),
+            approved=Count('id', filter=Q(status='approved')),
+            avg_rating=Avg('overall_rating')
+        ).order_by('month')
+        
+        # Calificaciones por mes
+        monthly_ratings = list(monthly_trend)
+        
+        # Agregar datos mensuales al chart_data para el gráfico
+        if monthly_ratings:
+            chart_data['monthly_comparison'] = {
+                str(item['month']): {
+                    'count': item['count'],
+                    'approved': item['approved'],
+                    'avg_rating': float(item['avg_rating']) if item['avg_rating'] else 0
+                }
+                for item in monthly_ratings
+            }
+
+        # Generar recomendaciones inteligentes
+        recommendations = []
+        
+        if avg_communication < 4:
+            recommendations.append({
+                'type': 'warning',
+                'icon': 'fas fa-comments',
+                'title': 'Mejorar Comunicación',
+                'description': f'Tu calificación de comunicación es {avg_communication:.1f}/5. Considera ser más claro y transparente en tus respuestas a los candidatos.',
+                'action': 'Revisa tus procesos de comunicación y asegúrate de dar feedback claro y oportuno.'
+            })
+        
+        if avg_response_time < 4:
+            recommendations.append({
+                'type': 'info',
+                'icon': 'fas fa-clock',
+                'title': 'Acelerar Respuestas',
+                'description': f'Tu tiempo de respuesta promedio es {avg_response_time:.1f}/5. Los candidatos valoran respuestas rápidas.',
+                'action': 'Establece un SLA de respuesta de máximo 24 horas para dar mejor impresión.'
+            })
+        
+        if rejection_rate > 30:
+            recommendations.append({
+                'type': 'danger',
+                'icon': 'fas fa-exclamation-triangle',
+                'title': 'Alta Tasa de Rechazo',
+                'description': f'El {rejection_rate:.1f}% de tus reseñas son rechazadas. Esto puede indicar problemas en tu proceso.',
+                'action': 'Revisa las reseñas rechazadas para entender qué está causando el rechazo automático.'
+            })
+        
+        if approval_rate < 70:
+            recommendations.append({
+                'type': 'warning',
+                'icon': 'fas fa-chart-line',
+                'title': 'Baja Tasa de Aprobación',
+                'description': f'Solo el {approval_rate:.1f}% de tus reseñas son aprobadas. Mejora la calidad de tus procesos.',
+                'action': 'Analiza las reseñas aprobadas para replicar lo que funciona bien.'
+            })
+        
+        if compromiso_rate < 50:
+            recommendations.append({
+                'type': 'info',
+                'icon': 'fas fa-bolt',
+                'title': 'Mejorar Velocidad de Respuesta',
+                'description': f'Solo el {compromiso_rate:.1f}% de tus reseñas aprobadas tienen respuesta rápida.',
+                'action': 'Implementa respuestas automáticas y establece procesos más ágiles.'
+            })
+        
+        if avg_overall < 3.5:
+            recommendations.append({
+                'type': 'danger',
+                'icon': 'fas fa-star',
+                'title': 'Calificación General Baja',
+                'description': f'Tu calificación promedio es {avg_overall:.1f}/5. Necesitas mejorar varios aspectos.',
+                'action': 'Revisa todas las áreas de mejora y crea un plan de acción prioritario.'
+            })
+        
+        if not recommendations:
+            recommendations.append({
+                'type': 'success',
+                'icon': 'fas fa-check-circle',
+                'title': '¡Excelente Trabajo!',
+                'description': 'Tus métricas están en buen nivel. Sigue así y continúa mejorando.',
+                'action': 'Mantén la calidad y considera implementar mejoras incrementales.'
+            })
+        
+        # Datos para comparación mes a mes
+        monthly_comparison = []
+        if len(monthly_ratings) >= 2:
+            for i in range(1, len(monthly_ratings)):
+                prev_month = monthly_ratings[i-1]
+                curr_month = monthly_ratings[i]
+                
+                # Calcular rechazadas para cada mes
+                prev_rejected = prev_month['count'] - prev_month['approved']
+                curr_rejected = curr_month['count'] - curr_month['approved']
+                
+                rating_change = curr_month['avg_rating'] - prev_month['avg_rating']
+                count_change = curr_month['count'] - prev_month['count']
+                approval_change = curr_month['approved'] - prev_month['approved']
+                rejection_change = curr_rejected - prev_rejected
+                
+                monthly_comparison.append({
+                    'month': curr_month['month'],
+                    'prev_month': prev_month['month'],  # Mes anterior para mostrar
+                    'prev_rating': prev_month['avg_rating'],
+                    'curr_rating': curr_month['avg_rating'],
+                    'rating_change': rating_change,
+                    'prev_count': prev_month['count'],
+                    'curr_count': curr_month['count'],
+                    'count_change': count_change,
+                    'prev_approved': prev_month['approved'],
+                    'curr_approved': curr_month['approved'],
+                    'approval_change': approval_change,
+                    'prev_rejected': prev_rejected,
+                    'curr_rejected': curr_rejected,
+                    'rejection_change': rejection_change,
+                })
+        
+        role_kpis = {
+            'role': 'company_rep',
+            'avg_overall': avg_overall,
+            'total_reviews': total_reviews,
+            'approved_count': approved_count,
+            'rejected_count': rejected_count,
+            'approval_rate': round(approval_rate, 1),
+            'rejection_rate': round(rejection_rate, 1),
+            'compromiso_rate': round(compromiso_rate, 1),
+            'monthly_trend': monthly_ratings,
+            'monthly_comparison': monthly_comparison,
+            'avg_communication': avg_communication,
+            'avg_difficulty': avg_difficulty,
+            'avg_response_time': avg_response_time,
+            'recommendations': recommendations,
+    }
+
+    return company_stats, chart_data, role_kpis
+
+
+def build_company_dashboard_analytics(company):
+    """
+    Calcula chart_data y role_kpis para el dashboard del representante
+    de empresa (todas las reseñas de la empresa).
+    """
+    # Obtener todas las reseñas de la empresa (para estadísticas)
+    all_company_reviews = Review.objects.filter(company=company)
+    
+    # Estadísticas para company_rep (siempre calcular, incluso si no hay reseñas)
+    total_reviews = all_company_reviews.count()
+    approved_count = all_company_reviews.filter(status='approved').count()
+    rejected_count = all_company_reviews.filter(status='rejected').count()
+    
+    approval_rate = (approved_count / total_reviews) * 100 if total_reviews > 0 else 0
+    rejection_rate = (rejected_count / total_reviews) * 100 if total_reviews > 0 else 0
+    
+    # Compromiso de tiempo de respuesta (aprobadas con respuesta rápida)
+    compromiso_compliant = all_company_reviews.filter(
+        status='approved',
+        response_time_rating__in=['immediate', 'same_day']
+    ).count()
+    compromiso_rate = (compromiso_compliant / approved_count) * 100 if approved_count > 0 else 0
+    
+    # Calcular promedios (solo si hay reseñas)
+    if all_company_reviews.exists():
+        avg_overall = all_company_reviews.aggregate(avg=Avg('overall_rating'))['avg'] or 0
+    else:
+        avg_overall = 0
+    
+    def avg_from_choices(qs, field, scores):
+        total = 0
+        count = 0
+        for val in qs.order_by().values_list(field, flat=True).distinct():
+            if val in scores:
+                val_count = qs.filter(**{field: val}).count()
+                total += scores[val] * val_count
+                count += val_count
+        return (total / count) if count else 0
+    
+    # Calcular promedios solo si hay reseñas
+    if all_company_reviews.exists():
+        avg_communication = avg_from_choices(all_company_reviews, 'communication_rating', COMMUNICATION_SCORES)
+        avg_difficulty = avg_from_choices(all_company_reviews, 'difficulty_rating', DIFFICULTY_SCORES)
+        avg_response_time = avg_from_choices(all_company_reviews, 'response_time_rating', RESPONSE_TIME_SCORES)
+    else:
+        avg_communication = 0
+        avg_difficulty = 0
+        avg_response_time = 0
+    
+    # Tendencia mensual
+    monthly_trend = all_company_reviews.annotate(
+        month=TruncMonth('submission_date')
+    ).values('month').annotate(
+        count=Count('id'),
+        approved=Count('id', filter=Q(status='approved')),
+        avg_rating=Avg('overall_rating')
+    ).order_by('month')
+    
+    monthly_ratings = list(monthly_trend)
+    
+    # Calcular trimestres disponibles basados en los meses con reseñas
+    quarters = []
+    if monthly_ratings:
+        quarters_dict = defaultdict(set)
+        for item in monthly_ratings:
+            month_date = item['month']
+            year = month_date.year
+            month = month_date.month
+            # Determinar trimestre (1-4)
+            if month in [1, 2, 3]:
+                quarter = 1
+                label = f'Q1 {year} (Ene-Mar)'
+            elif month in [4, 5, 6]:
+                quarter = 2
+                label = f'Q2 {year} (Abr-Jun)'
+            elif month in [7, 8, 9]:
+                quarter = 3
+                label = f'Q3 {year} (Jul-Sep)'
+            else:  # 10, 11, 12
+                quarter = 4
+                label = f'Q4 {year} (Oct-Dic)'
+            quarters_dict[(year, quarter)] = label
+        
+        # Convertir a lista ordenada
+        for (year, quarter), label in sorted(quarters_dict.items()):
+            quarters.append({
+                'year': year,
+                'quarter': quarter,
+                'label': label
+            })
+    
+    # Datos para gráficos
+    chart_data = {
+        'ratings': {},
+        'modality': {},
+        'response_time_distribution': {},
+        'monthly_comparison': {},
+        'strengths_weaknesses': {}
+    }
+    
+    if all_company_reviews.exists():
+        # Distribución de calificaciones
+        for i in range(1, 6):
+            count = all_company_reviews.filter(overall_rating=i).count()
+            chart_data['ratings'][f'{i} estrella{"s" if i > 1 else ""}'] = count
+        
+        # Distribución por modalidad
+        for modality, _ in Review.MODALITY_CHOICES:
+            count = all_company_reviews.filter(modality=modality).count()
+            if count > 0:
+                chart_data['modality'][modality.title()] = count
+        
+        # Distribución de tiempo de respuesta
+        response_time_labels = {
+            'immediate': 'Inmediata',
+            'same_day': 'Mismo día',
+            'next_day': 'Al día siguiente',
+            'few_days': 'En pocos días',
+            'slow': 'Lenta'
+        }
+        for response_time, _ in Review.RESPONSE_TIME_CHOICES:
+            count = all_company_reviews.filter(response_time_rating=response_time).count()
+            if count > 0:
+                chart_data['response_time_distribution'][response_time_labels[response_time]] = count
+        
+        # Comparación mensual
+        if monthly_ratings:
+            chart_data['monthly_comparison'] = {
+                str(item['month']): {
+                    'count': item['count'],
+                    'approved': item['approved'],
+                    'avg_rating': float(item['avg_rating']) if item['avg_rating'] else 0
+                }
+                for item in monthly_ratings
+            }
+        
+        # Gráfico de Fortalezas y Debilidades
+        strengths_weaknesses = {}
+        aspects = {
+            'communication_rating': 'Comunicación',
+            'difficulty_rating': 'Dificultad del Proceso', 
+            'response_time_rating': 'Tiempo de Respuesta',
+            'overall_rating': 'Calificación General'
+        }
+        
+        for field, label in aspects.items():
+            if field == 'overall_rating':
+                avg_rating = all_company_reviews.aggregate(avg=Avg(field))['avg']
+                if avg_rating is not None:
+                    strengths_weaknesses[label] = round(avg_rating, 1)
+            else:
+                total_score = 0
+                count = 0
+                for review in all_company_reviews:
+                    rating_value = RATING_SCORES[field].get(getattr(review, field), 0)
+                    if rating_value > 0:
+                        total_score += rating_value
+                        count += 1
+                
+                if count > 0:
+                    avg_rating = total_score / count
+                    strengths_weaknesses[label] = round(avg_rating, 1)
+        
+        chart_data['strengths_weaknesses'] = strengths_weaknesses
+    
+    # Generar recomendaciones inteligentes (solo si hay reseñas)
+    # Siempre mostrar máximo 2 recomendaciones
+    recommendations = []
+    
+    if total_reviews > 0:
+        # Priorizar recomendaciones según importancia
+        if avg_overall < 3.5:
+            recommendations.append({
+                'type': 'danger',
+                'icon': 'fas fa-star',
+                'title': 'Calificación General Baja',
+                'description': f'Tu calificación promedio es {avg_overall:.1f}/5. Necesitas mejorar varios aspectos.',
+            })
+        
+        if rejection_rate > 30:
+            recommendations.append({
+                'type': 'danger',
+                'icon': 'fas fa-exclamation-triangle',
+                'title': 'Alta Tasa de Rechazo',
+                'description': f'El {rejection_rate:.1f}% de tus reseñas son rechazadas. Esto puede indicar problemas en tu proceso.',
+            })
+        
+        if avg_communication < 4 and len(recommendations) < 2:
+            recommendations.append({
+                'type': 'warning',
+                'icon': 'fas fa-comments',
+                'title': 'Mejorar Comunicación',
+                'description': f'Tu calificación de comunicación es {avg_communication:.1f}/5. Considera ser más claro y transparente en tus respuestas a los candidatos.',
+            })
+        
+        if avg_response_time < 4 and len(recommendations) < 2:
+            recommendations.append({
+                'type': 'info',
+                'icon': 'fas fa-clock',
+                'title': 'Acelerar Respuestas',
+                'description': f'Tu tiempo de respuesta promedio es {avg_response_time:.1f}/5. Los candidatos valoran respuestas rápidas.',
+            })
+        
+        if approval_rate < 70 and len(recommendations) < 2:
+            recommendations.append({
+                'type': 'warning',
+                'icon': 'fas fa-chart-line',
+                'title': 'Baja Tasa de Aprobación',
+                'description': f'Solo el {approval_rate:.1f}% de tus reseñas son aprobadas. Mejora la calidad de tus procesos.',
+            })
+        
+        if compromiso_rate < 50 and len(recommendations) < 2:
+            recommendations.append({
+                'type': 'info',
+                'icon': 'fas fa-bolt',
+                'title': 'Mejorar Velocidad de Respuesta',
+                'description': f'Solo el {compromiso_rate:.1f}% de tus reseñas aprobadas tienen respuesta rápida.',
+            })
+        
+        # Si no hay recomendaciones críticas, mostrar positivas
+        if not recommendations:
+            recommendations.append({
+                'type': 'success',
+                'icon': 'fas fa-check-circle',
+                'title': '¡Excelente Trabajo!',
+                'description': 'Tus métricas están en buen nivel. Sigue así y continúa mejorando.',
+            })
+            recommendations.append({
+                'type': 'info',
+                'icon': 'fas fa-chart-line',
+                'title': 'Mantén el Buen Rendimiento',
+                'description': 'Continúa monitoreando tus métricas y busca oportunidades de mejora continua.',
+            })
+        # Si solo hay 1 recomendación, agregar una segunda positiva o informativa
+        elif len(recommendations) == 1:
+            if avg_overall >= 4.0:
+                recommendations.append({
+                    'type': 'success',
+                    'icon': 'fas fa-check-circle',
+                    'title': '¡Buen Rendimiento!',
+                    'description': 'Tus calificaciones están por encima del promedio. Continúa mejorando.',
+                })
+            elif avg_communication >= 4.0:
+                recommendations.append({
+                    'type': 'info',
+                    'icon': 'fas fa-comments',
+                    'title': 'Buena Comunicación',
+                    'description': 'Tu comunicación es valorada positivamente por los candidatos.',
+                })
+            elif avg_response_time >= 4.0:
+                recommendations.append({
+                    'type': 'info',
+                    'icon': 'fas fa-clock',
+                    'title': 'Respuestas Rápidas',
+                    'description': 'Estás respondiendo rápidamente a los candidatos. ¡Sigue así!',
+                })
+            else:
+                recommendations.append({
+                    'type': 'info',
+                    'icon': 'fas fa-chart-line',
+                    'title': 'Continúa Mejorando',
+                    'description': 'Monitorea tus métricas regularmente y busca oportunidades de mejora continua.',
+                })
+    else:
+        # Si no hay reseñas, mostrar 2 recomendaciones iniciales
+        recommendations.append({
+            'type': 'info',
+            'icon': 'fas fa-info-circle',
+            'title': 'Comienza a recibir reseñas',
+            'description': 'Aún no hay reseñas para tu empresa. Cuando los candidatos compartan sus experiencias, verás estadísticas aquí.',
+        })
+        recommendations.append({
+            'type': 'success',
+            'icon': 'fas fa-rocket',
+            'title': 'Prepara tu proceso',
+            'description': 'Asegúrate de tener un proceso de selección claro y transparente para recibir buenas calificaciones.',
+        })
+    
+    # Limitar a exactamente 2 recomendaciones
+    recommendations = recommendations[:2]
+    
+    # Datos para comparación mes a mes
+    monthly_comparison = []
+    if len(monthly_ratings) >= 2:
+        for i in range(1, len(monthly_ratings)):
+            prev_month = monthly_ratings[i-1]
+            curr_month = monthly_ratings[i]
+            
+            # Calcular rechazadas para cada mes
+            prev_rejected = prev_month['count'] - prev_month['approved']
+            curr_rejected = curr_month['count'] - curr_month['approved']
+            
+            rating_change = curr_month['avg_rating'] - prev_month['avg_rating']
+            count_change = curr_month['count'] - prev_month['count']
+            approval_change = curr_month['approved'] - prev_month['approved']
+            rejection_change = curr_rejected - prev_rejected
+            
+            monthly_comparison.append({
+                'month': curr_month['month'],
+                'prev_month': prev_month['month'],
+                'prev_rating': prev_month['avg_rating'],
+                'curr_rating': curr_month['avg_rating'],
+                'rating_change': rating_change,
+                'prev_count': prev_month['count'],
+                'curr_count': curr_month['count'],
+                'count_change': count_change,
+                'prev_approved': prev_month['approved'],
+                'curr_approved': curr_month['approved'],
+                'approval_change': approval_change,
+                'prev_rejected': prev_rejected,
+                'curr_rejected': curr_rejected,
+                'rejection_change': rejection_change,
+            })
+    
+    role_kpis = {
+        'role': 'company_rep',
+        'avg_overall': avg_overall,
+        'total_reviews': total_reviews,
+        'approved_count': approved_count,
+        'rejected_count': rejected_count,
+        'approval_rate': round(approval_rate, 1),
+        'rejection_rate': round(rejection_rate, 1),
+        'compromiso_rate': round(compromiso_rate, 1),
+        'monthly_trend': monthly_ratings,
+        'monthly_comparison': monthly_comparison,
+        'avg_communication': avg_communication,
+        'avg_difficulty': avg_difficulty,
+        'avg_response_time': avg_response_time,
+        'recommendations': recommendations,
+        'quarters': quarters,
+    }
+
+    return chart_data, role_kpis
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_company_logo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BenchmarkSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('sector', 'Sector'), ('location', 'Ciudad')], max_length=20, verbose_name='Dimensión')),
+                ('group', models.CharField(help_text='Nombre del sector o de la ciudad', max_length=100, verbose_name='Grupo')),
+                ('metric', models.CharField(choices=[('avg_rating', 'Calificación promedio'), ('response_time_score', 'Tiempo de respuesta'), ('approval_rate', 'Tasa de aprobación')], max_length=30, verbose_name='Métrica')),
+                ('counts', models.JSONField(default=list, verbose_name='Empresas por intervalo')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total de empresas')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+            ],
+            options={
+                'verbose_name': 'Histograma de comparación',
+                'verbose_name_plural': 'Histogramas de comparación',
+                'unique_together': {('dimension', 'group', 'metric')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyBenchmark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sector', models.CharField(blank=True, max_length=100, verbose_name='Sector')),
+                ('location', models.CharField(blank=True, max_length=100, verbose_name='Ciudad')),
+                ('total_reviews', models.PositiveIntegerField(default=0, verbose_name='Total de reseñas')),
+                ('avg_rating', models.FloatField(blank=True, null=True, verbose_name='Calificación promedio')),
+                ('response_time_score', models.FloatField(blank=True, help_text='Promedio de 1 (lenta) a 5 (inmediata)', null=True, verbose_name='Puntaje de tiempo de respuesta')),
+                ('approval_rate', models.FloatField(blank=True, help_text='Porcentaje de reseñas aprobadas', null=True, verbose_name='Tasa de aprobación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+                ('company', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='benchmark', to='companies.company', verbose_name='Empresa')),
+            ],
+            options={
+                'verbose_name': 'Métricas de comparación',
+                'verbose_name_plural': 'Métricas de comparación',
+            },
+        ),
+    ]
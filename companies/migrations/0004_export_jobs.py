@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:49
+
+import companies.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_company_benchmarks'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format', models.CharField(choices=[('xlsx', 'Excel')], max_length=10, verbose_name='Formato')),
+                ('params', models.JSONField(default=dict, help_text='Parámetros normalizados del reporte (período, calificación, columnas)', verbose_name='Parámetros')),
+                ('params_hash', models.CharField(max_length=64, verbose_name='Hash de parámetros')),
+                ('generation', models.BigIntegerField(default=0, help_text='Generación de caché de la empresa cuando se pidió el reporte', verbose_name='Generación de datos')),
+                ('status', models.CharField(choices=[('pending', 'En cola'), ('running', 'Generando'), ('done', 'Listo'), ('failed', 'Fallido')], default='pending', max_length=20, verbose_name='Estado')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='Progreso (%)')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('file', models.FileField(blank=True, null=True, upload_to=companies.models.export_upload_to, verbose_name='Archivo')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='Nombre de descarga')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de solicitud')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to='companies.company', verbose_name='Empresa')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de exportación',
+                'verbose_name_plural': 'Trabajos de exportación',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['company', 'format', 'params_hash', 'generation'], name='companies_e_company_f6da11_idx'), models.Index(fields=['status', 'created_at'], name='companies_e_status_e7dca4_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_export_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='format',
+            field=models.CharField(choices=[('xlsx', 'Excel'), ('csv', 'CSV')], max_length=10, verbose_name='Formato'),
+        ),
+    ]
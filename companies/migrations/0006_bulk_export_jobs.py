@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_export_job_csv_format'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='company',
+            field=models.ForeignKey(blank=True, help_text='Vacío en las exportaciones masivas de varias empresas', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to='companies.company', verbose_name='Empresa'),
+        ),
+        migrations.AlterField(
+            model_name='exportjob',
+            name='format',
+            field=models.CharField(choices=[('xlsx', 'Excel'), ('csv', 'CSV'), ('zip', 'Exportación masiva (ZIP)')], max_length=10, verbose_name='Formato'),
+        ),
+        migrations.AlterField(
+            model_name='exportjob',
+            name='generation',
+            field=models.BigIntegerField(default=0, help_text='Generación de caché de la empresa (o de la plataforma) cuando se pidió el reporte', verbose_name='Generación de datos'),
+        ),
+    ]
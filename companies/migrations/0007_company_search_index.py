@@ -0,0 +1,56 @@
+# Índices FTS5 para la búsqueda de empresas (ver core/services/company_search.py)
+
+import unicodedata
+
+from django.db import migrations
+
+
+def _fold(text):
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Company = apps.get_model('companies', 'Company')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS companies_company_fts USING fts5("
+            "name, sector, location, region, description, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+        )
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS companies_company_trigram USING fts5("
+            "name, sector, location, tokenize = 'trigram')"
+        )
+        for company in Company.objects.order_by('id'):
+            values = [company.name, company.sector, company.location, company.region or '', company.description or '']
+            cursor.execute(
+                "INSERT INTO companies_company_fts (rowid, name, sector, location, region, description) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                [company.pk] + values,
+            )
+            cursor.execute(
+                "INSERT INTO companies_company_trigram (rowid, name, sector, location) VALUES (%s, %s, %s, %s)",
+                [company.pk] + [_fold(value) for value in values[:3]],
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS companies_company_fts")
+        cursor.execute("DROP TABLE IF EXISTS companies_company_trigram")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0006_bulk_export_jobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
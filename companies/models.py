@@ -5,8 +5,14 @@
 #
 # Modelos:
 # - Company: Información de empresas con datos geo-localizados
+# - CompanyBenchmark: Métricas agregadas de una empresa para comparar con pares
+# - BenchmarkSketch: Histograma de una métrica por sector o ciudad
+# - ExportJob: Generación en segundo plano de reportes descargables
 # =============================================================================
 
+import uuid
+
+from django.conf import settings
 from django.db import models
 
 
@@ -117,4 +123,291 @@ class Company(models.Model):
         """Configuración del modelo"""
         verbose_name = "Empresa"
         verbose_name_plural = "Empresas"
-        ordering = ['name']  # Ordenar por nombre alfabéticamente
\ No newline at end of file
+        ordering = ['name']  # Ordenar por nombre alfabéticamente
+
+
+# =============================================================================
+# MODELO: MÉTRICAS DE COMPARACIÓN DE UNA EMPRESA
+# =============================================================================
+# Guarda las métricas de la empresa tal como están contadas en los
+# histogramas de su sector y ciudad (BenchmarkSketch). Al cambiar una reseña
+# se recalculan solo las métricas de esa empresa y se mueve su aporte de un
+# intervalo del histograma a otro (ver core/services/benchmarks.py).
+#
+# La relación no tiene restricción en la base de datos: al eliminar una
+# empresa, la fila debe sobrevivir hasta descontar su aporte de los
+# histogramas.
+# =============================================================================
+class CompanyBenchmark(models.Model):
+    """Métricas de una empresa usadas en la comparación con su sector y ciudad"""
+
+    company = models.OneToOneField(
+        Company,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='benchmark',
+        verbose_name="Empresa"
+    )
+
+    # ===== GRUPOS EN LOS QUE ESTÁ CONTADA =====
+    sector = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Sector"
+    )
+
+    location = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Ciudad"
+    )
+
+    # ===== MÉTRICAS (null = no se cuenta en los histogramas) =====
+    total_reviews = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Total de reseñas"
+    )
+
+    avg_rating = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Calificación promedio"
+    )
+
+    response_time_score = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Puntaje de tiempo de respuesta",
+        help_text="Promedio de 1 (lenta) a 5 (inmediata)"
+    )
+
+    approval_rate = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Tasa de aprobación",
+        help_text="Porcentaje de reseñas aprobadas"
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Última actualización"
+    )
+
+    # ===== MÉTODOS =====
+    def __str__(self):
+        """Representación en string del modelo"""
+        return f"Métricas de {self.company_id}"
+
+    class Meta:
+        """Configuración del modelo"""
+        verbose_name = "Métricas de comparación"
+        verbose_name_plural = "Métricas de comparación"
+
+
+# =============================================================================
+# MODELO: HISTOGRAMA DE UNA MÉTRICA POR GRUPO
+# =============================================================================
+# Cuenta cuántas empresas del grupo (un sector o una ciudad) tienen la
+# métrica en cada intervalo fijo. Permite calcular el percentil de una
+# empresa sin recorrer las reseñas de sus pares, y a diferencia de t-digest
+# o KLL admite restar una empresa cuando su métrica cambia.
+# =============================================================================
+class BenchmarkSketch(models.Model):
+    """Histograma de una métrica de empresas dentro de un sector o ciudad"""
+
+    DIMENSION_CHOICES = [
+        ('sector', 'Sector'),
+        ('location', 'Ciudad'),
+    ]
+
+    METRIC_CHOICES = [
+        ('avg_rating', 'Calificación promedio'),
+        ('response_time_score', 'Tiempo de respuesta'),
+        ('approval_rate', 'Tasa de aprobación'),
+    ]
+
+    dimension = models.CharField(
+        max_length=20,
+        choices=DIMENSION_CHOICES,
+        verbose_name="Dimensión"
+    )
+
+    group = models.CharField(
+        max_length=100,
+        verbose_name="Grupo",
+        help_text="Nombre del sector o de la ciudad"
+    )
+
+    metric = models.CharField(
+        max_length=30,
+        choices=METRIC_CHOICES,
+        verbose_name="Métrica"
+    )
+
+    counts = models.JSONField(
+        default=list,
+        verbose_name="Empresas por intervalo"
+    )
+
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Total de empresas"
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Última actualización"
+    )
+
+    # ===== MÉTODOS =====
+    def __str__(self):
+        """Representación en string del modelo"""
+        return f"{self.get_metric_display()} - {self.group} ({self.total})"
+
+    class Meta:
+        """Configuración del modelo"""
+        verbose_name = "Histograma de comparación"
+        verbose_name_plural = "Histogramas de comparación"
+        unique_together = ['dimension', 'group', 'metric']
+
+
+def export_upload_to(instance, filename):
+    """Nombre aleatorio para que el archivo no sea adivinable desde MEDIA_URL"""
+    folder = instance.company_id or 'bulk'
+    return f"exports/{folder}/{uuid.uuid4().hex}_{filename}"
+
+
+# =============================================================================
+# MODELO: TRABAJO DE EXPORTACIÓN
+# =============================================================================
+# Un reporte (Excel o CSV) generado fuera de la petición por un worker
+# (ver core/services/export_jobs.py). Se identifica por el formato, un hash
+# de los parámetros normalizados y la generación de caché de la empresa al
+# momento de pedirlo: mientras las reseñas no cambien, los pedidos idénticos
+# reutilizan el mismo archivo. Las exportaciones masivas del staff no tienen
+# empresa y usan la generación de la plataforma.
+# =============================================================================
+class ExportJob(models.Model):
+    """Trabajo de generación de un reporte descargable"""
+
+    FORMAT_CHOICES = [
+        ('xlsx', 'Excel'),
+        ('csv', 'CSV'),
+        ('zip', 'Exportación masiva (ZIP)'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'En cola'),
+        ('running', 'Generando'),
+        ('done', 'Listo'),
+        ('failed', 'Fallido'),
+    ]
+
+    # ===== IDENTIFICACIÓN DEL REPORTE =====
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='export_jobs',
+        verbose_name="Empresa",
+        help_text="Vacío en las exportaciones masivas de varias empresas"
+    )
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='export_jobs',
+        verbose_name="Solicitado por"
+    )
+
+    format = models.CharField(
+        max_length=10,
+        choices=FORMAT_CHOICES,
+        verbose_name="Formato"
+    )
+
+    params = models.JSONField(
+        default=dict,
+        verbose_name="Parámetros",
+        help_text="Parámetros normalizados del reporte (período, calificación, columnas)"
+    )
+
+    params_hash = models.CharField(
+        max_length=64,
+        verbose_name="Hash de parámetros"
+    )
+
+    generation = models.BigIntegerField(
+        default=0,
+        verbose_name="Generación de datos",
+        help_text="Generación de caché de la empresa (o de la plataforma) cuando se pidió el reporte"
+    )
+
+    # ===== ESTADO =====
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name="Estado"
+    )
+
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Progreso (%)"
+    )
+
+    error = models.TextField(
+        blank=True,
+        verbose_name="Error"
+    )
+
+    # ===== RESULTADO =====
+    file = models.FileField(
+        upload_to=export_upload_to,
+        blank=True,
+        null=True,
+        verbose_name="Archivo"
+    )
+
+    filename = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Nombre de descarga"
+    )
+
+    # ===== CAMPOS DE FECHA =====
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Fecha de solicitud"
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Inicio"
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Fin"
+    )
+
+    # ===== MÉTODOS =====
+    def __str__(self):
+        """Representación en string del modelo"""
+        target = self.company or 'todas las empresas'
+        return f"{self.get_format_display()} de {target} ({self.get_status_display()})"
+
+    class Meta:
+        """Configuración del modelo"""
+        verbose_name = "Trabajo de exportación"
+        verbose_name_plural = "Trabajos de exportación"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['company', 'format', 'params_hash', 'generation']),
+            models.Index(fields=['status', 'created_at']),
+        ]
@@ -10,6 +10,15 @@ urlpatterns = [
     # Vista detallada de una empresa específica
     path('company/<int:company_id>/', views.company_detail_view, name='company_detail'),
     
+    # Sugerencias de empresas para los formularios (JSON)
+    path('companies/autocomplete/', views.company_autocomplete_view, name='company_autocomplete'),
+    
+    # Preguntas de entrevista más frecuentes (JSON)
+    path('company/<int:company_id>/interview-questions/', views.company_interview_questions, name='company_interview_questions'),
+    
+    # Páginas siguientes de reseñas (carga perezosa, paginación por cursor)
+    path('company/<int:company_id>/reviews/feed/', views.company_review_feed, name='company_review_feed'),
+    
     # Dashboard para representantes de empresa
     path('company-dashboard/', views.company_dashboard_view, name='company_dashboard'),
     
@@ -36,4 +45,10 @@ urlpatterns = [
     
     # Exportar reportes
     path('company/<int:company_id>/export/excel/', views.export_company_report_excel, name='export_company_report_excel'),
+    
+    # Exportaciones en segundo plano (encolar, consultar estado y descargar)
+    path('company/<int:company_id>/export/<str:format>/jobs/', views.create_export_job, name='create_export_job'),
+    path('export-jobs/bulk/', views.create_bulk_export_job, name='create_bulk_export_job'),
+    path('export-jobs/<int:job_id>/', views.export_job_status, name='export_job_status'),
+    path('export-jobs/<int:job_id>/download/', views.download_export_job, name='download_export_job'),
 ]
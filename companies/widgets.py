@@ -0,0 +1,38 @@
+# =============================================================================
+# WIDGETS DE LA APLICACIÓN COMPANIES - SelecLoop
+# =============================================================================
+# CompanyAutocompleteWidget: campo de texto que sugiere empresas mientras se
+# escribe, consultando el endpoint 'company_autocomplete'. Reemplaza a los
+# <select> y <datalist> con todas las empresas, que crecían con el catálogo.
+# =============================================================================
+
+from django import forms
+from django.urls import reverse
+
+
+class CompanyAutocompleteWidget(forms.TextInput):
+    """
+    Dos modos:
+    - Para un ModelChoiceField (por defecto): el id de la empresa elegida va
+      en un campo oculto con el nombre del campo y el texto visible solo sirve
+      para buscar.
+    - free_text=True para un CharField con el nombre de la empresa: el texto
+      escrito es el valor y las sugerencias solo lo completan.
+    """
+    template_name = 'companies/widgets/company_autocomplete.html'
+
+    def __init__(self, attrs=None, free_text=False):
+        defaults = {'class': 'form-control', 'autocomplete': 'off', 'placeholder': 'Escribe el nombre de la empresa...'}
+        super().__init__({**defaults, **(attrs or {})})
+        self.free_text = free_text
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        widget = context['widget']
+        widget['free_text'] = self.free_text
+        widget['url'] = reverse('company_autocomplete')
+        widget['label'] = ''
+        if not self.free_text and value not in (None, ''):
+            from .models import Company
+            widget['label'] = Company.objects.filter(pk=value).values_list('name', flat=True).first() or ''
+        return context
@@ -6,276 +6,132 @@
 # =============================================================================
 
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
-from django.db.models import Avg, Count
-from companies.models import Company
-from reviews.models import Review
-from accounts.models import UserProfile
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from core.services import ai_reviews, ai_snapshots, fast_json
+from core.services.fast_json import json_response
+from core.services.http_caching import conditional, platform_etag, public_policy
+from core.services.rate_limit import rate_limited
 
 
+def _wants_ndjson(request):
+    return (
+        request.GET.get('format') == 'ndjson'
+        or 'application/x-ndjson' in request.headers.get('Accept', '')
+    )
+
+
+def _reviews_cost(request):
+    """El corpus completo en NDJSON cuesta lo que varias páginas"""
+    return 10 if _wants_ndjson(request) else 1
+
+
+def _snapshot_response(request, snapshot):
+    """
+    Envía un documento precalculado tal cual: versión .gz si el cliente
+    acepta gzip, 304 si coincide el ETag o Last-Modified.
+    """
+    pretty = fast_json.wants_pretty(request)
+    # La versión indentada (?pretty=1) se genera al vuelo y la comprime el middleware
+    compressed = not pretty and snapshot.has_gzip() and 'gzip' in request.headers.get('Accept-Encoding', '')
+    # Cada codificación es una representación distinta con su propio ETag
+    etag = snapshot.etag
+    if compressed:
+        etag = etag[:-1] + '-gzip"'
+    elif pretty:
+        etag = etag[:-1] + '-pretty"'
+    last_modified = int(snapshot.last_modified)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if pretty:
+            content = fast_json.dumps(fast_json.loads(snapshot.read()), pretty=True)
+        else:
+            content = snapshot.read(compressed=compressed)
+        response = HttpResponse(content, content_type='application/json')
+        if compressed:
+            response['Content-Encoding'] = 'gzip'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'AI_SNAPSHOT_MAX_AGE', 300))
+    return response
+
+
+@rate_limited('ai')
 def ai_data_endpoint(request):
     """
     Endpoint específico para motores de IA
     Proporciona datos estructurados sobre empresas y reseñas
+    (documento precalculado, ver core/services/ai_snapshots.py)
     """
-    # Obtener estadísticas generales
-    total_companies = Company.objects.filter(is_active=True).count()
-    total_reviews = Review.objects.filter(status='approved').count()
-    total_candidates = UserProfile.objects.filter(role='candidate').count()
-    
-    # Top empresas por calificación
-    top_companies = Company.objects.filter(
-        is_active=True,
-        reviews__status='approved'
-    ).annotate(
-        avg_rating=Avg('reviews__overall_rating'),
-        review_count=Count('reviews')
-    ).filter(
-        review_count__gte=1
-    ).order_by('-avg_rating', '-review_count')[:10]
-    
-    # Distribución por sectores
-    sector_stats = Company.objects.filter(is_active=True).values('sector').annotate(
-        count=Count('id'),
-        avg_rating=Avg('reviews__overall_rating'),
-        total_reviews=Count('reviews')
-    ).order_by('-count')
-    
-    # Distribución por ubicación
-    location_stats = Company.objects.filter(is_active=True).values('location').annotate(
-        count=Count('id'),
-        avg_rating=Avg('reviews__overall_rating')
-    ).order_by('-count')[:10]
-    
-    # Datos estructurados para IA
-    ai_data = {
-        "platform_info": {
-            "name": "SelecLoop",
-            "description": "Plataforma colaborativa para compartir reseñas anónimas sobre procesos de selección laboral",
-            "language": "Spanish",
-            "target_audience": "Job seekers, candidates, professionals",
-            "content_type": "Job selection process reviews and company feedback",
-            "geo_coverage": "Colombia and Latin America",
-            "data_format": "structured-json",
-            "ai_accessible": True
-        },
-        "statistics": {
-            "total_companies": total_companies,
-            "total_reviews": total_reviews,
-            "total_candidates": total_candidates,
-            "average_rating": Review.objects.filter(status='approved').aggregate(
-                avg=Avg('overall_rating')
-            )['avg'] or 0
-        },
-        "top_companies": [
-            {
-                "name": company.name,
-                "location": company.location,
-                "region": company.region,
-                "country": company.country,
-                "sector": company.sector,
-                "average_rating": round(company.avg_rating, 1),
-                "review_count": company.review_count
-            }
-            for company in top_companies
-        ],
-        "sector_distribution": [
-            {
-                "sector": stat['sector'] or 'Sin especificar',
-                "company_count": stat['count'],
-                "average_rating": round(stat['avg_rating'] or 0, 1),
-                "total_reviews": stat['total_reviews']
-            }
-            for stat in sector_stats
-        ],
-        "location_distribution": [
-            {
-                "location": stat['location'] or 'Sin especificar',
-                "company_count": stat['count'],
-                "average_rating": round(stat['avg_rating'] or 0, 1),
-                "country": "Colombia"
-            }
-            for stat in location_stats
-        ],
-        "data_structure": {
-            "review_fields": [
-                "job_title", "modality", "overall_rating", "communication_rating",
-                "difficulty_rating", "response_time_rating", "pros", "cons",
-                "interview_questions", "submission_date", "status"
-            ],
-            "company_fields": [
-                "name", "location", "region", "country", "sector", "description", 
-                "website"
-            ],
-            "modality_types": ["presencial", "remoto", "híbrido"],
-            "rating_scale": "1-5 stars",
-            "review_status": ["pending", "approved", "rejected"]
-        }
-    }
-    
-    return JsonResponse(ai_data, json_dumps_params={'indent': 2, 'ensure_ascii': False})
+    return _snapshot_response(request, ai_snapshots.platform_snapshot())
 
 
+@rate_limited('ai')
 def company_ai_data(request, company_id):
     """
     Datos estructurados específicos de una empresa para IA
+    (documento precalculado, ver core/services/ai_snapshots.py)
     """
-    try:
-        company = Company.objects.get(id=company_id, is_active=True)
-        
-        # Reseñas aprobadas de la empresa
-        reviews = Review.objects.filter(
-            company=company,
-            status='approved'
-        ).select_related('user_profile__user')
-        
-        # Estadísticas de la empresa
-        stats = {
-            'total_reviews': reviews.count(),
-            'average_rating': reviews.aggregate(avg=Avg('overall_rating'))['avg'] or 0,
-            'communication_avg': reviews.aggregate(avg=Avg('communication_rating'))['avg'] or 0,
-            'difficulty_avg': reviews.aggregate(avg=Avg('difficulty_rating'))['avg'] or 0,
-            'response_time_avg': reviews.aggregate(avg=Avg('response_time_rating'))['avg'] or 0
-        }
-        
-        # Distribución por modalidad
-        modality_distribution = reviews.values('modality').annotate(
-            count=Count('id'),
-            avg_rating=Avg('overall_rating')
-        ).order_by('-count')
-        
-        # Distribución por cargo
-        job_title_distribution = reviews.values('job_title').annotate(
-            count=Count('id'),
-            avg_rating=Avg('overall_rating')
-        ).order_by('-count')[:10]
-        
-        # Datos estructurados para IA
-        company_ai_data = {
-            "company_info": {
-                "name": company.name,
-                "location": company.location,
-                "region": company.region,
-                "country": company.country,
-                "sector": company.sector,
-                "description": company.description,
-                "website": company.website,
-                "is_active": company.is_active,
-                "geo_data": {
-                    "address": f"{company.location}, {company.country}"
-                }
-            },
-            "statistics": {
-                "total_reviews": stats['total_reviews'],
-                "average_rating": round(stats['average_rating'], 1),
-                "communication_rating": stats['communication_avg'],
-                "difficulty_rating": stats['difficulty_avg'],
-                "response_time_rating": stats['response_time_avg']
-            },
-            "modality_distribution": [
-                {
-                    "modality": mod['modality'],
-                    "count": mod['count'],
-                    "average_rating": round(mod['avg_rating'], 1)
-                }
-                for mod in modality_distribution
-            ],
-            "job_title_distribution": [
-                {
-                    "job_title": job['job_title'],
-                    "count": job['count'],
-                    "average_rating": round(job['avg_rating'], 1)
-                }
-                for job in job_title_distribution
-            ],
-            "recent_reviews": [
-                {
-                    "job_title": review.job_title,
-                    "modality": review.modality,
-                    "overall_rating": review.overall_rating,
-                    "communication_rating": review.communication_rating,
-                    "difficulty_rating": review.difficulty_rating,
-                    "response_time_rating": review.response_time_rating,
-                    "pros": review.pros,
-                    "cons": review.cons,
-                    "interview_questions": review.interview_questions,
-                    "submission_date": review.submission_date.isoformat()
-                }
-                for review in reviews.order_by('-submission_date')[:5]
-            ]
-        }
-        
-        return JsonResponse(company_ai_data, json_dumps_params={'indent': 2, 'ensure_ascii': False})
-        
-    except Company.DoesNotExist:
-        return JsonResponse({'error': 'Company not found'}, status=404)
+    snapshot = ai_snapshots.company_snapshot(company_id)
+    if snapshot is None:
+        return json_response(request, {'error': 'Company not found'}, status=404)
+    return _snapshot_response(request, snapshot)
 
 
+@conditional(etag_func=platform_etag, policy=public_policy)
+@rate_limited('ai', cost=_reviews_cost)
 def reviews_ai_data(request):
     """
     Datos estructurados de todas las reseñas para IA
+
+    Paginado por cursor sobre (fecha de envío, id), de la más reciente a la
+    más antigua: 'limit' (máx. 1000) reseñas por página y 'cursor' con el
+    valor de next_cursor de la página anterior. Con 'since' (ISO 8601) solo
+    se incluyen las reseñas enviadas después de esa fecha.
+
+    Con ?format=ndjson o Accept: application/x-ndjson se transmite el corpus
+    completo, una reseña por línea, a medida que se lee.
     """
     # Parámetros de filtro
-    company_id = request.GET.get('company_id')
-    sector = request.GET.get('sector')
-    location = request.GET.get('location')
-    modality = request.GET.get('modality')
-    min_rating = request.GET.get('min_rating')
+    filters = {
+        "company_id": request.GET.get('company_id'),
+        "sector": request.GET.get('sector'),
+        "location": request.GET.get('location'),
+        "modality": request.GET.get('modality'),
+        "min_rating": request.GET.get('min_rating'),
+        "since": request.GET.get('since'),
+    }
+    cursor = request.GET.get('cursor')
     
-    # Base query
-    reviews = Review.objects.filter(status='approved').select_related(
-        'company', 'user_profile__user'
-    )
+    try:
+        since = ai_reviews.parse_since(filters['since'])
+    except ValueError as e:
+        return json_response(request, {'error': str(e)}, status=400)
+    
+    reviews = ai_reviews.filtered_reviews(filters, since=since)
     
-    # Aplicar filtros
-    if company_id:
-        reviews = reviews.filter(company_id=company_id)
-    if sector:
-        reviews = reviews.filter(company__sector__icontains=sector)
-    if location:
-        reviews = reviews.filter(company__location__icontains=location)
-    if modality:
-        reviews = reviews.filter(modality=modality)
-    if min_rating:
-        reviews = reviews.filter(overall_rating__gte=int(min_rating))
+    # Modo streaming: el corpus completo en NDJSON
+    if _wants_ndjson(request):
+        return StreamingHttpResponse(
+            ai_reviews.ndjson_stream(reviews, cursor=cursor),
+            content_type=ai_reviews.NDJSON_CONTENT_TYPE,
+        )
     
-    # Limitar resultados para evitar respuestas muy grandes
-    reviews = reviews.order_by('-submission_date')[:100]
+    # Modo JSON: una página y el cursor de la siguiente
+    limit = ai_reviews.parse_limit(request.GET.get('limit'))
+    page = ai_reviews.review_page(reviews, cursor=cursor, limit=limit)
     
-    # Datos estructurados
     reviews_data = {
-        "reviews": [
-            {
-                "company": {
-                    "name": review.company.name,
-                    "location": review.company.location,
-                    "region": review.company.region,
-                    "sector": review.company.sector,
-                    "country": review.company.country
-                },
-                "review": {
-                    "job_title": review.job_title,
-                    "modality": review.modality,
-                    "overall_rating": review.overall_rating,
-                    "communication_rating": review.communication_rating,
-                    "difficulty_rating": review.difficulty_rating,
-                    "response_time_rating": review.response_time_rating,
-                    "pros": review.pros,
-                    "cons": review.cons,
-                    "interview_questions": review.interview_questions,
-                    "submission_date": review.submission_date.isoformat()
-                }
-            }
-            for review in reviews
-        ],
-        "filters_applied": {
-            "company_id": company_id,
-            "sector": sector,
-            "location": location,
-            "modality": modality,
-            "min_rating": min_rating
-        },
-        "total_results": reviews.count()
+        "reviews": page['reviews'],
+        "filters_applied": filters,
+        "total_results": len(page['reviews']),
+        "limit": limit,
+        "next_cursor": page['next_cursor'],
+        "prev_cursor": page['prev_cursor'],
     }
     
-    return JsonResponse(reviews_data, json_dumps_params={'indent': 2, 'ensure_ascii': False})
\ No newline at end of file
+    return json_response(request, reviews_data)
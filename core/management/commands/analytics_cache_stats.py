@@ -0,0 +1,26 @@
+# core/management/commands/analytics_cache_stats.py
+from django.core.management.base import BaseCommand
+from core.services.analytics_cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Muestra la tasa de aciertos de la caché de analítica por empresa'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reiniciar los contadores después de mostrarlos',
+        )
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+
+        self.stdout.write('Caché de analítica por empresa:')
+        self.stdout.write(f'  • Aciertos: {stats["hits"]}')
+        self.stdout.write(f'  • Fallos: {stats["misses"]}')
+        self.stdout.write(self.style.SUCCESS(f'  • Tasa de aciertos: {stats["hit_rate"]:.1f}%'))
+
+        if options['reset']:
+            reset_cache_stats()
+            self.stdout.write(self.style.WARNING('Contadores reiniciados'))
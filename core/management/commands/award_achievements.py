@@ -0,0 +1,12 @@
+# core/management/commands/award_achievements.py
+from django.core.management.base import BaseCommand
+from core.services import achievement_engine
+
+
+class Command(BaseCommand):
+    help = 'Evalúa los logros de todos los usuarios y otorga los que falten (logros nuevos o datos cargados sin señales)'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Evaluando logros...')
+        awarded = achievement_engine.award_all()
+        self.stdout.write(self.style.SUCCESS(f'✓ {awarded} logros otorgados'))
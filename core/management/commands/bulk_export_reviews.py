@@ -0,0 +1,58 @@
+# core/management/commands/bulk_export_reviews.py
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from core.services.bulk_export import FORMATS, bulk_filename, invalid_dates, parse_bulk_params, write_bulk_export
+
+
+class Command(BaseCommand):
+    help = 'Exporta las reseñas de todas las empresas (o las filtradas) en un ZIP con una partición gzip por empresa'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=list(FORMATS),
+            default='csv',
+            help='Formato de las particiones (por defecto csv)',
+        )
+        parser.add_argument('--sector', default='', help='Solo empresas de este sector')
+        parser.add_argument('--location', default='', help='Solo empresas de esta ciudad')
+        parser.add_argument('--since', help='Reseñas desde esta fecha (AAAA-MM-DD)')
+        parser.add_argument('--until', help='Reseñas hasta esta fecha inclusive (AAAA-MM-DD)')
+        parser.add_argument(
+            '--include-inactive',
+            action='store_true',
+            help='Incluir empresas inactivas',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Procesos en paralelo (por defecto, la cantidad de CPUs)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Ruta del ZIP (por defecto, reseñas_plataforma_<fecha>.zip en el directorio actual)',
+        )
+
+    def handle(self, *args, **options):
+        invalid = invalid_dates(options)
+        if invalid:
+            option, value = invalid[0]
+            raise CommandError(f'Fecha inválida en --{option}: {value}')
+
+        params = parse_bulk_params(options)
+        output_path = options['output'] or bulk_filename()
+
+        def progress(done, total):
+            self.stdout.write(f'\r  {done}/{total} empresas', ending='')
+            self.stdout.flush()
+
+        self.stdout.write(f'Exportando reseñas en {params["format"]} con {options["workers"]} procesos...')
+        with open(output_path, 'wb') as output:
+            manifest = write_bulk_export(params, output, workers=options['workers'], progress=progress)
+        self.stdout.write('')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {len(manifest["companies"])} empresas y {manifest["total_reviews"]} reseñas en {output_path}'
+        ))
@@ -0,0 +1,45 @@
+# core/management/commands/bump_cache_generation.py
+from django.core.management.base import BaseCommand, CommandError
+from core.services.cache_generations import (
+    PLATFORM, bump_generations, company_namespace, get_generations, user_namespace,
+)
+
+
+class Command(BaseCommand):
+    help = 'Invalida en todos los nodos los datos cacheados de una empresa, un usuario o la plataforma'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--company-id',
+            type=int,
+            action='append',
+            default=[],
+            help='Invalidar la caché de una empresa (se puede repetir)',
+        )
+        parser.add_argument(
+            '--user-profile-id',
+            type=int,
+            action='append',
+            default=[],
+            help='Invalidar la caché de un perfil de usuario (se puede repetir)',
+        )
+        parser.add_argument(
+            '--platform',
+            action='store_true',
+            help='Invalidar los datos agregados de toda la plataforma',
+        )
+
+    def handle(self, *args, **options):
+        namespaces = [company_namespace(pk) for pk in options['company_id']]
+        namespaces += [user_namespace(pk) for pk in options['user_profile_id']]
+        if options['platform']:
+            namespaces.append(PLATFORM)
+
+        if not namespaces:
+            raise CommandError('Indica al menos --company-id, --user-profile-id o --platform')
+
+        # Fuera de una transacción on_commit se ejecuta de inmediato
+        bump_generations(*namespaces)
+
+        for namespace, generation in sorted(get_generations(namespaces).items()):
+            self.stdout.write(self.style.SUCCESS(f'✓ {namespace}: generación {generation}'))
@@ -0,0 +1,79 @@
+# core/management/commands/merge_companies.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from companies.models import Company
+from core.services.company_merge import find_duplicate_groups, merge_companies
+
+
+class Command(BaseCommand):
+    help = (
+        'Une empresas duplicadas: "merge_companies --list" muestra los grupos '
+        'sospechosos y "merge_companies <id_conservar> <id_duplicada>..." los une'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', nargs='?', type=int, help='Id de la empresa que se conserva')
+        parser.add_argument('duplicates', nargs='*', type=int, help='Ids de las empresas que se unen a la anterior')
+        parser.add_argument('--list', action='store_true', help='Mostrar los grupos de posibles duplicados')
+        parser.add_argument('--threshold', type=float, help='Similitud mínima (0-1) para considerar duplicados')
+        parser.add_argument('--dry-run', action='store_true', help='Mostrar qué se uniría sin modificar nada')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            return self._list(options['threshold'])
+
+        if not options['target'] or not options['duplicates']:
+            raise CommandError('Indica la empresa que se conserva y al menos una duplicada, o usa --list.')
+
+        companies = Company.objects.annotate(review_count=Count('reviews')).in_bulk(
+            [options['target']] + options['duplicates']
+        )
+        missing = [company_id for company_id in [options['target']] + options['duplicates'] if company_id not in companies]
+        if missing:
+            raise CommandError(f'No existen las empresas: {", ".join(map(str, missing))}')
+        if options['target'] in options['duplicates']:
+            raise CommandError('La empresa que se conserva no puede estar entre las duplicadas.')
+
+        target = companies[options['target']]
+        duplicates = [companies[company_id] for company_id in options['duplicates']]
+        self.stdout.write(f'Se conserva: [{target.id}] {target.name} ({target.review_count} reseñas)')
+        for company in duplicates:
+            self.stdout.write(f'  se une:    [{company.id}] {company.name} ({company.review_count} reseñas)')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Simulación: no se modificó nada.'))
+            return
+
+        result = merge_companies(target, duplicates)
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {result['companies']} empresas unidas: {result['reviews']} reseñas, "
+            f"{result['pending_reviews']} reseñas pendientes, {result['work_history']} experiencias laborales, "
+            f"{result['representatives']} representantes y {result['export_jobs']} exportaciones movidas"
+        ))
+        if result['pending_reviews_deleted'] or result['work_history_deleted']:
+            self.stdout.write(
+                f"  Borradas por estar repetidas en la empresa conservada: "
+                f"{result['pending_reviews_deleted']} reseñas pendientes, "
+                f"{result['work_history_deleted']} experiencias laborales"
+            )
+
+    def _list(self, threshold):
+        groups = find_duplicate_groups(threshold)
+        if not groups:
+            self.stdout.write(self.style.SUCCESS('✓ No se encontraron empresas duplicadas'))
+            return
+
+        counts = dict(
+            Company.objects.filter(id__in=[company.id for group in groups for company in group])
+            .annotate(review_count=Count('reviews')).values_list('id', 'review_count')
+        )
+        for group in groups:
+            self.stdout.write('')
+            for company in group:
+                status = '' if company.is_active else ' (inactiva)'
+                self.stdout.write(f'  [{company.id}] {company.name}{status} — {counts[company.id]} reseñas')
+            ids = ' '.join(str(company.id) for company in group)
+            self.stdout.write(self.style.NOTICE(f'  manage.py merge_companies {ids}'))
+        self.stdout.write('')
+        self.stdout.write(f'{len(groups)} grupos de posibles duplicados')
@@ -0,0 +1,19 @@
+# core/management/commands/rebuild_benchmarks.py
+from django.core.management.base import BaseCommand
+from companies.models import BenchmarkSketch
+from core.services.benchmarks import rebuild_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Recalcula las métricas de comparación de todas las empresas y los histogramas por sector y ciudad'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Recalculando métricas de comparación...')
+        counted = rebuild_benchmarks()
+
+        sectors = BenchmarkSketch.objects.filter(dimension='sector', metric='avg_rating').count()
+        locations = BenchmarkSketch.objects.filter(dimension='location', metric='avg_rating').count()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {counted} empresas con reseñas en {sectors} sectores y {locations} ciudades'
+        ))
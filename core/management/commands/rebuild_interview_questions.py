@@ -0,0 +1,14 @@
+# core/management/commands/rebuild_interview_questions.py
+from django.core.management.base import BaseCommand
+from core.services import interview_questions
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de preguntas de entrevista a partir de las reseñas aprobadas'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Extrayendo preguntas de entrevista...')
+        total = interview_questions.rebuild_index(
+            progress=lambda count: self.stdout.write(f'  {count} reseñas procesadas')
+        )
+        self.stdout.write(self.style.SUCCESS(f'✓ {total} preguntas distintas indexadas'))
@@ -0,0 +1,27 @@
+# core/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand, CommandError
+from core.services import company_search, review_search
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los índices de búsqueda de texto completo (FTS5) de empresas y reseñas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only', choices=['companies', 'reviews'],
+            help='Reconstruir solo uno de los índices',
+        )
+
+    def handle(self, *args, **options):
+        if not company_search.fts_available():
+            raise CommandError('Los índices FTS5 solo existen con SQLite; la búsqueda usa icontains.')
+
+        if options['only'] in (None, 'companies'):
+            self.stdout.write('Reconstruyendo índice de empresas...')
+            total = company_search.rebuild_index()
+            self.stdout.write(self.style.SUCCESS(f'✓ {total} empresas indexadas'))
+
+        if options['only'] in (None, 'reviews'):
+            self.stdout.write('Reconstruyendo índice de reseñas...')
+            total = review_search.rebuild_index()
+            self.stdout.write(self.style.SUCCESS(f'✓ {total} reseñas aprobadas indexadas'))
@@ -0,0 +1,19 @@
+# core/management/commands/reconcile_badge_counters.py
+from django.core.management.base import BaseCommand
+from core.services import badges
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los contadores de reseñas y logros y la insignia guardados en los perfiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar los perfiles desfasados')
+
+    def handle(self, *args, **options):
+        stale = badges.reconcile(dry_run=options['dry_run'])
+        if not stale:
+            self.stdout.write(self.style.SUCCESS('✓ Todos los contadores están al día'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{stale} perfiles tienen contadores desfasados'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✓ {stale} perfiles corregidos'))
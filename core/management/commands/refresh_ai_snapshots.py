@@ -0,0 +1,19 @@
+# core/management/commands/refresh_ai_snapshots.py
+from django.core.management.base import BaseCommand
+from core.services.ai_snapshots import refresh_all
+
+
+class Command(BaseCommand):
+    help = 'Regenera los documentos JSON precalculados de los endpoints para IA'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Reescribir también los documentos que ya están al día',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Regenerando documentos para IA...')
+        written = refresh_all(force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f'✓ {written} documentos escritos'))
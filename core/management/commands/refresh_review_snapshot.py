@@ -0,0 +1,38 @@
+# core/management/commands/refresh_review_snapshot.py
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from core.services import review_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el snapshot columnar de reseñas usado en la analítica de la plataforma'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Mostrar percentiles y correlaciones del snapshot',
+        )
+
+    def handle(self, *args, **options):
+        if not review_snapshot.NUMPY_AVAILABLE:
+            raise CommandError('numpy no está instalado: la analítica usa consultas SQL')
+
+        start = perf_counter()
+        snapshot = review_snapshot.refresh_snapshot()
+        elapsed = perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Snapshot con {snapshot.size} reseñas (generación {snapshot.generation}) en {elapsed:.2f}s'
+        ))
+
+        if options['stats']:
+            self.stdout.write('Percentiles de la calificación general:')
+            for percentile, value in snapshot.percentiles().items():
+                self.stdout.write(f'  • p{percentile}: {value:.2f}')
+
+            self.stdout.write('Correlaciones entre calificaciones:')
+            for column, row in snapshot.correlations().items():
+                values = ', '.join(f'{other}={value}' for other, value in row.items())
+                self.stdout.write(f'  • {column}: {values}')
@@ -0,0 +1,41 @@
+# core/management/commands/run_export_jobs.py
+import time
+
+from django.core.management.base import BaseCommand
+from core.services.export_jobs import process_pending_jobs, purge_old_exports
+
+
+class Command(BaseCommand):
+    help = 'Genera los reportes encolados en segundo plano y elimina los archivos vencidos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Seguir atendiendo la cola hasta interrumpir el proceso',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Segundos de espera entre revisiones de la cola con --loop (por defecto 5)',
+        )
+        parser.add_argument(
+            '--purge-days',
+            type=int,
+            default=None,
+            help='Eliminar exportaciones terminadas hace más de N días (por defecto EXPORT_JOBS_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_old_exports(options['purge_days'])
+        if deleted:
+            self.stdout.write(f'🗑️ {deleted} exportaciones vencidas eliminadas')
+
+        while True:
+            processed = process_pending_jobs()
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f'✓ {processed} reportes generados'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
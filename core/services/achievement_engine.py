@@ -0,0 +1,228 @@
+# core/services/achievement_engine.py
+"""
+Motor de logros.
+
+Los logros se otorgan por eventos, desde las señales (core/signals.py):
+
+- Reseña aprobada: cuenta las reseñas aprobadas del candidato y las
+  empresas distintas (una sola consulta) y revisa los logros de tipo
+  first_review, review_count y company_count.
+- Experiencia laboral guardada: cuenta las experiencias y revisa los
+  logros de tipo work_history.
+
+Las reglas activas se guardan en memoria agrupadas por métrica y ordenadas
+por valor requerido, así cada evento solo considera los umbrales que el
+valor actual alcanza (búsqueda binaria) y solo consulta los logros que ya
+tiene el usuario si alcanzó alguno. Las reglas se recargan cuando cambia
+la generación RULES_NAMESPACE (al guardar o borrar un Achievement).
+
+Los logros nuevos se insertan con bulk_create(ignore_conflicts=True): si
+dos peticiones otorgan el mismo logro a la vez, la restricción única deja
+uno solo. bulk_create no dispara señales, por eso aquí mismo se
+recalculan los contadores de insignia y se invalidan las cachés del
+usuario.
+
+Las vistas muestran los logros recién obtenidos con recent_awards().
+"manage.py award_achievements" evalúa a todos los usuarios con consultas
+agregadas (para logros nuevos o reseñas aprobadas sin señales).
+"""
+
+import logging
+import threading
+from bisect import bisect_right
+
+from django.db import transaction
+from django.db.models import Count
+
+from achievements.models import Achievement, UserAchievement
+from reviews.models import Review
+from work_history.models import WorkHistory
+from core.services import badges
+from core.services.cache_generations import bump_generations, get_generation, user_namespace
+
+logger = logging.getLogger(__name__)
+
+RULES_NAMESPACE = 'achievement_rules'
+
+# Métrica que mide cada tipo de logro ('special' se otorga a mano)
+METRIC_BY_TYPE = {
+    'first_review': 'approved_reviews',
+    'review_count': 'approved_reviews',
+    'company_count': 'reviewed_companies',
+    'work_history': 'work_history',
+}
+
+REVIEW_METRICS = ('approved_reviews', 'reviewed_companies')
+
+_lock = threading.Lock()
+_rules = None
+
+
+# ===== REGLAS =====
+
+class RuleIndex:
+    """Logros activos por métrica: listas paralelas de umbrales (ordenados) e ids"""
+
+    def __init__(self, achievements, generation=None):
+        self.generation = generation
+        grouped = {}
+        for achievement_id, achievement_type, required_value in achievements:
+            metric = METRIC_BY_TYPE.get(achievement_type)
+            if metric is None:
+                continue
+            # La primera reseña siempre pide una, sin importar required_value
+            threshold = 1 if achievement_type == 'first_review' else max(required_value, 1)
+            grouped.setdefault(metric, []).append((threshold, achievement_id))
+        self.thresholds = {}
+        self.ids = {}
+        for metric, rules in grouped.items():
+            rules.sort()
+            self.thresholds[metric] = [threshold for threshold, _ in rules]
+            self.ids[metric] = [achievement_id for _, achievement_id in rules]
+
+    def reached(self, metric, value):
+        """Ids de los logros de la métrica cuyo umbral alcanza value"""
+        return self.ids.get(metric, [])[:bisect_right(self.thresholds.get(metric, []), value)]
+
+    def rules(self, metric):
+        return list(zip(self.thresholds.get(metric, []), self.ids.get(metric, [])))
+
+
+def get_rules():
+    """Reglas del proceso, recargadas si cambió algún logro"""
+    global _rules
+    generation = get_generation(RULES_NAMESPACE)
+    rules = _rules
+    if rules is not None and rules.generation == generation:
+        return rules
+    with _lock:
+        if _rules is None or _rules.generation != generation:
+            active = Achievement.objects.filter(is_active=True).values_list('id', 'achievement_type', 'required_value')
+            _rules = RuleIndex(active, generation)
+        return _rules
+
+
+def rules_changed():
+    """Invalida las reglas en todos los procesos (señal de Achievement)"""
+    bump_generations(RULES_NAMESPACE)
+
+
+# ===== OTORGAMIENTO =====
+
+def _award(user_profile_ids_by_achievement):
+    """
+    Inserta los pares (usuario, logro) de {logro: [usuarios]} que falten.
+    Retorna la cantidad de logros nuevos.
+    """
+    pairs = [
+        UserAchievement(user_profile_id=user_profile_id, achievement_id=achievement_id)
+        for achievement_id, user_profile_ids in user_profile_ids_by_achievement.items()
+        for user_profile_id in user_profile_ids
+    ]
+    if not pairs:
+        return 0
+    UserAchievement.objects.bulk_create(pairs, batch_size=1000, ignore_conflicts=True)
+
+    # bulk_create no dispara las señales de UserAchievement
+    profile_ids = {pair.user_profile_id for pair in pairs}
+    badges.reconcile(profile_ids=profile_ids)
+    bump_generations(*[user_namespace(profile_id) for profile_id in profile_ids])
+    return len(pairs)
+
+
+def _evaluate(user_profile_id, metrics):
+    """Otorga los logros de las métricas dadas cuyo umbral alcanzó el usuario"""
+    rules = get_rules()
+    candidates = []
+    for metric, value in metrics.items():
+        candidates.extend(rules.reached(metric, value))
+    if not candidates:
+        return 0
+
+    owned = set(
+        UserAchievement.objects.filter(user_profile_id=user_profile_id, achievement_id__in=candidates)
+        .values_list('achievement_id', flat=True)
+    )
+    missing = [achievement_id for achievement_id in candidates if achievement_id not in owned]
+    return _award({achievement_id: [user_profile_id] for achievement_id in missing})
+
+
+def review_approved(user_profile_id):
+    """Evento: el usuario tiene una reseña aprobada (nueva o que cambió de estado)"""
+    rules = get_rules()
+    if not any(rules.ids.get(metric) for metric in REVIEW_METRICS):
+        return 0
+    totals = Review.objects.filter(user_profile_id=user_profile_id, status='approved').aggregate(
+        approved_reviews=Count('id'),
+        reviewed_companies=Count('company', distinct=True),
+    )
+    return _evaluate(user_profile_id, totals)
+
+
+def work_history_changed(user_profile_id):
+    """Evento: el usuario agregó o editó una experiencia laboral"""
+    if not get_rules().ids.get('work_history'):
+        return 0
+    count = WorkHistory.objects.filter(user_profile_id=user_profile_id).count()
+    return _evaluate(user_profile_id, {'work_history': count})
+
+
+def safely(event, user_profile_id):
+    """Ejecuta un evento sin que un error impida guardar la reseña o experiencia"""
+    try:
+        # Punto de guardado: un error de base de datos no debe dejar inservible
+        # la transacción de quien guardó
+        with transaction.atomic():
+            return event(user_profile_id)
+    except Exception as e:
+        logger.warning(f"No se pudieron evaluar los logros del perfil {user_profile_id}: {e}")
+        return 0
+
+
+def recent_awards(user_profile, since):
+    """Logros obtenidos por el usuario desde 'since' (para mostrarlos en la vista)"""
+    return [
+        user_achievement.achievement
+        for user_achievement in UserAchievement.objects.filter(
+            user_profile=user_profile, earned_at__gte=since,
+        ).select_related('achievement').order_by('earned_at')
+    ]
+
+
+# ===== EVALUACIÓN COMPLETA =====
+
+def award_all():
+    """
+    Evalúa a todos los usuarios con dos consultas agregadas (reseñas
+    aprobadas y empresas distintas por usuario, experiencias por usuario)
+    más la de los logros ya obtenidos, y otorga los que falten. Retorna la cantidad de logros nuevos.
+    """
+    rules = get_rules()
+    metrics = {}
+    review_totals = (
+        Review.objects.filter(status='approved').order_by().values('user_profile_id')
+        .annotate(approved_reviews=Count('id'), reviewed_companies=Count('company', distinct=True))
+    )
+    for row in review_totals:
+        metrics.setdefault('approved_reviews', {})[row['user_profile_id']] = row['approved_reviews']
+        metrics.setdefault('reviewed_companies', {})[row['user_profile_id']] = row['reviewed_companies']
+    work_totals = WorkHistory.objects.order_by().values('user_profile_id').annotate(total=Count('id'))
+    metrics['work_history'] = {row['user_profile_id']: row['total'] for row in work_totals}
+
+    owned = {}
+    rule_ids = [achievement_id for metric in set(METRIC_BY_TYPE.values()) for _, achievement_id in rules.rules(metric)]
+    for user_profile_id, achievement_id in UserAchievement.objects.filter(
+        achievement_id__in=rule_ids,
+    ).values_list('user_profile_id', 'achievement_id'):
+        owned.setdefault(achievement_id, set()).add(user_profile_id)
+
+    to_award = {}
+    for metric, values in metrics.items():
+        for threshold, achievement_id in rules.rules(metric):
+            winners = [
+                user_profile_id for user_profile_id, value in values.items()
+                if value >= threshold and user_profile_id not in owned.get(achievement_id, ())
+            ]
+            if winners:
+                to_award[achievement_id] = winners
+    return _award(to_award)
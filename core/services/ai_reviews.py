@@ -0,0 +1,150 @@
+# core/services/ai_reviews.py
+"""
+Reseñas aprobadas para el endpoint de datos para IA (reviews_ai_data).
+
+Las reseñas se recorren por cursor sobre (submission_date, id), de la más
+reciente a la más antigua. En modo JSON se entrega una página con el
+cursor de la siguiente; en modo NDJSON se emite una reseña por línea a
+medida que se leen, en lotes con su propia consulta por cursor, hasta
+agotar el corpus. Con 'since' un consumidor trae solo lo enviado después
+de su última descarga.
+
+Las filas se leen con values() y un JOIN a la empresa, sin instanciar
+modelos.
+"""
+
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from reviews.models import Review
+from core.services import fast_json
+from core.services.pagination import decode_cursor, iterate_keyset, paginate_keyset
+
+CURSOR_FIELDS = [('submission_date', True), ('id', True)]
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+STREAM_BATCH_SIZE = 1000
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson; charset=utf-8'
+
+ROW_FIELDS = [
+    'id', 'submission_date', 'job_title', 'modality', 'overall_rating',
+    'communication_rating', 'difficulty_rating', 'response_time_rating',
+    'pros', 'cons', 'interview_questions',
+    'company__name', 'company__location', 'company__region', 'company__sector', 'company__country',
+]
+
+
+# ===== PARÁMETROS =====
+
+def parse_since(value):
+    """
+    Fecha u hora ISO 8601 de 'since'. Una fecha sin hora se toma desde el
+    inicio del día. Lanza ValueError si el formato no es válido.
+    """
+    if not value:
+        return None
+    since = parse_datetime(value)
+    if since is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Formato de fecha inválido en since: {value}")
+        since = datetime.combine(day, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def parse_limit(value):
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_LIMIT
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def filtered_reviews(params, since=None):
+    """Reseñas aprobadas filtradas por los parámetros del endpoint"""
+    reviews = Review.objects.filter(status='approved')
+
+    if params.get('company_id'):
+        try:
+            reviews = reviews.filter(company_id=int(params['company_id']))
+        except ValueError:
+            return reviews.none()
+    if params.get('sector'):
+        reviews = reviews.filter(company__sector__icontains=params['sector'])
+    if params.get('location'):
+        reviews = reviews.filter(company__location__icontains=params['location'])
+    if params.get('modality'):
+        reviews = reviews.filter(modality=params['modality'])
+    if params.get('min_rating'):
+        try:
+            reviews = reviews.filter(overall_rating__gte=int(params['min_rating']))
+        except ValueError:
+            pass
+    if since is not None:
+        reviews = reviews.filter(submission_date__gt=since)
+
+    return reviews.values(*ROW_FIELDS)
+
+
+# ===== SERIALIZACIÓN =====
+
+def serialize_review(row):
+    return {
+        "company": {
+            "name": row['company__name'],
+            "location": row['company__location'],
+            "region": row['company__region'],
+            "sector": row['company__sector'],
+            "country": row['company__country']
+        },
+        "review": {
+            "id": row['id'],
+            "job_title": row['job_title'],
+            "modality": row['modality'],
+            "overall_rating": row['overall_rating'],
+            "communication_rating": row['communication_rating'],
+            "difficulty_rating": row['difficulty_rating'],
+            "response_time_rating": row['response_time_rating'],
+            "pros": row['pros'],
+            "cons": row['cons'],
+            "interview_questions": row['interview_questions'],
+            "submission_date": row['submission_date'].isoformat()
+        }
+    }
+
+
+# ===== LECTURA =====
+
+def review_page(reviews, cursor=None, limit=DEFAULT_LIMIT):
+    """Una página de reseñas serializadas con los cursores de navegación"""
+    page = paginate_keyset(reviews, CURSOR_FIELDS, cursor=cursor, page_size=limit)
+    return {
+        'reviews': [serialize_review(row) for row in page['items']],
+        'next_cursor': page['next_cursor'],
+        'prev_cursor': page['prev_cursor'],
+    }
+
+
+def ndjson_stream(reviews, cursor=None):
+    """
+    Bytes NDJSON de todas las reseñas posteriores al cursor (si se indica),
+    un lote por consulta.
+    """
+    values, _ = decode_cursor(cursor)
+    if values is not None and len(values) != len(CURSOR_FIELDS):
+        values = None
+
+    lines = []
+    for row in iterate_keyset(reviews, CURSOR_FIELDS, values=values, batch_size=STREAM_BATCH_SIZE):
+        lines.append(fast_json.dumps(serialize_review(row)))
+        if len(lines) >= STREAM_BATCH_SIZE:
+            yield b'\n'.join(lines) + b'\n'
+            lines = []
+    if lines:
+        yield b'\n'.join(lines) + b'\n'
@@ -0,0 +1,389 @@
+# core/services/ai_snapshots.py
+"""
+Documentos JSON precalculados de los endpoints para IA (ai_data_endpoint y
+company_ai_data).
+
+Cada documento se guarda en AI_SNAPSHOT_DIR como .json y .json.gz, con la
+generación de caché de la que salió en el nombre (platform-g<n>.json,
+company-<id>-g<n>.json). Mientras la generación no cambie, las vistas
+envían los bytes del archivo tal cual, con ETag y Last-Modified, sin
+consultar la base de datos ni serializar. Cuando cambia una reseña o una
+empresa, la siguiente petición regenera el documento; si el anterior tiene
+menos de AI_SNAPSHOT_MIN_AGE segundos se sigue sirviendo, para no
+regenerar en cada escritura con tráfico alto.
+
+El comando refresh_ai_snapshots regenera todos los documentos (cron).
+
+Configuración opcional en settings.py:
+- AI_SNAPSHOT_DIR: directorio de los documentos
+- AI_SNAPSHOT_MIN_AGE: segundos mínimos entre regeneraciones de un documento
+- AI_SNAPSHOT_MAX_AGE: max-age de Cache-Control de las respuestas
+"""
+
+import glob
+import gzip
+import hashlib
+import logging
+import os
+import re
+import time
+
+from django.conf import settings
+from django.db.models import Avg, Case, Count, IntegerField, When
+
+from accounts.models import UserProfile
+from companies.models import Company
+from reviews.models import Review
+from core.services import fast_json
+from core.services.cache_generations import PLATFORM, company_namespace, get_generation, get_generations
+from core.services.platform_stats import ai_platform_stats
+from core.services.review_snapshot import (
+    COMMUNICATION_SCORES, DIFFICULTY_SCORES, RESPONSE_TIME_SCORES, get_snapshot, refresh_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_DOCUMENT = 'platform'
+
+_FILE_PATTERN = re.compile(r'-g(\d+)\.json$')
+
+# ETag por (ruta, mtime): el hash del archivo se calcula una vez por proceso
+_etags = {}
+
+
+def _directory():
+    return getattr(settings, 'AI_SNAPSHOT_DIR', os.path.join(settings.BASE_DIR, 'var', 'ai'))
+
+
+def _min_age():
+    return getattr(settings, 'AI_SNAPSHOT_MIN_AGE', 60)
+
+
+def company_document(company_id):
+    return f'company-{company_id}'
+
+
+def render(document):
+    """Bytes del documento en JSON compacto (?pretty=1 lo indenta al servirlo)"""
+    return fast_json.dumps(document)
+
+
+# ===== CONSTRUCCIÓN DE DOCUMENTOS =====
+
+def build_platform_document():
+    """Datos generales de la plataforma (antes calculados en ai_data_endpoint)"""
+    # El snapshot columnar puede ser de una generación anterior hasta que
+    # venza su TTL; el documento debe salir de los datos actuales
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.generation != get_generation(PLATFORM):
+        refresh_snapshot()
+
+    # Obtener estadísticas generales
+    total_companies = Company.objects.filter(is_active=True).count()
+    total_candidates = UserProfile.objects.filter(role='candidate').count()
+
+    # Top empresas, sectores y ciudades (snapshot columnar o SQL)
+    platform_stats = ai_platform_stats()
+
+    return {
+        "platform_info": {
+            "name": "SelecLoop",
+            "description": "Plataforma colaborativa para compartir reseñas anónimas sobre procesos de selección laboral",
+            "language": "Spanish",
+            "target_audience": "Job seekers, candidates, professionals",
+            "content_type": "Job selection process reviews and company feedback",
+            "geo_coverage": "Colombia and Latin America",
+            "data_format": "structured-json",
+            "ai_accessible": True
+        },
+        "statistics": {
+            "total_companies": total_companies,
+            "total_reviews": platform_stats['total_reviews'],
+            "total_candidates": total_candidates,
+            "average_rating": platform_stats['average_rating']
+        },
+        "top_companies": platform_stats['top_companies'],
+        "sector_distribution": platform_stats['sector_distribution'],
+        "location_distribution": [
+            {**stat, "country": "Colombia"}
+            for stat in platform_stats['location_distribution']
+        ],
+        "data_structure": {
+            "review_fields": [
+                "job_title", "modality", "overall_rating", "communication_rating",
+                "difficulty_rating", "response_time_rating", "pros", "cons",
+                "interview_questions", "submission_date", "status"
+            ],
+            "company_fields": [
+                "name", "location", "region", "country", "sector", "description",
+                "website"
+            ],
+            "modality_types": ["presencial", "remoto", "híbrido"],
+            "rating_scale": "1-5 stars",
+            "review_status": ["pending", "approved", "rejected"]
+        }
+    }
+
+
+def _score(field, scores):
+    """Puntaje numérico de un campo de choices (para promediarlo)"""
+    return Case(
+        *[When(**{field: value}, then=score) for value, score in scores.items()],
+        output_field=IntegerField(),
+    )
+
+
+def _round(value):
+    return round(value, 1) if value is not None else 0
+
+
+def build_company_document(company):
+    """Datos de una empresa activa (antes calculados en company_ai_data)"""
+    reviews = Review.objects.filter(company=company, status='approved')
+
+    # Estadísticas de la empresa en una sola consulta. Comunicación,
+    # dificultad y tiempo de respuesta son choices de texto: se promedian sus
+    # puntajes (Avg directo sobre el texto no tiene sentido)
+    stats = reviews.aggregate(
+        total_reviews=Count('id'),
+        average_rating=Avg('overall_rating'),
+        communication_avg=Avg(_score('communication_rating', COMMUNICATION_SCORES)),
+        difficulty_avg=Avg(_score('difficulty_rating', DIFFICULTY_SCORES)),
+        response_time_avg=Avg(_score('response_time_rating', RESPONSE_TIME_SCORES)),
+    )
+
+    # Distribución por modalidad
+    modality_distribution = reviews.values('modality').annotate(
+        count=Count('id'),
+        avg_rating=Avg('overall_rating')
+    ).order_by('-count', 'modality')
+
+    # Distribución por cargo
+    job_title_distribution = reviews.values('job_title').annotate(
+        count=Count('id'),
+        avg_rating=Avg('overall_rating')
+    ).order_by('-count', 'job_title')[:10]
+
+    recent_reviews = reviews.order_by('-submission_date', '-id').values(
+        'job_title', 'modality', 'overall_rating', 'communication_rating', 'difficulty_rating',
+        'response_time_rating', 'pros', 'cons', 'interview_questions', 'submission_date',
+    )[:5]
+
+    return {
+        "company_info": {
+            "name": company.name,
+            "location": company.location,
+            "region": company.region,
+            "country": company.country,
+            "sector": company.sector,
+            "description": company.description,
+            "website": company.website,
+            "is_active": company.is_active,
+            "geo_data": {
+                "address": f"{company.location}, {company.country}"
+            }
+        },
+        "statistics": {
+            "total_reviews": stats['total_reviews'],
+            "average_rating": _round(stats['average_rating']),
+            "communication_rating": _round(stats['communication_avg']),
+            "difficulty_rating": _round(stats['difficulty_avg']),
+            "response_time_rating": _round(stats['response_time_avg'])
+        },
+        "modality_distribution": [
+            {
+                "modality": mod['modality'],
+                "count": mod['count'],
+                "average_rating": round(mod['avg_rating'], 1)
+            }
+            for mod in modality_distribution
+        ],
+        "job_title_distribution": [
+            {
+                "job_title": job['job_title'],
+                "count": job['count'],
+                "average_rating": round(job['avg_rating'], 1)
+            }
+            for job in job_title_distribution
+        ],
+        "recent_reviews": [
+            {**review, "submission_date": review['submission_date'].isoformat()}
+            for review in recent_reviews
+        ]
+    }
+
+
+# ===== ARCHIVOS =====
+
+def _path(name, generation):
+    return os.path.join(_directory(), f'{name}-g{generation}.json')
+
+
+def _write_atomic(path, data):
+    temp = f'{path}.{os.getpid()}.tmp'
+    with open(temp, 'wb') as f:
+        f.write(data)
+    os.replace(temp, path)
+
+
+def write_document(name, generation, data):
+    """
+    Guarda el documento (.json y .json.gz) para la generación dada y borra
+    los de generaciones anteriores. Retorna la ruta del .json.
+    """
+    os.makedirs(_directory(), exist_ok=True)
+    path = _path(name, generation)
+    # Primero el .gz: quien vea el .json ya encuentra su versión comprimida
+    _write_atomic(f'{path}.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    _write_atomic(path, data)
+
+    for old in glob.glob(os.path.join(_directory(), f'{glob.escape(name)}-g*.json*')):
+        if not old.startswith(path):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return path
+
+
+def remove_documents(name):
+    for old in glob.glob(os.path.join(_directory(), f'{glob.escape(name)}-g*.json*')):
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+def _latest_path(name):
+    """Documento más reciente de cualquier generación (o None)"""
+    candidates = []
+    for path in glob.glob(os.path.join(_directory(), f'{glob.escape(name)}-g*.json')):
+        match = _FILE_PATTERN.search(path)
+        if match:
+            candidates.append((int(match.group(1)), path))
+    return max(candidates)[1] if candidates else None
+
+
+# ===== LECTURA PARA LAS VISTAS =====
+
+class SnapshotFile:
+    """
+    Documento listo para enviar: ETag, fecha de modificación y bytes.
+    Normalmente es un archivo; si no se pudo escribir en disco se sirve
+    desde memoria (data).
+    """
+
+    def __init__(self, path=None, data=None):
+        self.path = path
+        self.data = data
+        if data is not None:
+            self.last_modified = time.time()
+            self.etag = '"%s"' % hashlib.md5(data).hexdigest()
+            return
+
+        stat = os.stat(path)
+        self.last_modified = stat.st_mtime
+        key = (path, stat.st_mtime_ns)
+        etag = _etags.get(key)
+        if etag is None:
+            with open(path, 'rb') as f:
+                etag = '"%s"' % hashlib.md5(f.read()).hexdigest()
+            if len(_etags) > 1000:
+                _etags.clear()
+            _etags[key] = etag
+        self.etag = etag
+
+    def read(self, compressed=False):
+        """Bytes del documento; con compressed=True los de la versión .gz"""
+        if self.data is not None:
+            return gzip.compress(self.data) if compressed else self.data
+        if compressed:
+            try:
+                with open(f'{self.path}.gz', 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                pass
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def has_gzip(self):
+        return self.data is not None or os.path.exists(f'{self.path}.gz')
+
+
+def _get_document(name, namespace, build):
+    """
+    Archivo vigente del documento. Si no existe para la generación actual
+    se regenera con build() (que retorna el documento o None si ya no
+    corresponde publicarlo), salvo que el último archivo tenga menos de
+    AI_SNAPSHOT_MIN_AGE segundos.
+    """
+    generation = get_generation(namespace)
+    path = _path(name, generation)
+    if os.path.exists(path):
+        return SnapshotFile(path)
+
+    latest = _latest_path(name)
+    if latest is not None:
+        try:
+            if time.time() - os.path.getmtime(latest) < _min_age():
+                return SnapshotFile(latest)
+        except OSError:
+            pass
+
+    document = build()
+    if document is None:
+        remove_documents(name)
+        return None
+    data = render(document)
+    try:
+        return SnapshotFile(write_document(name, generation, data))
+    except OSError as e:
+        logger.warning(f"No se pudo guardar el documento para IA {name}: {e}")
+        return SnapshotFile(data=data)
+
+
+def platform_snapshot():
+    return _get_document(PLATFORM_DOCUMENT, PLATFORM, build_platform_document)
+
+
+def company_snapshot(company_id):
+    """Documento de la empresa, o None si no existe o está inactiva"""
+    def build():
+        company = Company.objects.filter(id=company_id, is_active=True).first()
+        return build_company_document(company) if company is not None else None
+
+    return _get_document(company_document(company_id), company_namespace(company_id), build)
+
+
+# ===== REGENERACIÓN COMPLETA =====
+
+def refresh_all(force=False):
+    """
+    Regenera el documento de la plataforma y el de cada empresa activa.
+    Sin force solo se escriben los que no existen para la generación
+    actual. Borra los documentos de empresas inactivas o eliminadas.
+    Retorna la cantidad de documentos escritos.
+    """
+    written = 0
+    jobs = [(PLATFORM_DOCUMENT, PLATFORM, build_platform_document)]
+    active_ids = set()
+    for company in Company.objects.filter(is_active=True).order_by('id'):
+        active_ids.add(company.id)
+        jobs.append((company_document(company.id), company_namespace(company.id),
+                     lambda company=company: build_company_document(company)))
+
+    generations = get_generations([namespace for _, namespace, _ in jobs])
+    for name, namespace, build in jobs:
+        generation = generations[namespace]
+        if not force and os.path.exists(_path(name, generation)):
+            continue
+        write_document(name, generation, render(build()))
+        written += 1
+
+    # Documentos de empresas que ya no se publican
+    for path in glob.glob(os.path.join(_directory(), 'company-*-g*.json')):
+        match = re.search(r'company-(\d+)-g\d+\.json$', path)
+        if match and int(match.group(1)) not in active_ids:
+            remove_documents(company_document(match.group(1)))
+
+    return written
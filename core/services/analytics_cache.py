@@ -0,0 +1,105 @@
+# core/services/analytics_cache.py
+"""
+Caché versionada de analítica por empresa, por usuario y de la plataforma.
+
+Las claves de los datos incluyen la generación del espacio de nombres de la
+empresa, del usuario o de la plataforma (ver core/services/cache_generations.py). Al
+modificarse una reseña se incrementan esas generaciones (ver
+core/signals.py) y todas las entradas anteriores dejan de usarse en todos
+los nodos; expiran solas por TTL.
+
+Configuración opcional en settings.py:
+- ANALYTICS_CACHE_ALIAS: alias de CACHES a usar (por defecto 'default')
+- ANALYTICS_CACHE_TIMEOUT: TTL en segundos (por defecto 1 hora). Acota el
+  desfase de métricas relativas a la fecha actual, como "últimos 90 días".
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.services.cache_generations import PLATFORM, company_namespace, user_namespace, versioned_key
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'analytics'
+HITS_KEY = f'{KEY_PREFIX}:stats:hits'
+MISSES_KEY = f'{KEY_PREFIX}:stats:misses'
+
+
+def _cache():
+    return caches[getattr(settings, 'ANALYTICS_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 60 * 60)
+
+
+def _count(key):
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def get_company_analytics(company_id, key_parts, builder):
+    """
+    Retorna la analítica cacheada de una empresa o la calcula con builder().
+
+    key_parts: tupla que identifica la variante (vista, alcance, rol...).
+    builder: función sin argumentos que calcula el valor si no está en caché.
+    """
+    return _get_or_build(company_namespace(company_id), key_parts, builder)
+
+
+def get_user_analytics(user_profile_id, key_parts, builder):
+    """Como get_company_analytics(), con los datos de un usuario"""
+    return _get_or_build(user_namespace(user_profile_id), key_parts, builder)
+
+
+def get_platform_analytics(key_parts, builder):
+    """Como get_company_analytics(), con datos de toda la plataforma"""
+    return _get_or_build(PLATFORM, key_parts, builder)
+
+
+def _get_or_build(namespace, key_parts, builder):
+    cache = _cache()
+    key = versioned_key(namespace, KEY_PREFIX, *key_parts)
+
+    value = cache.get(key)
+    if value is not None:
+        _count(HITS_KEY)
+        return value
+
+    _count(MISSES_KEY)
+    value = builder()
+    try:
+        cache.set(key, value, timeout=_timeout())
+    except Exception as e:
+        # Un fallo de la caché nunca debe romper la vista
+        logger.warning(f"No se pudo guardar analítica en caché ({key}): {e}")
+    return value
+
+
+def cache_stats():
+    """Contadores de aciertos/fallos de la caché de analítica"""
+    cache = _cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': (hits / total * 100) if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    """Reinicia los contadores de aciertos/fallos"""
+    _cache().delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,144 @@
+# core/services/badges.py
+"""
+Insignia de los candidatos (Principiante, Novato, Experto, Maestro, Leyenda).
+
+La insignia depende de cuántos logros y reseñas tiene el candidato. Ambos
+contadores y el nivel resultante están guardados en UserProfile
+(review_count, achievement_count, badge_tier), así mostrar la insignia no
+hace consultas: basta con el perfil, que la petición ya tiene cargado.
+
+Las señales de Review y UserAchievement (core/signals.py) ajustan los
+contadores con un único UPDATE con expresiones F(), que recalcula el nivel
+en la misma sentencia; no hay lectura previa ni carreras entre peticiones.
+Los cambios hechos sin señales (queryset.update(), bulk_create, SQL) se
+corrigen con "manage.py reconcile_badge_counters".
+"""
+
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.lookups import GreaterThanOrEqual
+
+from accounts.models import UserProfile
+
+# (nivel, logros mínimos, reseñas mínimas), de mayor a menor: alcanza el
+# nivel quien cumple cualquiera de los dos mínimos
+TIERS = [
+    ('leyenda', 10, 20),
+    ('maestro', 6, 10),
+    ('experto', 3, 5),
+    ('novato', 1, 1),
+]
+DEFAULT_TIER = 'principiante'
+
+BADGES = {
+    'leyenda': {'name': 'Leyenda', 'icon': 'fas fa-crown', 'color': 'warning', 'bg_color': 'bg-warning', 'text_color': 'text-dark'},
+    'maestro': {'name': 'Maestro', 'icon': 'fas fa-trophy', 'color': 'warning', 'bg_color': 'bg-warning', 'text_color': 'text-dark'},
+    'experto': {'name': 'Experto', 'icon': 'fas fa-star', 'color': 'info', 'bg_color': 'bg-info', 'text_color': 'text-white'},
+    'novato': {'name': 'Novato', 'icon': 'fas fa-seedling', 'color': 'success', 'bg_color': 'bg-success', 'text_color': 'text-white'},
+    'principiante': {'name': 'Principiante', 'icon': 'fas fa-circle', 'color': 'secondary', 'bg_color': 'bg-secondary', 'text_color': 'text-white'},
+}
+
+
+def compute_tier(achievement_count, review_count):
+    for tier, min_achievements, min_reviews in TIERS:
+        if achievement_count >= min_achievements or review_count >= min_reviews:
+            return tier
+    return DEFAULT_TIER
+
+
+def get_badge(user_profile):
+    """Insignia del perfil (sin consultas). None si no es candidato."""
+    if not user_profile or user_profile.role != 'candidate':
+        return None
+    return BADGES.get(user_profile.badge_tier, BADGES[DEFAULT_TIER])
+
+
+# ===== CONTADORES =====
+
+def _tier_expression(achievements, reviews):
+    """compute_tier() en SQL sobre dos expresiones"""
+    return Case(
+        *[
+            When(
+                GreaterThanOrEqual(achievements, min_achievements) | GreaterThanOrEqual(reviews, min_reviews),
+                then=Value(tier),
+            )
+            for tier, min_achievements, min_reviews in TIERS
+        ],
+        default=Value(DEFAULT_TIER),
+    )
+
+
+def _adjust(user_profile_id, field, delta):
+    """Suma delta al contador y recalcula el nivel en la misma sentencia"""
+    if not user_profile_id:
+        return
+    # En un UPDATE las columnas de la derecha tienen el valor anterior
+    counters = {
+        'achievement_count': F('achievement_count'),
+        'review_count': F('review_count'),
+    }
+    counters[field] = Greatest(F(field) + delta, Value(0))
+    UserProfile.objects.filter(pk=user_profile_id).update(**{
+        field: counters[field],
+        'badge_tier': _tier_expression(counters['achievement_count'], counters['review_count']),
+    })
+
+
+def review_added(user_profile_id):
+    _adjust(user_profile_id, 'review_count', 1)
+
+
+def review_removed(user_profile_id):
+    _adjust(user_profile_id, 'review_count', -1)
+
+
+def achievement_added(user_profile_id):
+    _adjust(user_profile_id, 'achievement_count', 1)
+
+
+def achievement_removed(user_profile_id):
+    _adjust(user_profile_id, 'achievement_count', -1)
+
+
+# ===== RECONCILIACIÓN =====
+
+def _count_subquery(model, field='user_profile'):
+    counts = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by().values(field).annotate(total=Count('pk')).values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def reconcile(dry_run=False, profile_ids=None):
+    """
+    Recalcula los contadores y el nivel de los perfiles (todos, o solo
+    profile_ids) desde las tablas. Retorna la cantidad de perfiles que
+    estaban desfasados.
+    """
+    from achievements.models import UserAchievement
+    from reviews.models import Review
+
+    actual_reviews = _count_subquery(Review)
+    actual_achievements = _count_subquery(UserAchievement)
+    profiles = UserProfile.objects.all()
+    if profile_ids is not None:
+        profiles = profiles.filter(pk__in=profile_ids)
+    stale = profiles.annotate(
+        actual_reviews=actual_reviews,
+        actual_achievements=actual_achievements,
+        actual_tier=_tier_expression(actual_achievements, actual_reviews),
+    ).filter(
+        ~Q(review_count=F('actual_reviews'))
+        | ~Q(achievement_count=F('actual_achievements'))
+        | ~Q(badge_tier=F('actual_tier'))
+    )
+    stale_ids = list(stale.values_list('pk', flat=True))
+    if stale_ids and not dry_run:
+        UserProfile.objects.filter(pk__in=stale_ids).update(
+            review_count=actual_reviews,
+            achievement_count=actual_achievements,
+            badge_tier=_tier_expression(actual_achievements, actual_reviews),
+        )
+    return len(stale_ids)
@@ -0,0 +1,278 @@
+# core/services/benchmarks.py
+"""
+Comparación de empresas con sus pares de sector y ciudad.
+
+Por cada sector y cada ciudad se guarda un histograma de intervalos fijos
+(BenchmarkSketch) de tres métricas por empresa: calificación promedio,
+puntaje de tiempo de respuesta y tasa de aprobación. Las métricas se
+calculan igual que en el dashboard del representante (todas las reseñas
+de la empresa).
+
+Al cambiar una reseña o una empresa se recalculan solo las métricas de esa
+empresa y su aporte se mueve de un intervalo a otro. El percentil de una
+empresa se obtiene leyendo dos histogramas, sin recorrer a sus pares.
+
+Los intervalos fijos reemplazan a t-digest/KLL: los valores están acotados
+(1-5 y 0-100), la resolución de 0.05 puntos o 1% es exacta para mostrar
+percentiles y, a diferencia de esos sketches, se puede restar una empresa.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import Avg, Case, Count, IntegerField, Q, When
+
+from companies.models import BenchmarkSketch, Company, CompanyBenchmark
+from core.services.review_snapshot import RESPONSE_TIME_SCORES
+
+logger = logging.getLogger(__name__)
+
+# Métrica -> (mínimo, máximo, ancho del intervalo)
+METRICS = {
+    'avg_rating': (1.0, 5.0, 0.05),
+    'response_time_score': (1.0, 5.0, 0.05),
+    'approval_rate': (0.0, 100.0, 1.0),
+}
+
+DIMENSIONS = ['sector', 'location']
+
+# Mínimo de empresas en el grupo para mostrar un percentil
+MIN_PEERS = 3
+
+
+# ===== HISTOGRAMAS =====
+
+def bin_count(metric):
+    low, high, width = METRICS[metric]
+    return int(round((high - low) / width)) + 1
+
+
+def bin_index(metric, value):
+    """Intervalo del histograma que corresponde a un valor"""
+    low, high, width = METRICS[metric]
+    value = min(max(value, low), high)
+    return int(round((value - low) / width))
+
+
+def percentile_rank(counts, index):
+    """
+    Porcentaje de empresas por debajo del intervalo, contando la mitad de
+    las empresas que comparten el mismo intervalo.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    below = sum(counts[:index])
+    return (below + counts[index] / 2) / total * 100
+
+
+def _adjust(changes):
+    """
+    Aplica cambios {(dimensión, grupo, métrica): {intervalo: delta}} a los
+    histogramas, bloqueando las filas afectadas.
+    """
+    for (dimension, group, metric), deltas in sorted(changes.items()):
+        if not any(deltas.values()):
+            continue
+        sketch, _ = BenchmarkSketch.objects.select_for_update().get_or_create(
+            dimension=dimension, group=group, metric=metric,
+            defaults={'counts': [0] * bin_count(metric)},
+        )
+        counts = sketch.counts or [0] * bin_count(metric)
+        for index, delta in deltas.items():
+            counts[index] = max(counts[index] + delta, 0)
+        sketch.counts = counts
+        sketch.total = sum(counts)
+        if sketch.total:
+            sketch.save(update_fields=['counts', 'total', 'updated_at'])
+        else:
+            sketch.delete()
+
+
+def _contributions(sector, location, metrics):
+    """Intervalos en los que cuenta una empresa: {(dimensión, grupo, métrica): intervalo}"""
+    result = {}
+    groups = {'sector': sector, 'location': location}
+    for dimension in DIMENSIONS:
+        if not groups[dimension]:
+            continue
+        for metric, value in metrics.items():
+            if value is not None:
+                result[(dimension, groups[dimension], metric)] = bin_index(metric, value)
+    return result
+
+
+def _benchmark_metrics(benchmark):
+    return {metric: getattr(benchmark, metric) for metric in METRICS}
+
+
+# ===== MÉTRICAS POR EMPRESA =====
+
+def _response_time_score():
+    return Case(
+        *[When(reviews__response_time_rating=value, then=score) for value, score in RESPONSE_TIME_SCORES.items()],
+        output_field=IntegerField(),
+    )
+
+
+def company_metrics_queryset():
+    """Empresas con las métricas de comparación calculadas por la base de datos"""
+    return Company.objects.annotate(
+        bench_total=Count('reviews'),
+        bench_approved=Count('reviews', filter=Q(reviews__status='approved')),
+        bench_avg_rating=Avg('reviews__overall_rating'),
+        bench_response_time=Avg(_response_time_score()),
+    )
+
+
+def _metrics_from_annotations(company):
+    """Métricas de una empresa anotada; sin reseñas o inactiva no se cuenta"""
+    if not company.is_active or not company.bench_total:
+        return {metric: None for metric in METRICS}
+    return {
+        'avg_rating': company.bench_avg_rating,
+        'response_time_score': company.bench_response_time,
+        'approval_rate': company.bench_approved / company.bench_total * 100,
+    }
+
+
+# ===== ACTUALIZACIÓN INCREMENTAL =====
+
+def update_company_benchmark(company_id):
+    """
+    Recalcula las métricas de una empresa y mueve su aporte en los
+    histogramas de su sector y su ciudad. Si la empresa fue eliminada,
+    descuenta su aporte y borra sus métricas.
+    """
+    with transaction.atomic():
+        benchmark = CompanyBenchmark.objects.select_for_update().filter(company_id=company_id).first()
+        company = company_metrics_queryset().filter(pk=company_id).first()
+
+        old = {}
+        if benchmark is not None:
+            old = _contributions(benchmark.sector, benchmark.location, _benchmark_metrics(benchmark))
+
+        new = {}
+        if company is not None:
+            metrics = _metrics_from_annotations(company)
+            new = _contributions(company.sector, company.location, metrics)
+
+        changes = {}
+        for key, index in old.items():
+            if new.get(key) != index:
+                changes.setdefault(key, {})
+                changes[key][index] = changes[key].get(index, 0) - 1
+        for key, index in new.items():
+            if old.get(key) != index:
+                changes.setdefault(key, {})
+                changes[key][index] = changes[key].get(index, 0) + 1
+        _adjust(changes)
+
+        if company is None:
+            if benchmark is not None:
+                benchmark.delete()
+            return None
+
+        if benchmark is None:
+            benchmark = CompanyBenchmark(company_id=company_id)
+        benchmark.sector = company.sector or ''
+        benchmark.location = company.location or ''
+        benchmark.total_reviews = company.bench_total
+        for metric, value in metrics.items():
+            setattr(benchmark, metric, value)
+        benchmark.save()
+        return benchmark
+
+
+def schedule_company_benchmark(company_id):
+    """Actualiza las métricas de la empresa al confirmar la transacción en curso"""
+    def _update():
+        try:
+            update_company_benchmark(company_id)
+        except Exception as e:
+            # Un fallo aquí no debe afectar el guardado; rebuild_benchmarks lo corrige
+            logger.warning(f"No se pudo actualizar la comparación de la empresa {company_id}: {e}")
+
+    transaction.on_commit(_update)
+
+
+# ===== RECONSTRUCCIÓN COMPLETA =====
+
+def rebuild_benchmarks():
+    """
+    Recalcula las métricas de todas las empresas con una sola consulta
+    agregada y reemplaza todos los histogramas. Retorna la cantidad de
+    empresas contadas.
+    """
+    benchmarks = []
+    sketches = {}
+    for company in company_metrics_queryset().iterator():
+        metrics = _metrics_from_annotations(company)
+        benchmarks.append(CompanyBenchmark(
+            company_id=company.pk,
+            sector=company.sector or '',
+            location=company.location or '',
+            total_reviews=company.bench_total,
+            **metrics,
+        ))
+        for (dimension, group, metric), index in _contributions(company.sector, company.location, metrics).items():
+            counts = sketches.setdefault((dimension, group, metric), [0] * bin_count(metric))
+            counts[index] += 1
+
+    with transaction.atomic():
+        CompanyBenchmark.objects.all().delete()
+        BenchmarkSketch.objects.all().delete()
+        CompanyBenchmark.objects.bulk_create(benchmarks, batch_size=500)
+        BenchmarkSketch.objects.bulk_create([
+            BenchmarkSketch(dimension=dimension, group=group, metric=metric, counts=counts, total=sum(counts))
+            for (dimension, group, metric), counts in sketches.items()
+        ], batch_size=500)
+
+    return sum(1 for benchmark in benchmarks if benchmark.avg_rating is not None)
+
+
+# ===== LECTURA PARA EL DASHBOARD =====
+
+def company_benchmarks(company):
+    """
+    Percentiles de la empresa frente a su sector y su ciudad, listos para
+    la plantilla. Solo incluye grupos con al menos MIN_PEERS empresas.
+    """
+    benchmark = CompanyBenchmark.objects.filter(company=company).first()
+    if benchmark is None or benchmark.avg_rating is None:
+        return []
+
+    groups = {'sector': benchmark.sector, 'location': benchmark.location}
+    sketches = {
+        (sketch.dimension, sketch.metric): sketch
+        for sketch in BenchmarkSketch.objects.filter(
+            Q(dimension='sector', group=benchmark.sector) |
+            Q(dimension='location', group=benchmark.location)
+        )
+    }
+
+    dimension_labels = dict(BenchmarkSketch.DIMENSION_CHOICES)
+    metric_labels = dict(BenchmarkSketch.METRIC_CHOICES)
+    results = []
+    for dimension in DIMENSIONS:
+        rows = []
+        for metric in METRICS:
+            value = getattr(benchmark, metric)
+            sketch = sketches.get((dimension, metric))
+            if value is None or sketch is None or sketch.total < MIN_PEERS:
+                continue
+            rows.append({
+                'metric': metric,
+                'label': metric_labels[metric],
+                'value': value,
+                'percentile': round(percentile_rank(sketch.counts, bin_index(metric, value))),
+            })
+        if rows:
+            results.append({
+                'dimension': dimension,
+                'label': dimension_labels[dimension],
+                'group': groups[dimension],
+                'peers': max(sketches[(dimension, row['metric'])].total for row in rows),
+                'metrics': rows,
+            })
+    return results
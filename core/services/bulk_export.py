@@ -0,0 +1,238 @@
+# core/services/bulk_export.py
+"""
+Exportación masiva de reseñas para el staff.
+
+Genera un ZIP con una partición por empresa, comprimida con gzip, en CSV
+(mismas columnas que la exportación de una empresa) o NDJSON (una reseña
+por línea con los valores crudos, pensado para análisis fuera de línea).
+El ZIP incluye manifest.json con los filtros usados y la cantidad de
+reseñas de cada partición.
+
+Las particiones se escriben en paralelo con un pool de procesos. Cada
+worker arranca Django desde cero (contexto 'spawn'), así no hereda
+conexiones abiertas ni hilos del proceso principal, y lee sus reseñas con
+values_list().iterator() escribiendo directo al archivo gzip.
+
+Configuración opcional en settings.py:
+- BULK_EXPORT_WORKERS: procesos del pool en las exportaciones en segundo plano
+"""
+
+import gzip
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from companies.models import Company
+from reviews.models import Review
+from core.services import csv_export
+
+FORMATS = {
+    'csv': '.csv.gz',
+    'ndjson': '.ndjson.gz',
+}
+
+NDJSON_FIELDS = [
+    'id', 'company_id', 'user_profile_id', 'submission_date', 'job_title', 'modality',
+    'overall_rating', 'communication_rating', 'difficulty_rating', 'response_time_rating',
+    'pros', 'cons', 'interview_questions', 'status',
+]
+
+
+# ===== PARÁMETROS =====
+
+DATE_PARAMS = ('since', 'until')
+
+
+def _parse_date(value):
+    """Fecha AAAA-MM-DD o None si no es válida (también 2024-02-31)"""
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+def invalid_dates(query):
+    """Filtros de fecha con un valor que no es una fecha válida: [(nombre, valor)]"""
+    return [
+        (name, query.get(name)) for name in DATE_PARAMS
+        if query.get(name) and _parse_date(query.get(name)) is None
+    ]
+
+
+def parse_bulk_params(query):
+    """
+    Normaliza los filtros de la exportación masiva (QueryDict o dict):
+    formato, sector, ciudad, rango de fechas y si incluir empresas inactivas.
+    """
+    since = _parse_date(query.get('since'))
+    until = _parse_date(query.get('until'))
+    return {
+        'format': query.get('format') if query.get('format') in FORMATS else 'csv',
+        'sector': (query.get('sector') or '').strip(),
+        'location': (query.get('location') or '').strip(),
+        'since': since.isoformat() if since else None,
+        'until': until.isoformat() if until else None,
+        'include_inactive': str(query.get('include_inactive') or '').lower() in ('1', 'true', 'on'),
+    }
+
+
+def bulk_companies(params):
+    """Empresas incluidas en la exportación"""
+    companies = Company.objects.all()
+    if not params['include_inactive']:
+        companies = companies.filter(is_active=True)
+    if params['sector']:
+        companies = companies.filter(sector__iexact=params['sector'])
+    if params['location']:
+        companies = companies.filter(location__iexact=params['location'])
+    return companies.order_by('id')
+
+
+def date_range(params):
+    """(desde, hasta) como datetimes con zona horaria; hasta es exclusivo"""
+    tz = timezone.get_current_timezone()
+    since = until = None
+    if params['since']:
+        since = timezone.make_aware(datetime.combine(date.fromisoformat(params['since']), time.min), tz)
+    if params['until']:
+        until = timezone.make_aware(datetime.combine(date.fromisoformat(params['until']) + timedelta(days=1), time.min), tz)
+    return since, until
+
+
+def bulk_filename(company=None, params=None):
+    return f"reseñas_plataforma_{timezone.now().strftime('%Y%m%d')}.zip"
+
+
+def _partition_name(company_id, name, format):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')[:60] or 'empresa'
+    return f"{company_id}_{slug}{FORMATS[format]}"
+
+
+# ===== PARTICIONES =====
+
+def ndjson_records(reviews):
+    """Valores crudos de las reseñas para NDJSON"""
+    for values in reviews.values_list(*NDJSON_FIELDS).iterator(chunk_size=csv_export.CHUNK_SIZE):
+        record = dict(zip(NDJSON_FIELDS, values))
+        record['submission_date'] = record['submission_date'].isoformat()
+        yield record
+
+
+def ndjson_chunks(records):
+    """Texto NDJSON en bloques de aproximadamente FLUSH_BYTES"""
+    lines = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False)
+        lines.append(line)
+        size += len(line) + 1
+        if size >= csv_export.FLUSH_BYTES:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+            size = 0
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def export_partition(company_id, name, format, since, until, directory):
+    """
+    Escribe las reseñas de una empresa en un archivo gzip dentro de
+    'directory'. Retorna (company_id, nombre del archivo, reseñas escritas).
+    Se ejecuta en los procesos del pool.
+    """
+    reviews = Review.objects.filter(company_id=company_id)
+    if since:
+        reviews = reviews.filter(submission_date__gte=since)
+    if until:
+        reviews = reviews.filter(submission_date__lt=until)
+
+    rows = 0
+
+    def counted(items):
+        nonlocal rows
+        for item in items:
+            rows += 1
+            yield item
+
+    if format == 'csv':
+        chunks = csv_export.csv_chunks(counted(csv_export.review_rows(company_id, reviews=reviews)))
+    else:
+        chunks = ndjson_chunks(counted(ndjson_records(reviews)))
+
+    filename = _partition_name(company_id, name, format)
+    with gzip.open(os.path.join(directory, filename), 'wb', compresslevel=6) as output:
+        for chunk in chunks:
+            output.write(chunk.encode('utf-8'))
+
+    return company_id, filename, rows
+
+
+# ===== ARCHIVO ZIP =====
+
+def write_bulk_export(params, output, workers=1, progress=None):
+    """
+    Escribe el ZIP de la exportación masiva en 'output' (archivo binario).
+
+    workers: procesos del pool; con 1 las particiones se escriben en el
+    proceso actual. progress(empresas terminadas, total) se llama al
+    completar cada partición. Retorna el manifiesto.
+    """
+    companies = list(bulk_companies(params).values_list('id', 'name'))
+    since, until = date_range(params)
+    manifest = {
+        'generated_at': timezone.now().isoformat(),
+        'filters': params,
+        'companies': [],
+    }
+
+    with tempfile.TemporaryDirectory() as directory, \
+            zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+
+        def add_partition(result):
+            company_id, filename, rows = result
+            path = os.path.join(directory, filename)
+            # Las particiones ya están comprimidas; se guardan sin recomprimir
+            archive.write(path, f"reseñas/{filename}")
+            os.remove(path)
+            manifest['companies'].append({'id': company_id, 'file': f"reseñas/{filename}", 'reviews': rows})
+            if progress:
+                progress(len(manifest['companies']), len(companies))
+
+        tasks = [(pk, name, params['format'], since, until, directory) for pk, name in companies]
+        if workers > 1 and len(tasks) > 1:
+            # Los procesos nuevos abren sus propias conexiones. El inicializador
+            # es django.setup y no una función de este módulo: al importar este
+            # módulo se cargan modelos, que requieren Django ya configurado.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            ) as pool:
+                futures = [pool.submit(export_partition, *task) for task in tasks]
+                for future in as_completed(futures):
+                    add_partition(future.result())
+        else:
+            for task in tasks:
+                add_partition(export_partition(*task))
+
+        manifest['companies'].sort(key=lambda item: item['id'])
+        manifest['total_reviews'] = sum(item['reviews'] for item in manifest['companies'])
+        archive.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    return manifest
+
+
+def default_workers():
+    return getattr(settings, 'BULK_EXPORT_WORKERS', min(4, os.cpu_count() or 1))
@@ -0,0 +1,111 @@
+# core/services/cache_generations.py
+"""
+Invalidación de caché entre nodos mediante contadores de generación.
+
+Cada espacio de nombres ('company:<id>', 'user:<id>', 'platform', 'catalog')
+tiene un contador en la tabla CacheGeneration. Las claves de caché incluyen
+el valor del contador, así que incrementarlo desde cualquier nodo invalida
+las entradas en todos los nodos sin necesidad de un servicio pub/sub.
+
+Para no consultar la base de datos en cada lectura, cada nodo memoriza la
+generación en su caché local durante CACHE_GENERATION_LOCAL_TTL segundos;
+ese es el máximo desfase entre nodos.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+
+from common.models import CacheGeneration
+
+PLATFORM = 'platform'
+
+# Listado de empresas (nombres, sector, ciudad, estado): solo cambia al
+# guardar o borrar una empresa, no con las reseñas
+CATALOG = 'catalog'
+
+
+def company_namespace(company_id):
+    return f'company:{company_id}'
+
+
+def user_namespace(user_profile_id):
+    return f'user:{user_profile_id}'
+
+
+def _local_cache():
+    return caches[getattr(settings, 'CACHE_GENERATION_LOCAL_ALIAS', 'default')]
+
+
+def _local_ttl():
+    return getattr(settings, 'CACHE_GENERATION_LOCAL_TTL', 5)
+
+
+def _local_key(namespace):
+    return f'generation:{namespace}'
+
+
+def get_generations(namespaces):
+    """
+    Retorna {namespace: generación} para varios espacios de nombres.
+    Los que no existen en la base de datos tienen generación 0.
+    """
+    local = _local_cache()
+    keys = {namespace: _local_key(namespace) for namespace in namespaces}
+    cached = local.get_many(list(keys.values()))
+
+    result = {}
+    missing = []
+    for namespace, key in keys.items():
+        if key in cached:
+            result[namespace] = cached[key]
+        else:
+            missing.append(namespace)
+
+    if missing:
+        stored = dict(
+            CacheGeneration.objects.filter(namespace__in=missing)
+            .values_list('namespace', 'generation')
+        )
+        fresh = {namespace: stored.get(namespace, 0) for namespace in missing}
+        local.set_many({keys[ns]: gen for ns, gen in fresh.items()}, timeout=_local_ttl())
+        result.update(fresh)
+
+    return result
+
+
+def get_generation(namespace):
+    """Generación actual de un espacio de nombres"""
+    return get_generations([namespace])[namespace]
+
+
+def bump_generations(*namespaces):
+    """
+    Incrementa la generación de uno o más espacios de nombres.
+    Se ejecuta al confirmar la transacción para que ningún nodo vea la nueva
+    generación antes que los datos que la provocaron.
+    """
+    namespaces = sorted(set(namespaces))
+    if not namespaces:
+        return
+
+    def _bump():
+        with transaction.atomic():
+            CacheGeneration.objects.bulk_create(
+                [CacheGeneration(namespace=namespace) for namespace in namespaces],
+                ignore_conflicts=True,
+            )
+            CacheGeneration.objects.filter(namespace__in=namespaces).update(
+                generation=F('generation') + 1
+            )
+        # El nodo que escribe ve el cambio de inmediato
+        _local_cache().delete_many([_local_key(namespace) for namespace in namespaces])
+
+    transaction.on_commit(_bump)
+
+
+def versioned_key(namespace, *parts):
+    """Construye una clave de caché ligada a la generación del espacio"""
+    suffix = ':'.join(str(part) for part in parts)
+    return f'{namespace}:g{get_generation(namespace)}:{suffix}'
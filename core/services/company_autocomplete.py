@@ -0,0 +1,251 @@
+# core/services/company_autocomplete.py
+"""
+Autocompletado de nombres de empresa con un índice en memoria.
+
+Cada proceso guarda los nombres de las empresas activas ya normalizados
+(sin tildes ni mayúsculas, core/services/spanish_text.py) en dos
+estructuras:
+
+- Una lista ordenada de claves, una por cada palabra del nombre hasta el
+  final ("banco de bogota", "de bogota", "bogota"). Las empresas cuyo
+  nombre o alguna de sus palabras empieza por lo escrito se encuentran con
+  una búsqueda binaria, sin recorrer el listado.
+- Un índice invertido de trigramas, para sugerir nombres parecidos cuando
+  hay errores de tipeo ("bancolombai" sugiere "Bancolombia").
+
+El índice se reconstruye cuando cambia la generación CATALOG, que se
+incrementa al guardar o borrar una empresa (core/signals.py). Así los
+formularios no tienen que enviar el listado completo de empresas.
+
+El mismo índice resuelve un nombre escrito a mano a una empresa existente
+(resolve_company) para no crear duplicados: compara claves canónicas, sin
+espacios ni razón social ("Bancolombia", "bancolombia S.A." y "Banco
+lombia" son "bancolombia"), y si no hay una igual acepta la más parecida
+por trigramas sobre COMPANY_DEDUP_THRESHOLD. Los duplicados que ya existen
+se unen con "manage.py merge_companies" (core/services/company_merge.py).
+
+Configuración opcional en settings.py:
+- AUTOCOMPLETE_LIMIT: máximo de sugerencias por consulta
+- COMPANY_DEDUP_THRESHOLD: similitud mínima para reutilizar una empresa
+"""
+
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+from companies.models import Company
+from core.services.cache_generations import CATALOG, get_generation
+from core.services.spanish_text import words
+
+# Similitud mínima de trigramas para sugerir un nombre con errores de tipeo
+TRIGRAM_THRESHOLD = 0.3
+
+# Palabras finales que no distinguen una empresa de otra (razón social)
+LEGAL_SUFFIXES = {
+    's', 'a', 'sa', 'sas', 'ltda', 'limitada', 'cia', 'y', 'e', 'u', 'eu',
+    'bic', 'inc', 'corp', 'llc', 'ltd', 'sl', 'gmbh',
+}
+
+# Claves canónicas más cortas solo se comparan exactas ("3m", "ibm")
+MIN_FUZZY_KEY = 5
+
+# Candidatos (por trigramas en común) que se comparan al resolver un nombre
+FUZZY_CANDIDATES = 20
+
+MAX_LIMIT = 20
+
+_lock = threading.Lock()
+_index = None
+
+
+def default_limit():
+    return getattr(settings, 'AUTOCOMPLETE_LIMIT', 8)
+
+
+def dedup_threshold():
+    return getattr(settings, 'COMPANY_DEDUP_THRESHOLD', 0.6)
+
+
+def normalize_name(name):
+    """Nombre sin tildes, mayúsculas ni puntuación ('Éxito S.A.' -> 'exito s a')"""
+    return ' '.join(words(name))
+
+
+def canonical_key(name):
+    """Nombre normalizado sin espacios ni razón social ('Bancolombia S.A.' -> 'bancolombia')"""
+    terms = normalize_name(name).split()
+    while len(terms) > 1 and terms[-1] in LEGAL_SUFFIXES:
+        terms.pop()
+    return ''.join(terms)
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(grams_a, grams_b):
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+# ===== ÍNDICE =====
+
+class CompanyNameIndex:
+    """Nombres de las empresas activas, listos para buscar por prefijo y trigramas"""
+
+    def __init__(self, companies, generation=None):
+        self.generation = generation
+        self.companies = {}
+        self.normalized = {}
+        self.canonical = {}
+        self.by_key = {}
+        keys = []
+        self.trigram_ids = {}
+        self.trigram_counts = {}
+        for company_id, name, sector, location in companies:
+            normalized = normalize_name(name)
+            if not normalized:
+                continue
+            self.companies[company_id] = {'id': company_id, 'name': name, 'sector': sector, 'location': location}
+            self.normalized[company_id] = normalized
+            key = canonical_key(name)
+            self.canonical[company_id] = key
+            # Con varias empresas con la misma clave, la más antigua
+            if key not in self.by_key or company_id < self.by_key[key]:
+                self.by_key[key] = company_id
+            terms = normalized.split()
+            for position in range(len(terms)):
+                keys.append((' '.join(terms[position:]), position, company_id))
+            grams = trigrams(normalized)
+            self.trigram_counts[company_id] = len(grams)
+            for gram in grams:
+                self.trigram_ids.setdefault(gram, []).append(company_id)
+        keys.sort()
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.companies)
+
+    def _prefix_matches(self, query):
+        """{id: tipo de coincidencia} de las empresas con alguna palabra que empieza por query"""
+        matches = {}
+        start = bisect_left(self.keys, (query,))
+        for key, position, company_id in self.keys[start:]:
+            if not key.startswith(query):
+                break
+            if self.normalized[company_id] == query:
+                kind = 0  # Nombre exacto
+            elif position == 0:
+                kind = 1  # El nombre empieza por la consulta
+            else:
+                kind = 2  # Otra palabra del nombre empieza por la consulta
+            if company_id not in matches or kind < matches[company_id]:
+                matches[company_id] = kind
+        return matches
+
+    def _shared_trigrams(self, query):
+        """{id: trigramas en común con query}"""
+        shared = {}
+        for gram in trigrams(query):
+            for company_id in self.trigram_ids.get(gram, ()):
+                shared[company_id] = shared.get(company_id, 0) + 1
+        return shared
+
+    def _similar(self, query, exclude):
+        """[(similitud, id)] de los nombres con trigramas en común sobre el umbral"""
+        grams = trigrams(query)
+        shared = self._shared_trigrams(query)
+        similar = []
+        for company_id, count in shared.items():
+            if company_id in exclude:
+                continue
+            score = count / (len(grams) + self.trigram_counts[company_id] - count)
+            if score >= TRIGRAM_THRESHOLD:
+                similar.append((score, company_id))
+        similar.sort(key=lambda item: (-item[0], self.normalized[item[1]]))
+        return similar
+
+    def lookup(self, text, limit):
+        """Empresas que coinciden con lo escrito: primero por prefijo y luego parecidas"""
+        query = normalize_name(text)
+        if not query:
+            return []
+
+        matches = self._prefix_matches(query)
+        ranked = sorted(
+            matches,
+            key=lambda company_id: (matches[company_id], len(self.normalized[company_id]), self.normalized[company_id]),
+        )[:limit]
+
+        if len(ranked) < limit and len(query) >= 3:
+            ranked += [company_id for _, company_id in self._similar(query, set(matches))][:limit - len(ranked)]
+        return [self.companies[company_id] for company_id in ranked]
+
+    def resolve(self, name, threshold, exclude=()):
+        """
+        (id, similitud) de la empresa que corresponde a 'name': la de la misma
+        clave canónica o la de clave más parecida sobre el umbral. (None, 0)
+        si no hay ninguna.
+        """
+        key = canonical_key(name)
+        if not key:
+            return None, 0.0
+        company_id = self.by_key.get(key)
+        if company_id is not None and company_id not in exclude:
+            return company_id, 1.0
+        if len(key) < MIN_FUZZY_KEY:
+            return None, 0.0
+
+        shared = self._shared_trigrams(normalize_name(name))
+        candidates = sorted(shared, key=lambda company_id: -shared[company_id])[:FUZZY_CANDIDATES]
+        grams = trigrams(key)
+        best, best_score = None, threshold
+        for company_id in candidates:
+            if company_id in exclude or len(self.canonical[company_id]) < MIN_FUZZY_KEY:
+                continue
+            score = similarity(grams, trigrams(self.canonical[company_id]))
+            if score >= best_score:
+                best, best_score = company_id, score
+        return (best, best_score) if best is not None else (None, 0.0)
+
+
+def _load():
+    companies = Company.objects.filter(is_active=True).values_list('id', 'name', 'sector', 'location')
+    return companies.iterator(chunk_size=2000)
+
+
+def get_index():
+    """Índice del proceso, reconstruido si cambió el listado de empresas"""
+    global _index
+    generation = get_generation(CATALOG)
+    index = _index
+    if index is not None and index.generation == generation:
+        return index
+    with _lock:
+        if _index is None or _index.generation != generation:
+            _index = CompanyNameIndex(_load(), generation)
+        return _index
+
+
+# ===== CONSULTAS =====
+
+def suggest(text, limit=None):
+    """Sugerencias para el texto escrito: lista de {'id', 'name', 'sector', 'location'}"""
+    limit = min(limit or default_limit(), MAX_LIMIT)
+    return get_index().lookup(text, limit)
+
+
+def resolve_company(name, threshold=None):
+    """
+    Empresa activa que corresponde a un nombre escrito a mano, o None:
+    misma clave canónica ('bancolombia S.A.', 'Banco lombia') o nombre
+    parecido sobre el umbral ('Bancolombai').
+    """
+    company_id, _ = get_index().resolve(name, threshold or dedup_threshold())
+    if company_id is None:
+        return None
+    return Company.objects.filter(id=company_id, is_active=True).first()
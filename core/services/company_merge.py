@@ -0,0 +1,150 @@
+# core/services/company_merge.py
+"""
+Detección y unión de empresas duplicadas.
+
+find_duplicate_groups() agrupa las empresas por clave canónica y por
+similitud de trigramas (core/services/company_autocomplete.py), para que el
+staff revise los grupos. merge_companies() pasa a la empresa que se
+conserva, con UPDATE masivos, todo lo que apunta a las duplicadas:
+reseñas, reseñas pendientes, historial laboral, representantes y
+exportaciones. Después borra las duplicadas.
+
+Las filas con restricción única (usuario, empresa, cargo) que ya existen en
+la empresa conservada se borran en la duplicada en lugar de moverse.
+
+Como los UPDATE no disparan señales, al final se invalidan las cachés de las
+empresas, autores y plataforma, se reindexan las preguntas de entrevista de
+las reseñas movidas y se recalcula la comparación de la empresa conservada.
+Las duplicadas se borran con delete(), así sus señales las quitan de los
+índices de búsqueda y de las comparaciones.
+
+Se usa desde "manage.py merge_companies".
+"""
+
+from django.db import transaction
+
+from companies.models import Company, ExportJob
+from reviews.models import PendingReview, Review
+from work_history.models import WorkHistory
+from accounts.models import UserProfile
+from core.services import interview_questions
+from core.services.benchmarks import schedule_company_benchmark
+from core.services.cache_generations import (
+    PLATFORM, bump_generations, company_namespace, user_namespace,
+)
+from core.services.company_autocomplete import CompanyNameIndex, dedup_threshold
+
+
+# ===== DETECCIÓN =====
+
+def find_duplicate_groups(threshold=None):
+    """
+    Grupos de empresas que parecen la misma, de la más antigua a la más
+    nueva. Lista de listas de Company; solo grupos de dos o más.
+    """
+    threshold = threshold or dedup_threshold()
+    companies = Company.objects.order_by('id')
+    index = CompanyNameIndex(companies.values_list('id', 'name', 'sector', 'location'))
+
+    # Unión de conjuntos: cada empresa apunta al representante de su grupo
+    parent = {company_id: company_id for company_id in index.companies}
+
+    def find(company_id):
+        while parent[company_id] != company_id:
+            parent[company_id] = parent[parent[company_id]]
+            company_id = parent[company_id]
+        return company_id
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    by_key = {}
+    for company_id, key in index.canonical.items():
+        if key in by_key:
+            union(company_id, by_key[key])
+        else:
+            by_key[key] = company_id
+
+    for company_id, company in index.companies.items():
+        match, _ = index.resolve(company['name'], threshold, exclude={company_id})
+        if match is not None:
+            union(company_id, match)
+
+    groups = {}
+    for company_id in index.companies:
+        groups.setdefault(find(company_id), []).append(company_id)
+    grouped_ids = [sorted(ids) for ids in groups.values() if len(ids) > 1]
+
+    by_id = Company.objects.in_bulk([company_id for ids in grouped_ids for company_id in ids])
+    return [[by_id[company_id] for company_id in ids] for ids in sorted(grouped_ids)]
+
+
+# ===== UNIÓN =====
+
+def _move_unique(model, target, duplicate_ids):
+    """
+    Mueve filas con unique_together (usuario, empresa, cargo). Las que ya
+    existen en la empresa conservada se borran. Retorna (movidas, borradas).
+    """
+    existing = set(
+        model.objects.filter(company=target).values_list('user_profile_id', 'job_title')
+    )
+    conflicting = []
+    seen = set(existing)
+    rows = model.objects.filter(company_id__in=duplicate_ids).order_by('id')
+    for row_id, user_profile_id, job_title in rows.values_list('id', 'user_profile_id', 'job_title'):
+        if (user_profile_id, job_title) in seen:
+            conflicting.append(row_id)
+        else:
+            seen.add((user_profile_id, job_title))
+    deleted = model.objects.filter(id__in=conflicting).delete()[0] if conflicting else 0
+    moved = model.objects.filter(company_id__in=duplicate_ids).update(company=target)
+    return moved, deleted
+
+
+def merge_companies(target, duplicates):
+    """
+    Une las empresas 'duplicates' en 'target'. Retorna un diccionario con
+    la cantidad de filas movidas de cada tipo.
+    """
+    duplicate_ids = [company.pk for company in duplicates if company.pk != target.pk]
+    if not duplicate_ids:
+        return {}
+
+    with transaction.atomic():
+        moved_reviews = list(Review.objects.filter(company_id__in=duplicate_ids).values_list('id', 'user_profile_id'))
+        reviews = Review.objects.filter(company_id__in=duplicate_ids).update(company=target)
+        pending_moved, pending_deleted = _move_unique(PendingReview, target, duplicate_ids)
+        work_moved, work_deleted = _move_unique(WorkHistory, target, duplicate_ids)
+        work_profiles = set(WorkHistory.objects.filter(company=target).values_list('user_profile_id', flat=True))
+        representatives = UserProfile.objects.filter(company_id__in=duplicate_ids).update(company=target)
+        export_jobs = ExportJob.objects.filter(company_id__in=duplicate_ids).update(company=target)
+
+        # Las preguntas de entrevista se agrupan por empresa
+        for review in Review.objects.filter(id__in=[review_id for review_id, _ in moved_reviews]):
+            interview_questions.index_review(review)
+
+        bump_generations(
+            company_namespace(target.pk),
+            *[company_namespace(company_id) for company_id in duplicate_ids],
+            *[user_namespace(user_profile_id) for _, user_profile_id in moved_reviews],
+            *[user_namespace(user_profile_id) for user_profile_id in work_profiles],
+            PLATFORM,
+        )
+        schedule_company_benchmark(target.pk)
+
+        for company in Company.objects.filter(id__in=duplicate_ids):
+            company.delete()
+
+    return {
+        'companies': len(duplicate_ids),
+        'reviews': reviews,
+        'pending_reviews': pending_moved,
+        'pending_reviews_deleted': pending_deleted,
+        'work_history': work_moved,
+        'work_history_deleted': work_deleted,
+        'representatives': representatives,
+        'export_jobs': export_jobs,
+    }
@@ -0,0 +1,244 @@
+# core/services/company_search.py
+"""
+Búsqueda de empresas sobre índices FTS5 de SQLite.
+
+Dos tablas virtuales, con el id de la empresa como rowid:
+
+- companies_company_fts: nombre, sector, ciudad, región y descripción con el
+  tokenizador unicode61 (sin tildes ni mayúsculas) e índices de prefijo.
+  Cada palabra de la búsqueda se busca como prefijo ("bogo" encuentra
+  "Bogotá") y los resultados se ordenan por bm25, con más peso en el nombre.
+- companies_company_trigram: nombre, sector y ciudad con el tokenizador
+  trigram, sobre el texto ya normalizado. Se usa cuando la búsqueda no
+  encuentra palabras completas ("soft" dentro de "Microsoft"), como hacía
+  el antiguo icontains.
+
+Los índices se mantienen al guardar o borrar una empresa (core/signals.py)
+y se reconstruyen con "manage.py rebuild_search_index". Los cambios hechos
+con queryset.update() no disparan señales y requieren reconstruir.
+
+En otros motores de base de datos (o si las tablas no existen) se usa el
+filtro icontains de siempre, sin orden por relevancia.
+
+filter_by_search() aplica el MATCH como subconsulta dentro del queryset del
+llamador, así los demás filtros (ciudad, estado, métricas) se evalúan sobre
+todas las coincidencias y no solo sobre las más relevantes.
+
+Configuración opcional en settings.py:
+- SEARCH_MAX_RESULTS: máximo de ids que devuelve search_company_ids() (listas
+  cortas tipo autocompletado; filter_by_search no tiene tope)
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import FloatField, IntegerField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from companies.models import Company
+from core.services.spanish_text import fold, words
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'companies_company_fts'
+TRIGRAM_TABLE = 'companies_company_trigram'
+
+FTS_COLUMNS = ['name', 'sector', 'location', 'region', 'description']
+TRIGRAM_COLUMNS = ['name', 'sector', 'location']
+
+# Peso de cada columna de FTS_COLUMNS (y de TRIGRAM_COLUMNS) en bm25
+COLUMN_WEIGHTS = [10.0, 4.0, 4.0, 2.0, 1.0]
+TRIGRAM_WEIGHTS = [4.0, 1.0, 1.0]
+
+
+def max_results():
+    return getattr(settings, 'SEARCH_MAX_RESULTS', 500)
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+# ===== CONSULTAS =====
+
+def match_query(text):
+    """
+    Expresión MATCH de FTS5: cada palabra como prefijo y todas requeridas.
+    Las palabras van entre comillas, así la sintaxis de FTS5 (AND, NEAR,
+    *, -) escrita por el usuario no se interpreta.
+    """
+    terms = words(text)
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _trigram_query(text):
+    folded = ' '.join(fold(text).split())
+    if len(folded) < 3:
+        return None
+    return '"%s"' % folded.replace('"', '""')
+
+
+def _ranked_ids(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _bm25(table):
+    weights = COLUMN_WEIGHTS if table == FTS_TABLE else TRIGRAM_WEIGHTS
+    return f"bm25({table}, {', '.join(str(weight) for weight in weights)})"
+
+
+def _has_match(table, query):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT 1 FROM {table} WHERE {table} MATCH %s LIMIT 1", [query])
+        return cursor.fetchone() is not None
+
+
+def resolve_match(text):
+    """
+    (tabla, expresión MATCH) a usar para 'text': el índice de palabras, o el
+    de trigramas si las palabras no encuentran ninguna empresa. Retorna
+    (None, None) si la búsqueda no tiene términos y None si no hay índice
+    disponible (usar icontains).
+    """
+    if not fts_available():
+        return None
+
+    query = match_query(text)
+    if query is None:
+        return None, None
+
+    try:
+        if _has_match(FTS_TABLE, query):
+            return FTS_TABLE, query
+        trigram = _trigram_query(text)
+        if trigram is not None and _has_match(TRIGRAM_TABLE, trigram):
+            return TRIGRAM_TABLE, trigram
+        return FTS_TABLE, query
+    except DatabaseError as e:
+        logger.warning(f"Índice de búsqueda de empresas no disponible: {e}")
+        return None
+
+
+def search_company_ids(text, limit=None):
+    """
+    Ids de las (a lo sumo 'limit') empresas que coinciden con 'text', de más
+    a menos relevante, para listas cortas. Retorna None si no hay índice
+    disponible (usar icontains).
+    """
+    resolved = resolve_match(text)
+    if resolved is None:
+        return None
+    table, query = resolved
+    if table is None:
+        return []
+
+    try:
+        return _ranked_ids(
+            f"SELECT rowid FROM {table} WHERE {table} MATCH %s "
+            f"ORDER BY {_bm25(table)} LIMIT %s",
+            [query, limit or max_results()],
+        )
+    except DatabaseError as e:
+        logger.warning(f"Índice de búsqueda de empresas no disponible: {e}")
+        return None
+
+
+def filter_by_search(queryset, text):
+    """
+    Filtra un queryset de empresas por la búsqueda y lo anota con
+    'search_rank' (bm25: menor = más relevante). El MATCH va como subconsulta
+    del mismo SELECT, sin tope de resultados. Retorna (queryset, si hay
+    orden por relevancia).
+    """
+    resolved = resolve_match(text)
+    if resolved is None:
+        queryset = queryset.filter(
+            Q(name__icontains=text) |
+            Q(sector__icontains=text) |
+            Q(location__icontains=text)
+        )
+        return queryset.annotate(search_rank=Value(0, output_field=IntegerField())), False
+
+    table, query = resolved
+    if table is None:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField())), True
+
+    company_table = Company._meta.db_table
+    return queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [query])
+    ).annotate(search_rank=RawSQL(
+        f"SELECT {_bm25(table)} FROM {table} "
+        f"WHERE {table} MATCH %s AND rowid = {company_table}.id",
+        [query],
+        output_field=FloatField(),
+    )), True
+
+
+# ===== MANTENIMIENTO DEL ÍNDICE =====
+
+def _index_rows(cursor, companies):
+    """Inserta (o reemplaza) las filas de varias empresas en ambos índices"""
+    rows = [(company.pk, [getattr(company, column) or '' for column in FTS_COLUMNS]) for company in companies]
+    if not rows:
+        return
+    ids = [[pk] for pk, _ in rows]
+    cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", ids)
+    cursor.executemany(f"DELETE FROM {TRIGRAM_TABLE} WHERE rowid = %s", ids)
+    cursor.executemany(
+        f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s)",
+        [[pk] + values for pk, values in rows],
+    )
+    cursor.executemany(
+        f"INSERT INTO {TRIGRAM_TABLE} (rowid, {', '.join(TRIGRAM_COLUMNS)}) VALUES (%s, %s, %s, %s)",
+        [[pk] + [fold(value) for value in values[:len(TRIGRAM_COLUMNS)]] for pk, values in rows],
+    )
+
+
+def index_company(company):
+    """Actualiza la empresa en el índice (señal post_save)"""
+    if not fts_available():
+        return
+    try:
+        with connection.cursor() as cursor:
+            _index_rows(cursor, [company])
+    except DatabaseError as e:
+        # Sin índice la búsqueda cae a icontains; guardar la empresa no debe fallar
+        logger.warning(f"No se pudo indexar la empresa {company.pk}: {e}")
+
+
+def remove_company(company_id):
+    """Quita la empresa del índice (señal post_delete)"""
+    if not fts_available():
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [company_id])
+            cursor.execute(f"DELETE FROM {TRIGRAM_TABLE} WHERE rowid = %s", [company_id])
+    except DatabaseError as e:
+        logger.warning(f"No se pudo quitar la empresa {company_id} del índice: {e}")
+
+
+def rebuild_index(batch_size=2000):
+    """Vacía y vuelve a llenar los índices. Retorna la cantidad de empresas."""
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(f"DELETE FROM {TRIGRAM_TABLE}")
+        batch = []
+        for company in Company.objects.only('id', *FTS_COLUMNS).order_by('id').iterator(chunk_size=batch_size):
+            batch.append(company)
+            if len(batch) >= batch_size:
+                _index_rows(cursor, batch)
+                total += len(batch)
+                batch = []
+        _index_rows(cursor, batch)
+        total += len(batch)
+        # Fusiona los segmentos del índice para que las búsquedas lean menos páginas
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"INSERT INTO {TRIGRAM_TABLE} ({TRIGRAM_TABLE}) VALUES ('optimize')")
+    return total
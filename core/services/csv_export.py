@@ -0,0 +1,127 @@
+# core/services/csv_export.py
+"""
+Exportación de las reseñas de una empresa en CSV.
+
+Las reseñas se leen con values_list().iterator(chunk_size=...) y las
+etiquetas de las choices se resuelven con diccionarios calculados una sola
+vez, sin instanciar modelos. Las filas se agrupan en bloques de unos 64 KB
+que se envían a medida que se generan (StreamingHttpResponse), así la
+descarga empieza de inmediato y la memoria no crece con la cantidad de
+reseñas. Opcionalmente los bloques se comprimen con gzip al vuelo.
+"""
+
+import csv
+import io
+import zlib
+
+from django.utils import timezone
+
+from reviews.models import Review
+
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+
+HEADER = [
+    'Fecha', 'Usuario', 'Cargo', 'Modalidad', 'Calificación General',
+    'Comunicación', 'Dificultad', 'Tiempo de Respuesta', 'Pros', 'Contras',
+    'Preguntas de Entrevista', 'Estado'
+]
+
+FIELDS = [
+    'submission_date', 'user_profile__user__username', 'job_title', 'modality', 'overall_rating',
+    'communication_rating', 'difficulty_rating', 'response_time_rating', 'pros', 'cons',
+    'interview_questions', 'status',
+]
+
+# Campos de FIELDS cuyo valor se muestra con la etiqueta de sus choices
+LABELED_FIELDS = ['modality', 'communication_rating', 'difficulty_rating', 'response_time_rating', 'status']
+
+CHUNK_SIZE = 2000          # Filas por lectura del cursor
+FLUSH_BYTES = 64 * 1024    # Tamaño aproximado de cada bloque enviado
+
+
+def _choice_labels(field_name):
+    return dict(Review._meta.get_field(field_name).flatchoices)
+
+
+def review_rows(company_id, reviews=None):
+    """
+    Filas del CSV (sin encabezado) de las reseñas de la empresa. 'reviews'
+    permite pasar un queryset ya filtrado (por ejemplo, por fechas).
+    """
+    labels = [
+        _choice_labels(field) if field in LABELED_FIELDS else None
+        for field in FIELDS
+    ]
+    if reviews is None:
+        reviews = Review.objects.filter(company_id=company_id)
+    reviews = reviews.order_by('-submission_date', '-id').values_list(*FIELDS)
+
+    for values in reviews.iterator(chunk_size=CHUNK_SIZE):
+        row = [
+            labels[i].get(value, value) if labels[i] is not None else value
+            for i, value in enumerate(values)
+        ]
+        row[0] = row[0].strftime('%d/%m/%Y')
+        yield row
+
+
+def csv_chunks(rows, header=HEADER):
+    """Texto CSV en bloques de aproximadamente FLUSH_BYTES"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_chunks(chunks, compress=False):
+    """Codifica los bloques en UTF-8 y, si se pide, los comprime con gzip"""
+    if not compress:
+        for chunk in chunks:
+            yield chunk.encode('utf-8')
+        return
+
+    # wbits=31: formato gzip (cabecera y CRC) en lugar de zlib
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def company_reviews_csv(company_id, compress=False):
+    """Bytes del CSV de reseñas de la empresa, bloque a bloque"""
+    return encode_chunks(csv_chunks(review_rows(company_id)), compress=compress)
+
+
+def csv_filename(company, params=None):
+    return f'reseñas_{company.name}_{timezone.now().strftime("%Y%m%d")}.csv'
+
+
+def parse_csv_params(query):
+    """El CSV no tiene filtros; se mantiene la firma de los demás formatos"""
+    return {}
+
+
+def write_company_csv(company, output, progress=None, every=500):
+    """Escribe el CSV completo en un archivo binario (exportaciones en segundo plano)"""
+    total = Review.objects.filter(company=company).count() if progress else 0
+    written = 0
+
+    def counted(rows):
+        nonlocal written
+        for row in rows:
+            yield row
+            written += 1
+            if progress and written % every == 0:
+                progress(written, total)
+
+    for data in encode_chunks(csv_chunks(counted(review_rows(company.id)))):
+        output.write(data)
@@ -0,0 +1,179 @@
+# core/services/dashboard_facets.py
+"""
+Filtros por faceta del dashboard de candidatos (sector, ciudad, región y
+modalidad) con la cantidad de empresas de cada opción.
+
+Cada proceso guarda un índice de las empresas activas, cargado con una sola
+consulta agrupada (empresa, sector, ciudad, región, modalidad de sus
+reseñas): para cada valor de cada faceta, un mapa de bits con las empresas
+que lo tienen (un entero de Python, un bit por empresa). Los conteos bajo
+los filtros actuales son intersecciones de bits y conteos de unos, sin
+consultas. Cada faceta se cuenta con los filtros de las demás, así el menú
+muestra cuántas empresas quedarían al cambiar esa opción.
+
+El índice se reconstruye cuando cambia la generación CATALOG (empresas) o
+PLATFORM (reseñas). Los conteos de cada combinación de filtros se guardan
+además en la caché de analítica (core/services/analytics_cache.py), para
+que todos los procesos los compartan.
+"""
+
+import hashlib
+import threading
+
+from django.db.models import Exists, OuterRef
+
+from companies.models import Company
+from reviews.models import Review
+from core.services.analytics_cache import get_platform_analytics
+from core.services.cache_generations import CATALOG, PLATFORM, get_generations
+from core.services.company_search import filter_by_search
+
+# Faceta -> campo de Company. La modalidad sale de las reseñas.
+FIELDS = {
+    'sector': 'sector',
+    'city': 'location',
+    'region': 'region',
+}
+
+FACETS = ('sector', 'city', 'region', 'modality')
+
+_lock = threading.Lock()
+_index = None
+
+
+def parse_facet_params(params):
+    """Filtros del dashboard desde GET: search y un valor por faceta ('' si no hay)"""
+    filters = {'search': params.get('search', '').strip()}
+    for facet in FACETS:
+        filters[facet] = params.get(facet, '').strip()
+    return filters
+
+
+def filter_companies(companies, filters):
+    """
+    Aplica los filtros de faceta a un queryset de empresas. Ciudad, sector y
+    región aceptan coincidencias parciales; la modalidad se filtra con
+    EXISTS sobre las reseñas, sin JOIN ni distinct().
+    """
+    for facet, field in FIELDS.items():
+        if filters[facet]:
+            companies = companies.filter(**{f'{field}__icontains': filters[facet]})
+    if filters['modality']:
+        companies = companies.filter(Exists(
+            Review.objects.filter(company=OuterRef('pk'), modality=filters['modality'])
+        ))
+    return companies
+
+
+# ===== ÍNDICE =====
+
+def _bitmap(positions, size):
+    """Entero con los bits de 'positions' encendidos, armado de una vez"""
+    data = bytearray((size + 7) // 8)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, 'little')
+
+
+class FacetIndex:
+    """Mapas de bits de las empresas activas por valor de cada faceta"""
+
+    def __init__(self, rows, generation=None):
+        self.generation = generation
+        self.positions = {}
+        members = {facet: {} for facet in FACETS}
+        for company_id, sector, location, region, modality in rows:
+            position = self.positions.setdefault(company_id, len(self.positions))
+            for facet, value in (('sector', sector), ('city', location), ('region', region), ('modality', modality)):
+                if value:
+                    members[facet].setdefault(value, []).append(position)
+        size = len(self.positions)
+        self.bitmaps = {
+            facet: {value: _bitmap(positions, size) for value, positions in values.items()}
+            for facet, values in members.items()
+        }
+        self.all = (1 << size) - 1
+
+    def __len__(self):
+        return len(self.positions)
+
+    def bitmap_for_ids(self, company_ids):
+        positions = [self.positions[company_id] for company_id in company_ids if company_id in self.positions]
+        return _bitmap(positions, len(self.positions))
+
+    def matching(self, facet, needle):
+        """Empresas cuyo valor de la faceta coincide con needle (como filter_companies)"""
+        if facet == 'modality':
+            return self.bitmaps[facet].get(needle, 0)
+        needle = needle.lower()
+        bitmap = 0
+        for value, value_bitmap in self.bitmaps[facet].items():
+            if needle in value.lower():
+                bitmap |= value_bitmap
+        return bitmap
+
+    def counts(self, filters, restrict=None):
+        """
+        {faceta: [(valor, empresas)]} bajo los filtros de las demás facetas,
+        ordenado por valor. restrict: mapa de bits que limita las empresas
+        (resultado de la búsqueda por nombre).
+        """
+        base = self.all if restrict is None else restrict
+        selected = {facet: self.matching(facet, filters[facet]) for facet in FACETS if filters[facet]}
+        result = {}
+        for facet in FACETS:
+            mask = base
+            for other, bitmap in selected.items():
+                if other != facet:
+                    mask &= bitmap
+            values = []
+            for value, bitmap in self.bitmaps[facet].items():
+                count = (bitmap & mask).bit_count()
+                if count or value == filters[facet]:
+                    values.append((value, count))
+            values.sort(key=lambda item: item[0].lower())
+            result[facet] = values
+        return result
+
+
+def _load():
+    """Una fila por empresa activa y modalidad de sus reseñas (una consulta)"""
+    return (
+        Company.objects.filter(is_active=True)
+        .values_list('id', 'sector', 'location', 'region', 'reviews__modality')
+        .distinct().order_by('id')
+        .iterator(chunk_size=2000)
+    )
+
+
+def get_index():
+    """Índice del proceso, reconstruido si cambiaron las empresas o las reseñas"""
+    global _index
+    generations = get_generations([CATALOG, PLATFORM])
+    generation = (generations[CATALOG], generations[PLATFORM])
+    index = _index
+    if index is not None and index.generation == generation:
+        return index
+    with _lock:
+        if _index is None or _index.generation != generation:
+            _index = FacetIndex(_load(), generation)
+        return _index
+
+
+# ===== CONSULTAS =====
+
+def facet_counts(filters):
+    """Conteos de cada faceta para los filtros dados (ver FacetIndex.counts)"""
+    def build():
+        index = get_index()
+        restrict = None
+        if filters['search']:
+            companies, _ = filter_by_search(Company.objects.filter(is_active=True), filters['search'])
+            restrict = index.bitmap_for_ids(companies.values_list('id', flat=True))
+        return index.counts(filters, restrict)
+
+    # La búsqueda es texto libre: la combinación va resumida en la clave
+    combination = '\x1f'.join(filters[name] for name in ('search',) + FACETS)
+    digest = hashlib.sha1(combination.encode('utf-8')).hexdigest()
+    catalog = get_generations([CATALOG])[CATALOG]
+    return get_platform_analytics(('facets', catalog, digest), build)
@@ -0,0 +1,525 @@
+# core/services/excel_report.py
+"""
+Reporte de reseñas de una empresa en Excel (.xlsx).
+
+Se escribe con el modo write-only de openpyxl: las filas se envían al
+archivo a medida que se generan y nunca se arma la hoja completa en
+memoria. Los estilos son NamedStyle compartidos por todas las celdas, las
+reseñas se leen con values_list().iterator() y las etiquetas de las choices
+se resuelven con diccionarios calculados una sola vez, sin instanciar
+modelos ni seguir relaciones por fila.
+
+Los datos de los gráficos van en una hoja aparte ('Datos de Gráficos')
+porque en modo write-only no se puede volver a escribir en filas ya
+enviadas.
+"""
+
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from reviews.models import Review
+
+# Intentar importar openpyxl
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.chart import BarChart, LineChart, PieChart, Reference, Series
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+    from openpyxl.utils import get_column_letter
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+MONTHS_ES = {
+    1: 'enero', 2: 'febrero', 3: 'marzo', 4: 'abril',
+    5: 'mayo', 6: 'junio', 7: 'julio', 8: 'agosto',
+    9: 'septiembre', 10: 'octubre', 11: 'noviembre', 12: 'diciembre'
+}
+
+MONTHS_ES_SHORT = {
+    1: 'Ene', 2: 'Feb', 3: 'Mar', 4: 'Abr',
+    5: 'May', 6: 'Jun', 7: 'Jul', 8: 'Ago',
+    9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dic'
+}
+
+QUARTERS = {
+    1: ([1, 2, 3], 'Ene-Mar'),
+    2: ([4, 5, 6], 'Abr-Jun'),
+    3: ([7, 8, 9], 'Jul-Sep'),
+    4: ([10, 11, 12], 'Oct-Dic'),
+}
+
+# Columnas disponibles para las reseñas aprobadas: clave -> (encabezado, ancho)
+COLUMNS = {
+    'fecha': ('Fecha', 18),
+    'usuario': ('Usuario', 20),
+    'cargo': ('Cargo', 25),
+    'modalidad': ('Modalidad', 15),
+    'calificacion': ('Calificación', 15),
+    'comunicacion': ('Comunicación', 15),
+    'dificultad': ('Dificultad', 15),
+    'tiempo_respuesta': ('Tiempo Respuesta', 18),
+    'pros': ('Pros', 40),
+    'contras': ('Contras', 40),
+    'preguntas': ('Preguntas Entrevista', 40),
+}
+
+DEFAULT_COLUMNS = list(COLUMNS)
+
+WRAP_COLUMNS = {'pros', 'contras', 'preguntas'}
+
+USER_FIELDS = ['user_profile__user__first_name', 'user_profile__user__last_name', 'user_profile__user__username']
+
+# Campos de la base de datos que necesita cada columna
+COLUMN_FIELDS = {
+    'fecha': ['submission_date'],
+    'usuario': USER_FIELDS,
+    'cargo': ['job_title'],
+    'modalidad': ['modality'],
+    'calificacion': ['overall_rating'],
+    'comunicacion': ['communication_rating'],
+    'dificultad': ['difficulty_rating'],
+    'tiempo_respuesta': ['response_time_rating'],
+    'pros': ['pros'],
+    'contras': ['cons'],
+    'preguntas': ['interview_questions'],
+}
+
+REJECTED_HEADERS = ['Fecha', 'Usuario', 'Cargo', 'Razón de Rechazo', 'Categoría', 'Nivel de Confianza', 'Pros', 'Contras']
+
+REJECTED_FIELDS = [
+    'submission_date', *USER_FIELDS, 'job_title', 'verification_reason',
+    'verification_category', 'verification_confidence', 'pros', 'cons',
+]
+
+# Filas reservadas para los gráficos entre las tablas y las reseñas
+CHARTS_HEIGHT = 45
+
+
+def _choice_labels(field_name):
+    """Mapa valor -> etiqueta de las choices de un campo de Review"""
+    return dict(Review._meta.get_field(field_name).flatchoices)
+
+
+# ===== PARÁMETROS DEL REPORTE =====
+
+def parse_report_params(params):
+    """
+    Normaliza los parámetros GET del reporte (QueryDict).
+    Un período o calificación inválidos se ignoran (se exporta todo).
+    """
+    period = params.get('period', 'all') or 'all'
+    period_label = 'Todas las reseñas'
+    year = None
+    months = None
+
+    if period != 'all':
+        try:
+            if period.startswith('Q') and '-' in period:
+                # Trimestre (formato: Q1-2025)
+                quarter_str, year_str = period.split('-')
+                quarter = int(quarter_str[1:])
+                year = int(year_str)
+                months, months_label = QUARTERS[quarter]
+                period_label = f'Q{quarter} {year} ({months_label})'
+            else:
+                # Mes individual (formato: 2025-07)
+                year_str, month_str = period.split('-')
+                year = int(year_str)
+                month = int(month_str)
+                if month not in MONTHS_ES:
+                    raise ValueError("Mes inválido")
+                months = [month]
+                period_label = f'{MONTHS_ES[month].capitalize()} {year}'
+        except (ValueError, KeyError):
+            period, period_label, year, months = 'all', 'Todas las reseñas', None, None
+
+    rating = None
+    try:
+        rating = int(params.get('rating') or '')
+    except ValueError:
+        pass
+    if rating is not None and not 1 <= rating <= 5:
+        rating = None
+    if rating is not None:
+        period_label += f' - Calificación {rating} estrellas'
+
+    columns = [column for column in params.getlist('columns') if column in COLUMNS]
+
+    return {
+        'period': period,
+        'period_label': period_label,
+        'year': year,
+        'months': months,
+        'rating': rating,
+        'columns': columns or DEFAULT_COLUMNS,
+    }
+
+
+def report_queryset(company, params):
+    """Reseñas de la empresa filtradas por período y calificación"""
+    reviews = Review.objects.filter(company=company)
+    if params['months']:
+        reviews = reviews.filter(submission_date__year=params['year'], submission_date__month__in=params['months'])
+    if params['rating']:
+        reviews = reviews.filter(overall_rating=params['rating'])
+    return reviews
+
+
+def report_filename(company, params):
+    period = params['period'] if params['period'] != 'all' else 'general'
+    return f"reporte_{company.name.replace(' ', '_')}_{period}_{timezone.now().strftime('%Y%m%d')}.xlsx"
+
+
+# ===== ESTILOS =====
+
+def _register_styles(workbook):
+    """Registra los estilos compartidos del reporte en el libro"""
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    center = Alignment(horizontal='center', vertical='center')
+
+    def section(name, color):
+        return NamedStyle(
+            name=name,
+            font=Font(bold=True, color="FFFFFF", size=12),
+            fill=PatternFill(start_color=color, end_color=color, fill_type="solid"),
+            alignment=center,
+        )
+
+    styles = [
+        NamedStyle(
+            name='report_title',
+            font=Font(bold=True, size=16, color="1E3A8A"),
+            fill=PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid"),
+            alignment=center,
+        ),
+        NamedStyle(name='report_label', font=Font(bold=True, size=12)),
+        section('report_section', "1E3A8A"),
+        section('report_section_approved', "10B981"),
+        section('report_section_rejected', "EF4444"),
+        NamedStyle(
+            name='report_header',
+            font=Font(bold=True, color="FFFFFF", size=12),
+            fill=PatternFill(start_color="1E3A8A", end_color="1E3A8A", fill_type="solid"),
+            alignment=center,
+            border=border,
+        ),
+        NamedStyle(name='report_cell', border=border),
+        NamedStyle(name='report_cell_bold', font=Font(bold=True), border=border),
+        NamedStyle(name='report_cell_wrap', border=border, alignment=Alignment(wrap_text=True, vertical='top')),
+    ]
+    for style in styles:
+        workbook.add_named_style(style)
+
+
+# ===== ESCRITURA SECUENCIAL =====
+
+class _SheetWriter:
+    """Agrega filas a una hoja write-only llevando la cuenta de la fila actual"""
+
+    def __init__(self, worksheet):
+        self.ws = worksheet
+        self.row = 1
+
+    def cell(self, value, style=None):
+        cell = WriteOnlyCell(self.ws, value=value)
+        if isinstance(value, str) and value.startswith('='):
+            # Texto de los usuarios: nunca interpretarlo como fórmula
+            cell.data_type = 's'
+        if style:
+            cell.style = style
+        return cell
+
+    def append(self, values, style=None):
+        self.ws.append([self.cell(value, style) if value is not None else None for value in values])
+        self.row += 1
+
+    def append_cells(self, cells):
+        self.ws.append(cells)
+        self.row += 1
+
+    def blank(self, count=1):
+        for _ in range(count):
+            self.ws.append([])
+        self.row += count
+
+    def section(self, title, last_column, style='report_section'):
+        """Fila de título combinada desde A hasta last_column"""
+        self.ws.merged_cells.add(f'A{self.row}:{get_column_letter(last_column)}{self.row}')
+        self.append([title], style)
+
+    def table(self, headers, rows):
+        """
+        Escribe una tabla simple y retorna (primera fila, última fila) de los
+        datos, para usarla como referencia en un gráfico.
+        """
+        self.append(headers)
+        first = self.row
+        for values in rows:
+            self.append(values)
+        return first, self.row - 1
+
+
+def _clean_text(value):
+    return value.replace('\n', ' ').replace('\r', ' ') if value else 'N/A'
+
+
+def _full_name(first_name, last_name, username):
+    return f'{first_name} {last_name}'.strip() or username
+
+
+def _confidence_label(confidence):
+    if not confidence:
+        return 'N/A'
+    level = "Alta" if confidence >= 0.8 else "Media" if confidence >= 0.6 else "Baja"
+    return f'{confidence:.2f} ({level})'
+
+
+# ===== REPORTE =====
+
+# Cada cuántas filas se informa el progreso
+PROGRESS_EVERY = 500
+
+
+def write_company_report(company, params, generated_by, output, progress=None):
+    """
+    Escribe el reporte de la empresa en output (ruta o archivo binario).
+
+    params: resultado de parse_report_params().
+    generated_by: nombre de quien genera el reporte.
+    progress: función opcional progress(filas_escritas, total_filas).
+    """
+    reviews = report_queryset(company, params)
+    approved_reviews = reviews.filter(status='approved').order_by()
+
+    modality_labels = _choice_labels('modality')
+    communication_labels = _choice_labels('communication_rating')
+    difficulty_labels = _choice_labels('difficulty_rating')
+    response_time_labels = _choice_labels('response_time_rating')
+    category_labels = _choice_labels('verification_category')
+
+    # ----- Estadísticas (una consulta) -----
+    totals = reviews.aggregate(
+        approved=Count('id', filter=Q(status='approved')),
+        rejected=Count('id', filter=Q(status='rejected')),
+        avg_rating=Avg('overall_rating', filter=Q(status='approved')),
+    )
+    approved_count = totals['approved']
+    rejected_count = totals['rejected']
+    total_with_status = approved_count + rejected_count
+    avg_rating = totals['avg_rating'] or 0
+    approval_rate = (approved_count / total_with_status * 100) if total_with_status > 0 else 0
+    rejection_rate = (rejected_count / total_with_status * 100) if total_with_status > 0 else 0
+
+    modality_dist = list(approved_reviews.values('modality').annotate(count=Count('id')).order_by('-count', 'modality'))
+    rating_dist = list(approved_reviews.values('overall_rating').annotate(count=Count('id')).order_by('overall_rating'))
+    response_time_dist = list(
+        approved_reviews.values('response_time_rating').annotate(count=Count('id')).order_by('response_time_rating')
+    )
+    monthly_trend = [
+        item for item in approved_reviews.annotate(
+            month=TruncMonth('submission_date')
+        ).values('month').annotate(
+            count=Count('id'),
+            avg_rating=Avg('overall_rating')
+        ).order_by('month')
+        if item['month']
+    ]
+
+    workbook = Workbook(write_only=True)
+    _register_styles(workbook)
+    sheet = _SheetWriter(workbook.create_sheet("Reporte de Reseñas"))
+    data = _SheetWriter(workbook.create_sheet("Datos de Gráficos"))
+
+    selected_columns = params['columns']
+    for index, column in enumerate(selected_columns, 1):
+        sheet.ws.column_dimensions[get_column_letter(index)].width = COLUMNS[column][1]
+
+    # ===== ENCABEZADO PRINCIPAL =====
+    header_columns = max(len(selected_columns), 8)
+    sheet.section(f'REPORTE DE RESEÑAS - {company.name.upper()}', header_columns, 'report_title')
+    sheet.ws.merged_cells.add(f'A{sheet.row}:{get_column_letter(header_columns)}{sheet.row}')
+    sheet.blank()
+    for label, value in [
+        ('Período:', params['period_label']),
+        ('Fecha de generación:', timezone.now().strftime('%d/%m/%Y %H:%M:%S')),
+        ('Generado por:', generated_by),
+    ]:
+        sheet.append_cells([sheet.cell(label, 'report_label'), sheet.cell(value)])
+    sheet.blank()
+
+    # ===== ESTADÍSTICAS GENERALES =====
+    sheet.section('ESTADÍSTICAS GENERALES', 2)
+    for label, value in [
+        ('Métrica', 'Valor'),
+        ('Total de reseñas', total_with_status),
+        ('Reseñas aprobadas', approved_count),
+        ('Reseñas rechazadas', rejected_count),
+        ('Calificación promedio (aprobadas)', f'{avg_rating:.2f}/5.0'),
+        ('Tasa de aprobación', f'{approval_rate:.1f}%'),
+        ('Tasa de rechazo', f'{rejection_rate:.1f}%'),
+    ]:
+        sheet.append_cells([sheet.cell(label, 'report_cell_bold'), sheet.cell(value, 'report_cell')])
+    sheet.blank()
+
+    # ===== DISTRIBUCIONES =====
+    def distribution(title, header, items):
+        if not items:
+            return
+        sheet.section(title, 3)
+        sheet.append([header, 'Cantidad', 'Porcentaje'], 'report_header')
+        for item in items:
+            percentage = (item['count'] / approved_count * 100) if approved_count > 0 else 0
+            sheet.append([item['label'], item['count'], f'{percentage:.1f}%'], 'report_cell')
+        sheet.blank()
+
+    distribution('DISTRIBUCIÓN POR MODALIDAD DE TRABAJO', 'Modalidad', [
+        {'label': modality_labels.get(item['modality'], item['modality']), 'count': item['count']}
+        for item in modality_dist
+    ])
+    distribution('DISTRIBUCIÓN POR CALIFICACIÓN', 'Calificación', [
+        {'label': f"{item['overall_rating']} estrellas", 'count': item['count']}
+        for item in rating_dist
+    ])
+
+    # ===== GRÁFICOS =====
+    charts_start = sheet.row
+    charts_row = charts_start + 2
+    data_ws = data.ws
+
+    if rating_dist:
+        first, last = data.table(['Calificación', 'Cantidad'], [
+            [f"{item['overall_rating']}⭐", item['count']] for item in rating_dist
+        ])
+        data.blank()
+        chart = BarChart()
+        chart.type = "col"
+        chart.style = 10
+        chart.title = "Distribución de Calificaciones"
+        chart.y_axis.title = 'Cantidad'
+        chart.x_axis.title = 'Calificación'
+        chart.height = 10
+        chart.width = 15
+        chart.add_data(Reference(data_ws, min_col=2, min_row=first, max_row=last), titles_from_data=False)
+        chart.set_categories(Reference(data_ws, min_col=1, min_row=first, max_row=last))
+        sheet.ws.add_chart(chart, f"A{charts_row}")
+
+    if modality_dist:
+        first, last = data.table(['Modalidad', 'Cantidad'], [
+            [modality_labels.get(item['modality'], item['modality']), item['count']] for item in modality_dist
+        ])
+        data.blank()
+        chart = PieChart()
+        chart.title = "Distribución por Modalidad"
+        chart.height = 10
+        chart.width = 15
+        chart.add_data(Reference(data_ws, min_col=2, min_row=first, max_row=last), titles_from_data=False)
+        chart.set_categories(Reference(data_ws, min_col=1, min_row=first, max_row=last))
+        sheet.ws.add_chart(chart, f"J{charts_row}")
+
+    if response_time_dist:
+        first, last = data.table(['Tiempo de Respuesta', 'Cantidad'], [
+            [response_time_labels.get(item['response_time_rating'], item['response_time_rating']), item['count']]
+            for item in response_time_dist
+        ])
+        data.blank()
+        chart = BarChart()
+        chart.type = "bar"
+        chart.style = 10
+        chart.title = "Distribución de Tiempo de Respuesta"
+        chart.y_axis.title = 'Tiempo de Respuesta'
+        chart.x_axis.title = 'Cantidad'
+        chart.height = 10
+        chart.width = 15
+        chart.add_data(Reference(data_ws, min_col=2, min_row=first, max_row=last), titles_from_data=False)
+        chart.set_categories(Reference(data_ws, min_col=1, min_row=first, max_row=last))
+        sheet.ws.add_chart(chart, f"A{charts_row + 20}")
+
+    if len(monthly_trend) >= 2:
+        first, last = data.table(['Mes', 'Cantidad', 'Calificación'], [
+            [
+                f"{MONTHS_ES_SHORT[item['month'].month]} {item['month'].year}",
+                item['count'],
+                round(item['avg_rating'], 2) if item['avg_rating'] else 0,
+            ]
+            for item in monthly_trend
+        ])
+        chart = LineChart()
+        chart.title = "Evolución Mensual"
+        chart.style = 13
+        chart.y_axis.title = 'Valor'
+        chart.x_axis.title = 'Mes'
+        chart.height = 10
+        chart.width = 20
+        chart.legend.position = 'b'
+        chart.series.append(Series(Reference(data_ws, min_col=2, min_row=first, max_row=last), title="Cantidad de Reseñas"))
+        chart.series.append(Series(Reference(data_ws, min_col=3, min_row=first, max_row=last), title="Calificación Promedio"))
+        # Las categorías se asignan a las series existentes
+        chart.set_categories(Reference(data_ws, min_col=1, min_row=first, max_row=last))
+        sheet.ws.add_chart(chart, f"J{charts_row + 20}")
+
+    # Las reseñas empiezan después del espacio reservado para los gráficos
+    sheet.blank(charts_start + CHARTS_HEIGHT - sheet.row)
+
+    # ===== RESEÑAS APROBADAS =====
+    sheet.section('RESEÑAS APROBADAS', len(selected_columns), 'report_section_approved')
+    sheet.append([COLUMNS[column][0] for column in selected_columns], 'report_header')
+
+    fields = []
+    for column in selected_columns:
+        fields.extend(field for field in COLUMN_FIELDS[column] if field not in fields)
+    position = {field: index for index, field in enumerate(fields)}
+
+    formatters = {
+        'fecha': lambda v: v[position['submission_date']].strftime('%d/%m/%Y %H:%M'),
+        'usuario': lambda v: _full_name(*(v[position[field]] for field in USER_FIELDS)),
+        'cargo': lambda v: v[position['job_title']],
+        'modalidad': lambda v: modality_labels.get(v[position['modality']], v[position['modality']]),
+        'calificacion': lambda v: f"{v[position['overall_rating']]}/5",
+        'comunicacion': lambda v: communication_labels.get(v[position['communication_rating']], v[position['communication_rating']]),
+        'dificultad': lambda v: difficulty_labels.get(v[position['difficulty_rating']], v[position['difficulty_rating']]),
+        'tiempo_respuesta': lambda v: response_time_labels.get(v[position['response_time_rating']], v[position['response_time_rating']]),
+        'pros': lambda v: _clean_text(v[position['pros']]),
+        'contras': lambda v: _clean_text(v[position['cons']]),
+        'preguntas': lambda v: _clean_text(v[position['interview_questions']]),
+    }
+    row_format = [
+        (formatters[column], 'report_cell_wrap' if column in WRAP_COLUMNS else 'report_cell')
+        for column in selected_columns
+    ]
+
+    rows = approved_reviews.order_by('-submission_date').values_list(*fields)
+    written = 0
+    for values in rows.iterator(chunk_size=2000):
+        sheet.append_cells([sheet.cell(formatter(values), style) for formatter, style in row_format])
+        written += 1
+        if progress and written % PROGRESS_EVERY == 0:
+            progress(written, total_with_status)
+    sheet.blank()
+
+    # ===== RESEÑAS RECHAZADAS =====
+    if rejected_count:
+        sheet.section('RESEÑAS RECHAZADAS', len(REJECTED_HEADERS), 'report_section_rejected')
+        sheet.append(REJECTED_HEADERS, 'report_header')
+        rows = reviews.filter(status='rejected').order_by('-submission_date').values_list(*REJECTED_FIELDS)
+        for (submitted, first_name, last_name, username, job_title, reason,
+             category, confidence, pros, cons) in rows.iterator(chunk_size=2000):
+            sheet.append_cells([
+                sheet.cell(submitted.strftime('%d/%m/%Y %H:%M'), 'report_cell'),
+                sheet.cell(_full_name(first_name, last_name, username), 'report_cell'),
+                sheet.cell(job_title, 'report_cell'),
+                sheet.cell((reason or 'No especificada').replace('\n', ' ').replace('\r', ' '), 'report_cell'),
+                sheet.cell(category_labels.get(category, category), 'report_cell'),
+                sheet.cell(_confidence_label(confidence), 'report_cell'),
+                sheet.cell(_clean_text(pros), 'report_cell_wrap'),
+                sheet.cell(_clean_text(cons), 'report_cell_wrap'),
+            ])
+            written += 1
+            if progress and written % PROGRESS_EVERY == 0:
+                progress(written, total_with_status)
+
+    workbook.save(output)
@@ -0,0 +1,251 @@
+# core/services/export_jobs.py
+"""
+Generación de reportes en segundo plano.
+
+Un pedido de exportación crea un ExportJob identificado por formato, hash
+de los parámetros normalizados y generación de caché de la empresa
+(core/services/cache_generations.py). Si ya existe un trabajo con la misma
+clave, en cola, en curso o terminado, se reutiliza: el archivo generado
+sirve hasta que cambien las reseñas de la empresa.
+
+Los trabajos los ejecuta el comando run_export_jobs (cron o --loop). Con
+EXPORT_JOBS_RUN_IN_THREAD activo, además se lanza un hilo por trabajo al
+crearlo, útil en desarrollo o con un solo servidor.
+
+Configuración opcional en settings.py:
+- EXPORT_JOBS_RUN_IN_THREAD: ejecutar cada trabajo en un hilo
+- EXPORT_JOB_TIMEOUT: segundos tras los cuales un trabajo en curso se da por fallido
+- EXPORT_JOBS_RETENTION_DAYS: días que se conservan los archivos generados
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from companies.models import ExportJob
+from core.services import bulk_export, csv_export, excel_report
+from core.services.cache_generations import PLATFORM, company_namespace, get_generation
+
+logger = logging.getLogger(__name__)
+
+REUSABLE_STATUSES = ['pending', 'running', 'done']
+
+# Formato de las exportaciones masivas (sin empresa)
+BULK_FORMAT = 'zip'
+
+
+# ===== FORMATOS =====
+
+def _render_xlsx(job, output, progress):
+    generated_by = ''
+    if job.requested_by:
+        generated_by = job.requested_by.get_full_name() or job.requested_by.username
+    excel_report.write_company_report(job.company, job.params, generated_by, output, progress=progress)
+
+
+def _render_csv(job, output, progress):
+    csv_export.write_company_csv(job.company, output, progress=progress)
+
+
+def _render_zip(job, output, progress):
+    bulk_export.write_bulk_export(job.params, output, workers=bulk_export.default_workers(), progress=progress)
+
+
+# formato -> funciones para normalizar parámetros, generar el archivo y nombrarlo
+FORMATS = {
+    'xlsx': {
+        'parse': excel_report.parse_report_params,
+        'render': _render_xlsx,
+        'filename': excel_report.report_filename,
+        'content_type': excel_report.XLSX_CONTENT_TYPE,
+    },
+    'csv': {
+        'parse': csv_export.parse_csv_params,
+        'render': _render_csv,
+        'filename': csv_export.csv_filename,
+        'content_type': csv_export.CSV_CONTENT_TYPE,
+    },
+    # Exportación masiva del staff (sin empresa)
+    'zip': {
+        'parse': bulk_export.parse_bulk_params,
+        'render': _render_zip,
+        'filename': bulk_export.bulk_filename,
+        'content_type': 'application/zip',
+    },
+}
+
+
+def _timeout():
+    return getattr(settings, 'EXPORT_JOB_TIMEOUT', 30 * 60)
+
+
+def params_hash(params):
+    """Hash estable de los parámetros normalizados"""
+    encoded = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+# ===== SOLICITUD =====
+
+def request_export(company, format, query, user):
+    """
+    Crea (o reutiliza) el trabajo de exportación para los parámetros dados.
+
+    company: None en las exportaciones masivas.
+    query: QueryDict con los parámetros del formulario.
+    Retorna (job, created).
+    """
+    params = FORMATS[format]['parse'](query)
+    namespace = company_namespace(company.id) if company is not None else PLATFORM
+    key = {
+        'company': company,
+        'format': format,
+        'params_hash': params_hash(params),
+        'generation': get_generation(namespace),
+    }
+
+    existing = ExportJob.objects.filter(status__in=REUSABLE_STATUSES, **key).order_by('-created_at').first()
+    if existing is not None and (existing.status != 'done' or _file_exists(existing)):
+        return existing, False
+
+    job = ExportJob.objects.create(requested_by=user, params=params, **key)
+    if getattr(settings, 'EXPORT_JOBS_RUN_IN_THREAD', False):
+        transaction.on_commit(lambda: run_job_in_thread(job.pk))
+    return job, True
+
+
+def _file_exists(job):
+    try:
+        return bool(job.file) and job.file.storage.exists(job.file.name)
+    except Exception:
+        return False
+
+
+# ===== EJECUCIÓN =====
+
+def _set_progress(job_id, done, total):
+    if total:
+        ExportJob.objects.filter(pk=job_id, status='running').update(
+            progress=min(99, int(done * 100 / total))
+        )
+
+
+def run_job(job_id):
+    """
+    Ejecuta un trabajo en cola. Si otro worker ya lo tomó retorna None.
+    """
+    claimed = ExportJob.objects.filter(pk=job_id, status='pending').update(
+        status='running', started_at=timezone.now(), progress=0
+    )
+    if not claimed:
+        return None
+
+    job = ExportJob.objects.select_related('company', 'requested_by').get(pk=job_id)
+    handler = FORMATS.get(job.format)
+    try:
+        if handler is None:
+            raise ValueError(f"Formato no soportado: {job.format}")
+        with tempfile.TemporaryFile() as output:
+            handler['render'](job, output, lambda done, total: _set_progress(job.pk, done, total))
+            output.seek(0)
+            job.filename = handler['filename'](job.company, job.params)
+            job.file.save(job.filename, File(output), save=False)
+        job.status = 'done'
+        job.progress = 100
+    except Exception as e:
+        logger.exception(f"Error generando la exportación {job.pk}")
+        job.status = 'failed'
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'progress', 'error', 'file', 'filename', 'finished_at'])
+    return job
+
+
+def run_job_in_thread(job_id):
+    """Ejecuta el trabajo en un hilo aparte (sin bloquear la petición)"""
+    def target():
+        try:
+            run_job(job_id)
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=target, name=f'export-job-{job_id}', daemon=True).start()
+
+
+def fail_stale_jobs():
+    """Marca como fallidos los trabajos en curso que superaron EXPORT_JOB_TIMEOUT"""
+    cutoff = timezone.now() - timedelta(seconds=_timeout())
+    return ExportJob.objects.filter(status='running', started_at__lt=cutoff).update(
+        status='failed', error='Tiempo de generación agotado', finished_at=timezone.now()
+    )
+
+
+def process_pending_jobs(limit=None):
+    """Ejecuta los trabajos en cola en orden de llegada. Retorna cuántos se ejecutaron."""
+    fail_stale_jobs()
+    pending = ExportJob.objects.filter(status='pending').order_by('created_at').values_list('pk', flat=True)
+    if limit:
+        pending = pending[:limit]
+
+    processed = 0
+    for job_id in list(pending):
+        if run_job(job_id) is not None:
+            processed += 1
+    return processed
+
+
+def purge_old_exports(days=None):
+    """Elimina los trabajos terminados hace más de 'days' días junto con sus archivos"""
+    if days is None:
+        days = getattr(settings, 'EXPORT_JOBS_RETENTION_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    old_jobs = ExportJob.objects.filter(status__in=['done', 'failed'], finished_at__lt=cutoff)
+
+    deleted = 0
+    for job in old_jobs.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        deleted += 1
+    return deleted
+
+
+# ===== CONSULTA =====
+
+def can_access_job(user, job):
+    """
+    Staff, quien lo pidió o el representante de la empresa del reporte.
+    Las exportaciones masivas son solo para el staff.
+    """
+    profile = getattr(user, 'profile', None)
+    if user.is_staff or (profile and profile.role == 'staff'):
+        return True
+    if job.company_id is None:
+        return False
+    if job.requested_by_id == user.id:
+        return True
+    return bool(profile and profile.role == 'company_rep' and profile.company_id == job.company_id)
+
+
+def job_payload(job):
+    """Estado del trabajo para las respuestas JSON"""
+    return {
+        'id': job.pk,
+        'format': job.format,
+        'status': job.status,
+        'status_label': job.get_status_display(),
+        'progress': job.progress,
+        'error': job.error,
+        'status_url': reverse('export_job_status', args=[job.pk]),
+        'download_url': reverse('download_export_job', args=[job.pk]) if job.status == 'done' else None,
+    }
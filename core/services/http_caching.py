@@ -0,0 +1,136 @@
+# core/services/http_caching.py
+"""
+Peticiones condicionales (ETag / Last-Modified) y políticas de
+Cache-Control para las vistas de lectura.
+
+Los validadores se calculan antes de ejecutar la vista con las
+generaciones de caché (core/services/cache_generations.py), que cambian
+cada vez que cambia una reseña o una empresa. Si el cliente ya tiene la
+versión vigente se responde 304 sin ejecutar el cuerpo de la vista.
+
+Las páginas que dependen del usuario incluyen en el ETag al usuario, su
+generación y el secreto CSRF (la página lleva formularios con el token),
+y usan Cache-Control: private, no-cache para que el navegador siempre
+revalide. Si hay mensajes flash pendientes no se responde 304: la página
+debe mostrarlos.
+
+Configuración opcional en settings.py:
+- HTTP_ETAG_VERSION: cambiarlo en cada despliegue invalida los ETag (plantillas nuevas)
+- HTTP_PUBLIC_MAX_AGE: max-age de los datos públicos (endpoints para IA)
+- HTTP_SEO_MAX_AGE: max-age de sitemap.xml y robots.txt
+- HTTP_AUTOCOMPLETE_MAX_AGE: max-age de las sugerencias de empresas
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from core.services.cache_generations import CATALOG, PLATFORM, company_namespace, get_generations, user_namespace
+
+
+def make_etag(*parts):
+    """ETag fuerte a partir de las partes que determinan la respuesta"""
+    raw = '|'.join(str(part) for part in (getattr(settings, 'HTTP_ETAG_VERSION', ''),) + parts)
+    return '"%s"' % hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+# ===== POLÍTICAS DE CACHE-CONTROL =====
+
+def public_policy():
+    """Datos públicos que cambian con las reseñas"""
+    return {'public': True, 'max_age': getattr(settings, 'HTTP_PUBLIC_MAX_AGE', 5 * 60)}
+
+
+def seo_policy():
+    """Archivos para buscadores"""
+    return {'public': True, 'max_age': getattr(settings, 'HTTP_SEO_MAX_AGE', 60 * 60)}
+
+
+def autocomplete_policy():
+    """Sugerencias mientras se escribe: el navegador las reutiliza un momento sin revalidar"""
+    return {'private': True, 'max_age': getattr(settings, 'HTTP_AUTOCOMPLETE_MAX_AGE', 60)}
+
+
+def private_policy():
+    """Páginas y descargas por usuario: el navegador guarda y siempre revalida"""
+    return {'private': True, 'no_cache': True}
+
+
+def conditional(etag_func=None, last_modified_func=None, policy=None):
+    """
+    condition() de Django más la política de Cache-Control, que se aplica
+    también a las respuestas 304.
+    """
+    def decorator(view):
+        conditioned = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditioned(request, *args, **kwargs)
+            if policy is not None and response.status_code in (200, 304):
+                patch_cache_control(response, **policy())
+            return response
+        return wrapper
+    return decorator
+
+
+# ===== VALIDADORES =====
+
+def _user_parts(request):
+    """Partes del ETag que identifican al usuario y su estado"""
+    user = request.user
+    if not user.is_authenticated:
+        return ['anon']
+    profile = getattr(user, 'profile', None)
+    return [
+        user.pk,
+        user.is_staff,
+        profile.role if profile else '',
+        get_generations([user_namespace(profile.pk)])[user_namespace(profile.pk)] if profile else '',
+        # Secreto CSRF: la página incluye formularios con el token
+        hashlib.md5(request.META.get('CSRF_COOKIE', '').encode('utf-8')).hexdigest(),
+    ]
+
+
+def company_page_etag(request, company_id):
+    """Detalle de empresa: empresa, filtros de la URL y usuario"""
+    if len(get_messages(request)):
+        return None
+    generation = get_generations([company_namespace(company_id)])[company_namespace(company_id)]
+    return make_etag('company', company_id, generation, request.get_full_path(), *_user_parts(request))
+
+
+def company_export_etag(request, company_id):
+    """
+    Exportación de una empresa: empresa, parámetros, usuario y día (el
+    nombre del archivo lleva la fecha).
+    """
+    generation = get_generations([company_namespace(company_id)])[company_namespace(company_id)]
+    return make_etag(
+        'export', company_id, generation, request.get_full_path(),
+        request.headers.get('Accept-Encoding', ''), timezone.localdate(), *_user_parts(request),
+    )
+
+
+def platform_etag(request, *args, **kwargs):
+    """Datos públicos de toda la plataforma: generación y URL completa"""
+    generation = get_generations([PLATFORM])[PLATFORM]
+    return make_etag(
+        'platform', generation, request.build_absolute_uri(), request.headers.get('Accept', ''),
+    )
+
+
+def catalog_etag(request, *args, **kwargs):
+    """Datos del listado de empresas: generación del catálogo y URL"""
+    generation = get_generations([CATALOG])[CATALOG]
+    return make_etag('catalog', generation, request.get_full_path())
+
+
+def host_etag(request, *args, **kwargs):
+    """Contenido que solo depende del dominio (robots.txt)"""
+    return make_etag('host', request.build_absolute_uri())
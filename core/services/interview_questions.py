@@ -0,0 +1,252 @@
+# core/services/interview_questions.py
+"""
+Índice de preguntas de entrevista por empresa y cargo.
+
+El campo interview_questions de cada reseña aprobada se divide en
+preguntas sueltas (por signos de interrogación, saltos de línea, viñetas y
+punto y coma). De cada una se calcula una firma: las raíces de sus
+palabras significativas, sin palabras vacías ni de relleno ("¿Cómo...?",
+"¿Has...?"), ordenadas. Dos preguntas con la misma firma, o con firmas
+que comparten al menos SIMILARITY_THRESHOLD de sus raíces (Jaccard), son
+la misma pregunta de la empresa (InterviewQuestion), y cada aparición
+queda en InterviewQuestionMention con el cargo normalizado.
+
+El índice es incremental: al confirmar el guardado de una reseña se quitan
+sus menciones anteriores y, si está aprobada, se vuelven a extraer
+(core/signals.py).
+"manage.py rebuild_interview_questions" lo reconstruye desde cero.
+
+Las preguntas más frecuentes se leen del índice, nunca del texto de las
+reseñas.
+"""
+
+import logging
+import re
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from reviews.models import InterviewQuestion, InterviewQuestionMention, Review
+from core.services.spanish_text import STOPWORDS, fold, stem, stem_text, words
+
+logger = logging.getLogger(__name__)
+
+# Fracción mínima de raíces en común para considerar dos preguntas iguales
+SIMILARITY_THRESHOLD = 0.75
+
+# Preguntas con menos palabras significativas se descartan ("¿Algo más?")
+MIN_TERMS = 2
+
+MAX_QUESTION_LENGTH = 300
+
+DEFAULT_LIMIT = 10
+
+# Palabras de relleno de las preguntas, que no distinguen una de otra
+FILLER_WORDS = {
+    'como', 'cual', 'cuales', 'cuando', 'cuanto', 'cuantos', 'donde', 'quien',
+    'por', 'que', 'has', 'haz', 'tienes', 'tiene', 'tu', 'tus', 'usted',
+    'puedes', 'podrias', 'hablame', 'cuentame', 'describe', 'explica',
+}
+
+_IGNORED_STEMS = {stem(word) for word in STOPWORDS | FILLER_WORDS}
+
+_split_re = re.compile(r'[?\n;]+|(?:^|\s)(?:[•\-\*]|\d+[.)])\s+')
+_edge_re = re.compile(r'^[\s¿¡•\-\*\d.):,]+|[\s.:,!¡]+$')
+
+
+# ===== EXTRACCIÓN =====
+
+def normalize_job_title(job_title):
+    """Cargo sin tildes y reducido a raíces: agrupa 'Diseñadora UX' y 'diseñador ux'"""
+    return stem_text(job_title)[:200]
+
+
+def signature_terms(text):
+    """Raíces significativas de una pregunta"""
+    return sorted({stem(word) for word in words(text)} - _IGNORED_STEMS)
+
+
+def split_questions(text):
+    """
+    Preguntas sueltas de un texto libre, limpias y con signos de
+    interrogación. Retorna una lista de (texto, raíces de la firma).
+    """
+    questions = []
+    seen = set()
+    for part in _split_re.split(text or ''):
+        cleaned = _edge_re.sub('', part or '').strip()
+        terms = signature_terms(cleaned)
+        if len(terms) < MIN_TERMS:
+            continue
+        signature = ' '.join(terms)
+        if signature in seen:
+            continue
+        seen.add(signature)
+        display = f"¿{cleaned[0].upper()}{cleaned[1:]}?"
+        questions.append((display[:MAX_QUESTION_LENGTH], terms))
+    return questions
+
+
+def similarity(terms_a, terms_b):
+    a, b = set(terms_a), set(terms_b)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# ===== ÍNDICE =====
+
+def _candidates(company_id, terms):
+    """Preguntas de la empresa que comparten alguna raíz (las únicas que pueden coincidir)"""
+    condition = Q()
+    for term in terms:
+        # Las firmas son raíces separadas por espacios
+        condition |= (
+            Q(signature=term)
+            | Q(signature__startswith=f'{term} ')
+            | Q(signature__endswith=f' {term}')
+            | Q(signature__contains=f' {term} ')
+        )
+    return InterviewQuestion.objects.filter(condition, company_id=company_id)
+
+
+def _find_question(company_id, terms):
+    """Pregunta existente con la misma firma o la más parecida sobre el umbral"""
+    signature = ' '.join(terms)
+    best, best_score = None, SIMILARITY_THRESHOLD
+    for question in _candidates(company_id, terms):
+        if question.signature == signature:
+            return question
+        score = similarity(terms, question.signature.split())
+        if score >= best_score:
+            best, best_score = question, score
+    return best
+
+
+def _refresh_counts(question_ids):
+    """Recalcula los contadores y borra las preguntas que quedaron sin menciones"""
+    if not question_ids:
+        return
+    questions = InterviewQuestion.objects.filter(id__in=question_ids)
+    for question in questions.annotate(mentions_total=Count('mentions')):
+        if question.mentions_total == 0:
+            question.delete()
+        elif question.mention_count != question.mentions_total:
+            InterviewQuestion.objects.filter(pk=question.pk).update(mention_count=question.mentions_total)
+
+
+def _add_review(review):
+    job_title_key = normalize_job_title(review.job_title or '')
+    seen_at = review.submission_date or timezone.now()
+    for text, terms in split_questions(review.interview_questions):
+        question = _find_question(review.company_id, terms)
+        if question is None:
+            question = InterviewQuestion.objects.create(
+                company_id=review.company_id, text=text, signature=' '.join(terms)[:255],
+                mention_count=0, last_seen_at=seen_at,
+            )
+        _, created = InterviewQuestionMention.objects.get_or_create(
+            question=question, review=review,
+            defaults={'job_title_key': job_title_key, 'text': text},
+        )
+        if created:
+            InterviewQuestion.objects.filter(pk=question.pk).update(mention_count=F('mention_count') + 1)
+            if seen_at > question.last_seen_at:
+                InterviewQuestion.objects.filter(pk=question.pk).update(last_seen_at=seen_at)
+
+
+def index_review(review):
+    """Quita las menciones anteriores de la reseña y, si está aprobada, la vuelve a indexar"""
+    with transaction.atomic():
+        previous = list(
+            InterviewQuestionMention.objects.filter(review_id=review.pk).values_list('question_id', flat=True)
+        )
+        InterviewQuestionMention.objects.filter(review_id=review.pk).delete()
+        if review.status == 'approved':
+            _add_review(review)
+        _refresh_counts(previous)
+
+
+def schedule_review_index(review_id):
+    """Vuelve a indexar la reseña al confirmar la transacción en curso"""
+    def _index():
+        try:
+            review = Review.objects.filter(pk=review_id).first()
+            if review is not None:
+                index_review(review)
+        except Exception as e:
+            # Un fallo aquí no debe afectar el guardado; rebuild_interview_questions lo corrige
+            logger.warning(f"No se pudieron indexar las preguntas de la reseña {review_id}: {e}")
+
+    transaction.on_commit(_index)
+
+
+def remove_review(review):
+    """
+    Quita las menciones de una reseña que se va a borrar (señal
+    pre_delete, antes del borrado en cascada) y actualiza sus preguntas.
+    """
+    with transaction.atomic():
+        mentions = InterviewQuestionMention.objects.filter(review_id=review.pk)
+        question_ids = list(mentions.values_list('question_id', flat=True))
+        mentions.delete()
+        _refresh_counts(question_ids)
+
+
+def rebuild_index(progress=None):
+    """Reconstruye el índice con todas las reseñas aprobadas. Retorna las preguntas distintas."""
+    with transaction.atomic():
+        InterviewQuestion.objects.all().delete()
+        reviews = (
+            Review.objects.filter(status='approved')
+            .exclude(interview_questions__isnull=True).exclude(interview_questions='')
+            .only('id', 'company_id', 'job_title', 'interview_questions', 'submission_date')
+            .order_by('submission_date', 'id')
+        )
+        for count, review in enumerate(reviews.iterator(chunk_size=500), start=1):
+            _add_review(review)
+            if progress and count % 500 == 0:
+                progress(count)
+    return InterviewQuestion.objects.count()
+
+
+# ===== CONSULTAS =====
+
+def top_questions(company_id, job_title=None, limit=DEFAULT_LIMIT):
+    """
+    Preguntas más frecuentes de una empresa, opcionalmente solo las
+    mencionadas para un cargo ("desarrollador" incluye "Desarrollador
+    Backend"). Lista de diccionarios listos para JSON.
+    """
+    questions = InterviewQuestion.objects.filter(company_id=company_id)
+    if job_title:
+        key = normalize_job_title(job_title)
+        questions = (
+            questions.filter(mentions__job_title_key__contains=key)
+            .annotate(frequency=Count('mentions'))
+            .order_by('-frequency', '-last_seen_at')
+        )
+    else:
+        questions = questions.annotate(frequency=F('mention_count')).order_by('-mention_count', '-last_seen_at')
+
+    return [
+        {
+            'question': question.text,
+            'frequency': question.frequency,
+            'last_seen': question.last_seen_at.isoformat(),
+        }
+        for question in questions[:limit]
+    ]
+
+
+def company_job_titles(company_id):
+    """Cargos con preguntas indexadas en la empresa (el más reciente de cada variante)"""
+    titles = {}
+    reviews = (
+        Review.objects.filter(company_id=company_id, question_mentions__isnull=False)
+        .order_by('-submission_date').values_list('job_title', flat=True).distinct()
+    )
+    for job_title in reviews:
+        titles.setdefault(normalize_job_title(job_title), job_title.strip())
+    return sorted(titles.values(), key=fold)
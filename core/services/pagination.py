@@ -0,0 +1,163 @@
+# core/services/pagination.py
+"""
+Paginación por cursor (keyset) para listados grandes.
+
+A diferencia de Paginator (OFFSET/LIMIT), el cursor guarda el valor del campo
+de ordenamiento y el id de la última fila entregada, así que cada página se
+resuelve con un filtro indexable y su costo no crece con el número de página.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def _encode_value(value):
+    """Convierte fechas a un formato serializable en JSON"""
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    """Operación inversa de _encode_value"""
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return parse_datetime(value['dt'])
+        if 'd' in value:
+            return parse_date(value['d'])
+    return value
+
+
+def encode_cursor(values, direction='next'):
+    """
+    Codifica una lista de valores (ej: [valor_orden, id]) en un token opaco
+    seguro para usar en la URL.
+    """
+    payload = {'v': [_encode_value(v) for v in values], 'd': direction}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decodifica un token generado por encode_cursor.
+    Retorna (valores, dirección) o (None, 'next') si el token no es válido.
+    """
+    if not token:
+        return None, 'next'
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = [_decode_value(v) for v in payload['v']]
+        direction = payload.get('d', 'next')
+    except (ValueError, TypeError, KeyError):
+        return None, 'next'
+    if direction not in ('next', 'prev'):
+        direction = 'next'
+    return values, direction
+
+
+def keyset_filter(fields, values):
+    """
+    Construye el Q que selecciona las filas posteriores al cursor.
+
+    fields: lista de tuplas (campo, descendente) en el orden de prioridad.
+    values: valores del cursor en el mismo orden.
+
+    Para [('avg_rating', True), ('id', True)] con valores [4.5, 10] genera:
+    avg_rating < 4.5 OR (avg_rating = 4.5 AND id < 10)
+    """
+    condition = Q()
+    equal_prefix = Q()
+    for (field, descending), value in zip(fields, values):
+        lookup = 'lt' if descending else 'gt'
+        condition |= equal_prefix & Q(**{f'{field}__{lookup}': value})
+        equal_prefix &= Q(**{field: value})
+    return condition
+
+
+def _row_value(row, field):
+    """Valor de un campo en una instancia o en un diccionario de values()"""
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def paginate_keyset(queryset, fields, cursor=None, page_size=20):
+    """
+    Pagina un queryset por cursor.
+
+    fields: lista de tuplas (campo, descendente). El último campo debe ser
+    único (normalmente 'id') para que el orden sea total. El queryset puede
+    ser de instancias o de values() (que entonces debe incluir esos campos).
+
+    Retorna un diccionario con:
+    - items: filas de la página actual
+    - next_cursor / prev_cursor: tokens para navegar (None si no hay más)
+    """
+    values, direction = decode_cursor(cursor)
+    if values is not None and len(values) != len(fields):
+        values, direction = None, 'next'
+
+    # Para ir hacia atrás se invierte el orden, se toma la página y se
+    # vuelve a invertir al final
+    if direction == 'prev':
+        walk_fields = [(field, not descending) for field, descending in fields]
+    else:
+        walk_fields = list(fields)
+
+    ordering = [f'-{field}' if descending else field for field, descending in walk_fields]
+    page_qs = queryset.order_by(*ordering)
+    if values is not None:
+        page_qs = page_qs.filter(keyset_filter(walk_fields, values))
+
+    # Se pide una fila extra para saber si existe otra página
+    rows = list(page_qs[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == 'prev':
+        rows.reverse()
+
+    def cursor_for(row, cursor_direction):
+        return encode_cursor([_row_value(row, field) for field, _ in fields], cursor_direction)
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if direction == 'prev':
+            # Siempre existe página siguiente al volver atrás
+            next_cursor = cursor_for(rows[-1], 'next')
+            prev_cursor = cursor_for(rows[0], 'prev') if has_more else None
+        else:
+            next_cursor = cursor_for(rows[-1], 'next') if has_more else None
+            prev_cursor = cursor_for(rows[0], 'prev') if values is not None else None
+
+    return {
+        'items': rows,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor,
+    }
+
+
+def iterate_keyset(queryset, fields, values=None, batch_size=1000):
+    """
+    Recorre todas las filas posteriores al cursor 'values' en lotes de
+    batch_size, cada lote con su propia consulta por cursor. Sirve para
+    respuestas en streaming: no mantiene un cursor de base de datos abierto
+    mientras el cliente descarga y cada consulta usa el índice.
+
+    queryset: values() que incluya los campos de 'fields'.
+    """
+    ordering = [f'-{field}' if descending else field for field, descending in fields]
+    while True:
+        batch_qs = queryset.order_by(*ordering)
+        if values is not None:
+            batch_qs = batch_qs.filter(keyset_filter(fields, values))
+        batch = list(batch_qs[:batch_size])
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        values = [_row_value(batch[-1], field) for field, _ in fields]
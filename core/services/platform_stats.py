@@ -0,0 +1,337 @@
+# core/services/platform_stats.py
+"""
+Estadísticas de toda la plataforma para el dashboard de candidatos y el
+endpoint de datos para IA.
+
+Con NumPy disponible se calculan sobre el snapshot columnar de reseñas
+(core/services/review_snapshot.py); sin él se usan las consultas SQL
+equivalentes. Ambos caminos producen las mismas estructuras.
+
+La cantidad de empresas por sector o ciudad cuenta empresas distintas.
+Antes se usaba Count('id') sobre el JOIN con reseñas, que contaba una fila
+por reseña e inflaba el número en las empresas con varias reseñas.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Avg, Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from companies.models import Company
+from reviews.models import Review
+from core.services.review_snapshot import get_snapshot, month_label
+
+# Ventana de la tendencia mensual del dashboard
+MONTHLY_TREND_DAYS = 180
+
+
+def _sector_name(value):
+    return value or 'Sin especificar'
+
+
+def _rating_label(rating):
+    return f"{rating} estrella{'s' if rating > 1 else ''}"
+
+
+def _sorted_groups(stats):
+    """Grupos ordenados por cantidad de empresas (desc) y luego por nombre"""
+    return sorted(stats.items(), key=lambda item: (-item[1]['companies'], str(item[0])))
+
+
+# ===== DASHBOARD DE CANDIDATOS =====
+
+def dashboard_chart_data(companies, modality=None):
+    """
+    Datos de los gráficos del dashboard para el queryset de empresas ya
+    filtrado. Con filtro de modalidad, las métricas por empresa consideran
+    solo las reseñas de esa modalidad (igual que el JOIN filtrado en SQL).
+    La distribución de calificaciones, la tendencia mensual y el estado de
+    reseñas son globales, como en la vista original.
+    """
+    chart_data = {
+        'sector_distribution': {},
+        'location_distribution': {},
+        'rating_distribution': {},
+        'monthly_trend': {},
+        'top_companies': {},
+        'review_status': {}
+    }
+
+    rows = list(companies.prefetch_related(None).values_list('id', 'name', 'sector', 'location'))
+    if not rows:
+        return chart_data
+
+    snapshot = get_snapshot()
+    if snapshot is None:
+        _dashboard_chart_data_sql(companies, chart_data)
+        return chart_data
+
+    company_ids = [row[0] for row in rows]
+    mask = snapshot.company_mask(company_ids)
+    if modality:
+        mask &= snapshot.modality_mask(modality)
+
+    # Distribución por sector
+    sector_stats = _sorted_groups(snapshot.group_stats({row[0]: row[2] for row in rows}, mask))
+    for sector, stat in sector_stats:
+        chart_data['sector_distribution'][_sector_name(sector)] = {
+            'companies': stat['companies'],
+            'avg_rating': round(stat['avg_rating'] or 0, 1),
+            'total_reviews': stat['total_reviews']
+        }
+
+    # Distribución por ubicación (top 10 ciudades)
+    location_stats = _sorted_groups(snapshot.group_stats({row[0]: row[3] for row in rows}, mask))
+    for location, stat in location_stats[:10]:
+        chart_data['location_distribution'][_sector_name(location)] = {
+            'companies': stat['companies'],
+            'avg_rating': round(stat['avg_rating'] or 0, 1)
+        }
+
+    # Distribución de calificaciones
+    for rating, count in snapshot.rating_distribution().items():
+        chart_data['rating_distribution'][_rating_label(rating)] = count
+
+    # Tendencia mensual
+    since = timezone.now() - timedelta(days=MONTHLY_TREND_DAYS)
+    for month, count in sorted(snapshot.monthly_counts(since).items()):
+        chart_data['monthly_trend'][month_label(month)] = count
+
+    # Top empresas por calificación
+    names = {row[0]: row[1] for row in rows}
+    company_stats = snapshot.company_stats(mask)
+    top = sorted(company_stats.items(), key=lambda item: (-item[1][1], -item[1][0], names[item[0]]))[:10]
+    for company_id, (review_count, avg_rating) in top:
+        chart_data['top_companies'][names[company_id]] = {
+            'avg_rating': round(avg_rating, 1),
+            'review_count': review_count
+        }
+
+    # Estado de reseñas
+    status_labels = dict(Review.STATUS_CHOICES)
+    for status, count in sorted(snapshot.status_counts().items()):
+        chart_data['review_status'][status_labels.get(status, status)] = count
+
+    # Satisfacción por sector
+    chart_data['sector_satisfaction'] = {
+        _sector_name(sector): {
+            'avg_rating': round(stat['avg_rating'], 1),
+            'total_reviews': stat['total_reviews']
+        }
+        for sector, stat in sector_stats
+        if stat['avg_rating'] is not None and stat['total_reviews'] > 0
+    }
+
+    return chart_data
+
+
+def _dashboard_chart_data_sql(companies, chart_data):
+    """Cálculo con consultas SQL cuando NumPy no está disponible"""
+    # Distribución por sector
+    sector_stats = companies.values('sector').annotate(
+        count=Count('id', distinct=True),
+        avg_rating=Avg('reviews__overall_rating'),
+        total_reviews=Count('reviews')
+    ).order_by('-count', 'sector')
+
+    for stat in sector_stats:
+        chart_data['sector_distribution'][_sector_name(stat['sector'])] = {
+            'companies': stat['count'],
+            'avg_rating': round(stat['avg_rating'] or 0, 1),
+            'total_reviews': stat['total_reviews']
+        }
+
+    # Distribución por ubicación
+    location_stats = companies.values('location').annotate(
+        count=Count('id', distinct=True),
+        avg_rating=Avg('reviews__overall_rating')
+    ).order_by('-count', 'location')[:10]  # Top 10 ciudades
+
+    for stat in location_stats:
+        chart_data['location_distribution'][_sector_name(stat['location'])] = {
+            'companies': stat['count'],
+            'avg_rating': round(stat['avg_rating'] or 0, 1)
+        }
+
+    # Distribución de calificaciones
+    rating_stats = Review.objects.values('overall_rating').annotate(
+        count=Count('id')
+    ).order_by('overall_rating')
+
+    for stat in rating_stats:
+        if stat['overall_rating'] is not None:
+            chart_data['rating_distribution'][_rating_label(stat['overall_rating'])] = stat['count']
+
+    # Tendencia mensual
+    since = timezone.now() - timedelta(days=MONTHLY_TREND_DAYS)
+    monthly_stats = Review.objects.filter(
+        submission_date__gte=since
+    ).annotate(
+        month=TruncMonth('submission_date')
+    ).values('month').annotate(
+        count=Count('id')
+    ).order_by('month')
+
+    for stat in monthly_stats:
+        if stat['month']:
+            chart_data['monthly_trend'][stat['month'].strftime('%b %Y')] = stat['count']
+
+    # Top empresas por calificación
+    top_companies_stats = companies.annotate(
+        avg_rating=Avg('reviews__overall_rating'),
+        review_count=Count('reviews')
+    ).filter(
+        avg_rating__isnull=False,
+        review_count__gte=1
+    ).order_by('-avg_rating', '-review_count', 'name')[:10]
+
+    for company in top_companies_stats:
+        chart_data['top_companies'][company.name] = {
+            'avg_rating': round(company.avg_rating, 1),
+            'review_count': company.review_count
+        }
+
+    # Estado de reseñas
+    review_status_stats = Review.objects.values('status').annotate(
+        count=Count('id')
+    ).order_by('status')
+
+    status_labels = dict(Review.STATUS_CHOICES)
+    for stat in review_status_stats:
+        chart_data['review_status'][status_labels.get(stat['status'], stat['status'])] = stat['count']
+
+    # Satisfacción por sector
+    chart_data['sector_satisfaction'] = {
+        _sector_name(stat['sector']): {
+            'avg_rating': round(stat['avg_rating'], 1),
+            'total_reviews': stat['total_reviews']
+        }
+        for stat in sector_stats
+        if stat['avg_rating'] is not None and stat['total_reviews'] > 0
+    }
+
+
+# ===== ENDPOINT DE DATOS PARA IA =====
+
+def ai_platform_stats():
+    """
+    Estadísticas de las empresas activas para ai_data_endpoint:
+    total y promedio de reseñas aprobadas, top 10 empresas (según reseñas
+    aprobadas) y distribución por sector y ciudad.
+    """
+    companies = {
+        row[0]: row
+        for row in Company.objects.filter(is_active=True).values_list(
+            'id', 'name', 'location', 'region', 'country', 'sector'
+        )
+    }
+
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return _ai_platform_stats_sql()
+
+    approved = snapshot.status_mask('approved')
+    active = snapshot.company_mask(companies.keys())
+
+    top = sorted(
+        snapshot.company_stats(approved & active).items(),
+        key=lambda item: (-item[1][1], -item[1][0], companies[item[0]][1])
+    )[:10]
+
+    sector_stats = _sorted_groups(snapshot.group_stats({pk: row[5] for pk, row in companies.items()}, active))
+    location_stats = _sorted_groups(snapshot.group_stats({pk: row[2] for pk, row in companies.items()}, active))
+
+    return {
+        'total_reviews': int(approved.sum()),
+        'average_rating': snapshot.mean('overall', approved) or 0,
+        'top_companies': [
+            {
+                'name': companies[pk][1],
+                'location': companies[pk][2],
+                'region': companies[pk][3],
+                'country': companies[pk][4],
+                'sector': companies[pk][5],
+                'average_rating': round(avg_rating, 1),
+                'review_count': review_count,
+            }
+            for pk, (review_count, avg_rating) in top
+        ],
+        'sector_distribution': [
+            {
+                'sector': _sector_name(sector),
+                'company_count': stat['companies'],
+                'average_rating': round(stat['avg_rating'] or 0, 1),
+                'total_reviews': stat['total_reviews'],
+            }
+            for sector, stat in sector_stats
+        ],
+        'location_distribution': [
+            {
+                'location': _sector_name(location),
+                'company_count': stat['companies'],
+                'average_rating': round(stat['avg_rating'] or 0, 1),
+            }
+            for location, stat in location_stats[:10]
+        ],
+    }
+
+
+def _ai_platform_stats_sql():
+    """Cálculo con consultas SQL cuando NumPy no está disponible"""
+    approved_reviews = Review.objects.filter(status='approved')
+    active_companies = Company.objects.filter(is_active=True)
+
+    top_companies = active_companies.filter(
+        reviews__status='approved'
+    ).annotate(
+        avg_rating=Avg('reviews__overall_rating'),
+        review_count=Count('reviews')
+    ).filter(
+        review_count__gte=1
+    ).order_by('-avg_rating', '-review_count', 'name')[:10]
+
+    sector_stats = active_companies.values('sector').annotate(
+        count=Count('id', distinct=True),
+        avg_rating=Avg('reviews__overall_rating'),
+        total_reviews=Count('reviews')
+    ).order_by('-count', 'sector')
+
+    location_stats = active_companies.values('location').annotate(
+        count=Count('id', distinct=True),
+        avg_rating=Avg('reviews__overall_rating')
+    ).order_by('-count', 'location')[:10]
+
+    return {
+        'total_reviews': approved_reviews.count(),
+        'average_rating': approved_reviews.aggregate(avg=Avg('overall_rating'))['avg'] or 0,
+        'top_companies': [
+            {
+                'name': company.name,
+                'location': company.location,
+                'region': company.region,
+                'country': company.country,
+                'sector': company.sector,
+                'average_rating': round(company.avg_rating, 1),
+                'review_count': company.review_count,
+            }
+            for company in top_companies
+        ],
+        'sector_distribution': [
+            {
+                'sector': _sector_name(stat['sector']),
+                'company_count': stat['count'],
+                'average_rating': round(stat['avg_rating'] or 0, 1),
+                'total_reviews': stat['total_reviews'],
+            }
+            for stat in sector_stats
+        ],
+        'location_distribution': [
+            {
+                'location': _sector_name(stat['location']),
+                'company_count': stat['count'],
+                'average_rating': round(stat['avg_rating'] or 0, 1),
+            }
+            for stat in location_stats
+        ],
+    }
@@ -0,0 +1,72 @@
+# core/services/profile_summary.py
+"""
+Resumen del perfil de un candidato (my_profile y perfil público).
+
+Todos los contadores de reseñas (total, aprobadas, pendientes, rechazadas y
+empresas distintas) salen de una sola agregación condicional. Las listas
+(experiencias, últimas reseñas, logros y reseñas pendientes) son una
+consulta cada una, y sus totales se toman de la misma lista.
+
+El resumen se guarda en la caché de analítica bajo la generación del
+usuario, que se incrementa al guardar o borrar sus reseñas, experiencias,
+logros o reseñas pendientes (core/signals.py). La clave incluye también las
+generaciones CATALOG (nombres de empresa) y la de las reglas de logros
+(nombres e íconos), así un cambio en ellas no deja datos viejos.
+"""
+
+from django.db.models import Count, Q
+
+from achievements.models import UserAchievement
+from reviews.models import PendingReview, Review
+from work_history.models import WorkHistory
+from core.services.achievement_engine import RULES_NAMESPACE
+from core.services.analytics_cache import get_user_analytics
+from core.services.cache_generations import CATALOG, get_generations
+
+# Reseñas recientes que se guardan (my_profile muestra 3, el perfil público 5)
+LATEST_REVIEWS = 5
+
+
+def _build(user_profile_id):
+    summary = Review.objects.filter(user_profile_id=user_profile_id).aggregate(
+        total_reviews=Count('id'),
+        approved_reviews=Count('id', filter=Q(status='approved')),
+        pending_approval=Count('id', filter=Q(status='pending')),
+        rejected_reviews=Count('id', filter=Q(status='rejected')),
+        companies_reviewed=Count('company', distinct=True),
+    )
+
+    summary['latest_reviews'] = list(
+        Review.objects.filter(user_profile_id=user_profile_id)
+        .select_related('company').order_by('-submission_date')[:LATEST_REVIEWS]
+    )
+    summary['work_history'] = list(
+        WorkHistory.objects.filter(user_profile_id=user_profile_id)
+        .select_related('company').order_by('-start_date')
+    )
+    summary['user_achievements'] = list(
+        UserAchievement.objects.filter(user_profile_id=user_profile_id)
+        .select_related('achievement').order_by('-earned_at')
+    )
+    summary['pending_reviews'] = list(
+        PendingReview.objects.filter(user_profile_id=user_profile_id, is_reviewed=False)
+        .select_related('company')
+    )
+    summary['work_experiences'] = len(summary['work_history'])
+    summary['achievement_count'] = len(summary['user_achievements'])
+    return summary
+
+
+def get_profile_summary(user_profile):
+    """
+    Diccionario con los contadores y listas del perfil: total_reviews,
+    approved_reviews, pending_approval, rejected_reviews, companies_reviewed,
+    work_experiences, achievement_count, latest_reviews, work_history,
+    user_achievements y pending_reviews.
+    """
+    generations = get_generations([CATALOG, RULES_NAMESPACE])
+    return get_user_analytics(
+        user_profile.pk,
+        ('profile_summary', generations[CATALOG], generations[RULES_NAMESPACE]),
+        lambda: _build(user_profile.pk),
+    )
@@ -0,0 +1,179 @@
+# core/services/rate_limit.py
+"""
+Límite de peticiones por cliente y por endpoint (token bucket).
+
+Cada cliente (usuario autenticado o IP) tiene una cubeta por endpoint con
+'capacity' fichas que se recargan a 'per_minute' fichas por minuto. Cada
+petición gasta 'cost' fichas; si no alcanzan se responde 429 con
+Retry-After (segundos hasta tener fichas suficientes). Así un crawler
+agresivo agota su cubeta sin ocupar los workers que atienden al resto.
+
+El estado de la cubeta se guarda en la caché (RATE_LIMIT_CACHE_ALIAS,
+compartida entre nodos). La lectura y escritura no son atómicas: con
+peticiones simultáneas del mismo cliente el límite es aproximado, lo que
+basta para frenar abusos. Si la caché falla, la petición se deja pasar.
+
+Configuración opcional en settings.py:
+- RATE_LIMIT_ENABLED: activa o desactiva el límite
+- RATE_LIMITS: {alcance: {'capacity': n, 'per_minute': n}}
+- RATE_LIMIT_CACHE_ALIAS: alias de CACHES donde se guardan las cubetas
+- RATE_LIMIT_EXEMPT_IPS: IPs o redes (CIDR) sin límite (monitoreo, socios)
+- RATE_LIMIT_PROXY_COUNT: proxies de confianza delante de Django; la IP del
+  cliente se toma de X-Forwarded-For solo si es mayor que 0
+"""
+
+import ipaddress
+import logging
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.services.fast_json import json_response
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'ratelimit'
+
+DEFAULT_LIMITS = {
+    # Endpoints públicos de datos para IA
+    'ai': {'capacity': 60, 'per_minute': 60},
+    # Exportaciones (CSV, Excel, trabajos en segundo plano)
+    'export': {'capacity': 10, 'per_minute': 10},
+}
+
+
+def _enabled():
+    return getattr(settings, 'RATE_LIMIT_ENABLED', True)
+
+
+def _cache():
+    return caches[getattr(settings, 'RATE_LIMIT_CACHE_ALIAS', 'default')]
+
+
+def get_limit(scope):
+    limits = getattr(settings, 'RATE_LIMITS', DEFAULT_LIMITS)
+    return limits.get(scope) or DEFAULT_LIMITS[scope]
+
+
+# ===== CLIENTE =====
+
+def client_ip(request):
+    """IP del cliente, detrás de RATE_LIMIT_PROXY_COUNT proxies de confianza"""
+    proxies = getattr(settings, 'RATE_LIMIT_PROXY_COUNT', 0)
+    if proxies > 0:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        # Cada proxy agrega la IP de quien le habló; las de más a la
+        # izquierda las puede inventar el cliente
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _exempt_networks():
+    networks = []
+    for value in getattr(settings, 'RATE_LIMIT_EXEMPT_IPS', []):
+        try:
+            networks.append(ipaddress.ip_network(value, strict=False))
+        except ValueError:
+            logger.warning(f"RATE_LIMIT_EXEMPT_IPS: valor inválido {value!r}")
+    return networks
+
+
+def is_exempt(request, ip):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in network for network in _exempt_networks())
+
+
+def client_key(request, ip):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{ip}'
+
+
+# ===== CUBETA =====
+
+def consume(key, capacity, per_minute, cost=1, now=None):
+    """
+    Gasta 'cost' fichas de la cubeta 'key'.
+    Retorna (permitido, fichas restantes, segundos hasta poder reintentar).
+    """
+    now = time.time() if now is None else now
+    rate = per_minute / 60.0
+    # Una petición nunca puede costar más que la cubeta llena
+    cost = min(cost, capacity)
+    cache = _cache()
+
+    state = cache.get(key)
+    if state is None:
+        tokens, updated = float(capacity), now
+    else:
+        tokens, updated = state
+        tokens = min(float(capacity), tokens + max(now - updated, 0) * rate)
+
+    if tokens >= cost:
+        tokens -= cost
+        allowed, retry_after = True, 0
+    else:
+        allowed = False
+        retry_after = max(1, math.ceil((cost - tokens) / rate)) if rate > 0 else 60
+
+    # La entrada expira cuando la cubeta ya estaría llena de nuevo
+    timeout = math.ceil(capacity / rate) + 1 if rate > 0 else None
+    cache.set(key, (tokens, now), timeout=timeout)
+    return allowed, int(tokens), retry_after
+
+
+def rate_limited(scope, cost=1):
+    """
+    Aplica el límite del alcance 'scope' a la vista, con una cubeta por
+    cliente y por vista. cost puede ser un número o una función
+    cost(request) para peticiones más caras que otras.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _enabled():
+                return view(request, *args, **kwargs)
+
+            ip = client_ip(request)
+            if is_exempt(request, ip):
+                return view(request, *args, **kwargs)
+
+            limit = get_limit(scope)
+            request_cost = cost(request) if callable(cost) else cost
+            key = ':'.join([KEY_PREFIX, scope, view.__name__, client_key(request, ip)])
+            try:
+                allowed, remaining, retry_after = consume(
+                    key, limit['capacity'], limit['per_minute'], cost=request_cost,
+                )
+            except Exception as e:
+                # Un fallo de la caché nunca debe dejar sin servicio
+                logger.warning(f"No se pudo aplicar el límite de peticiones ({key}): {e}")
+                return view(request, *args, **kwargs)
+
+            if not allowed:
+                response = json_response(request, {
+                    'error': 'Demasiadas solicitudes. Intenta nuevamente más tarde.',
+                    'retry_after': retry_after,
+                }, status=429)
+                response['Retry-After'] = str(retry_after)
+                response['X-RateLimit-Limit'] = str(limit['capacity'])
+                response['X-RateLimit-Remaining'] = '0'
+                return response
+
+            response = view(request, *args, **kwargs)
+            response['X-RateLimit-Limit'] = str(limit['capacity'])
+            response['X-RateLimit-Remaining'] = str(remaining)
+            return response
+        return wrapper
+    return decorator
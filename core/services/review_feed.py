@@ -0,0 +1,115 @@
+# core/services/review_feed.py
+"""
+Listado de reseñas aprobadas de una empresa, paginado por cursor.
+
+El detalle de empresa y la página de reseñas del representante muestran la
+primera página renderizada en el servidor; las siguientes se piden al
+endpoint company_review_feed a medida que el usuario baja (carga
+perezosa). Cada página es una consulta por cursor sobre el índice
+(company, status, ...), así el tiempo de respuesta y la memoria no crecen
+con la cantidad de reseñas de la empresa.
+
+Configuración opcional en settings.py:
+- REVIEW_FEED_PAGE_SIZE: reseñas por página
+"""
+
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from reviews.models import Review
+from core.services.pagination import paginate_keyset
+
+# Ordenamientos: clave en la URL -> campos (campo, descendente) del cursor.
+# El id al final hace el orden total.
+SORT_FIELDS = {
+    'recent': [('submission_date', True), ('id', True)],
+    'oldest': [('submission_date', False), ('id', False)],
+    'highest': [('overall_rating', True), ('submission_date', True), ('id', True)],
+    'lowest': [('overall_rating', False), ('submission_date', True), ('id', True)],
+}
+
+DEFAULT_SORT = 'recent'
+
+MODALITIES = {value for value, _ in Review.MODALITY_CHOICES}
+
+
+def page_size():
+    return getattr(settings, 'REVIEW_FEED_PAGE_SIZE', 12)
+
+
+def parse_feed_params(params):
+    """
+    Normaliza los filtros GET del listado (rating, modality, sort).
+    Los valores inválidos se ignoran en lugar de producir un error.
+    """
+    rating = params.get('rating') or ''
+    try:
+        rating_value = int(rating)
+        if not 1 <= rating_value <= 5:
+            rating_value = None
+    except ValueError:
+        rating_value = None
+
+    modality = params.get('modality') or ''
+    sort = params.get('sort') or DEFAULT_SORT
+    return {
+        'rating': rating,
+        'rating_value': rating_value,
+        'modality': modality,
+        'modality_value': modality if modality in MODALITIES else None,
+        'sort': sort,
+        'sort_key': sort if sort in SORT_FIELDS else DEFAULT_SORT,
+    }
+
+
+def has_filters(filters):
+    return filters['rating_value'] is not None or filters['modality_value'] is not None
+
+
+def _filter_q(filters):
+    condition = Q()
+    if filters['rating_value'] is not None:
+        condition &= Q(overall_rating=filters['rating_value'])
+    if filters['modality_value'] is not None:
+        condition &= Q(modality=filters['modality_value'])
+    return condition
+
+
+def feed_queryset(company, filters):
+    """Reseñas aprobadas de la empresa con los filtros aplicados (sin ordenar)"""
+    return (
+        Review.objects.filter(company=company, status='approved')
+        .filter(_filter_q(filters)).select_related('user_profile__user')
+    )
+
+
+def feed_counts(company, filters):
+    """(aprobadas en total, aprobadas con los filtros) en una sola consulta"""
+    condition = _filter_q(filters)
+    counts = Review.objects.filter(company=company, status='approved').aggregate(
+        total=Count('id'),
+        filtered=Count('id', filter=condition) if condition else Count('id'),
+    )
+    return counts['total'], counts['filtered']
+
+
+def feed_query_string(filters):
+    """Filtros del listado para la URL de company_review_feed"""
+    return urlencode({
+        key: filters[key] for key in ('rating', 'modality', 'sort') if filters[key]
+    })
+
+
+def feed_page(company, filters, cursor=None, size=None):
+    """
+    Una página del listado: diccionario con items, next_cursor y
+    prev_cursor (ver core/services/pagination.py).
+    """
+    return paginate_keyset(
+        feed_queryset(company, filters),
+        SORT_FIELDS[filters['sort_key']],
+        cursor=cursor,
+        page_size=size or page_size(),
+    )
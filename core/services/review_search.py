@@ -0,0 +1,318 @@
+# core/services/review_search.py
+"""
+Búsqueda de texto completo en las reseñas aprobadas (aspectos positivos,
+aspectos a mejorar y preguntas de entrevista).
+
+El índice es la tabla virtual FTS5 reviews_review_fts, con el id de la
+reseña como rowid. Guarda el texto ya reducido a raíces en español
+(core/services/spanish_text.py), así "entrevistas técnicas" encuentra
+"me entrevistaron" y "pregunta técnica". Solo contiene reseñas aprobadas:
+la señal de Review la actualiza al guardar (agrega, reemplaza o quita según
+el estado) y al borrar; "manage.py rebuild_search_index" la reconstruye.
+
+La consulta cruza el índice con las reseñas y empresas en SQL, con los
+filtros (empresa, sector, modalidad, fechas) y el orden por bm25 en la
+misma consulta. Los fragmentos resaltados se arman en Python sobre el
+texto original con el mismo lematizador.
+
+En otros motores de base de datos (o si la tabla no existe) se busca con
+icontains por cada palabra, ordenado por fecha.
+"""
+
+import logging
+import re
+from datetime import datetime, time, timedelta
+
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from companies.models import Company
+from reviews.models import Review
+from core.services.spanish_text import query_stems, stem, stem_text
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'reviews_review_fts'
+
+COLUMNS = ['pros', 'cons', 'interview_questions']
+FIELD_LABELS = {
+    'pros': 'Aspectos positivos',
+    'cons': 'Aspectos a mejorar',
+    'interview_questions': 'Preguntas de entrevista',
+}
+
+# Peso de cada columna en bm25 (las preguntas de entrevista son lo más buscado)
+COLUMN_WEIGHTS = [1.0, 1.0, 1.5]
+
+PAGE_SIZE = 20
+
+# Palabras alrededor de la primera coincidencia en cada fragmento
+SNIPPET_WORDS = 30
+
+_token_re = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+# ===== PARÁMETROS =====
+
+# Mayor entero aceptado en los parámetros (ids y página); valores mayores
+# no caben en los enteros de SQLite
+MAX_INT = 2 ** 31 - 1
+
+
+def _parse_int(value):
+    """Entero entre 1 y MAX_INT, o None"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if 1 <= number <= MAX_INT else None
+
+
+def _parse_date(value):
+    """Fecha AAAA-MM-DD o None (también si la fecha no existe, ej: 2024-02-31)"""
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+def parse_search_params(params):
+    """Normaliza los parámetros GET de la búsqueda de reseñas"""
+    modality = params.get('modality', '')
+    if modality not in dict(Review.MODALITY_CHOICES):
+        modality = ''
+    since = _parse_date(params.get('since'))
+    until = _parse_date(params.get('until'))
+    return {
+        'q': params.get('q', '').strip(),
+        'company_id': _parse_int(params.get('company')),
+        'sector': params.get('sector', '').strip(),
+        'modality': modality,
+        'since': since,
+        'until': until,
+        'page': _parse_int(params.get('page')) or 1,
+    }
+
+
+def _date_bounds(filters):
+    """(desde, hasta) con zona horaria; hasta es exclusivo"""
+    since = until = None
+    if filters['since']:
+        since = timezone.make_aware(datetime.combine(filters['since'], time.min))
+    if filters['until']:
+        until = timezone.make_aware(datetime.combine(filters['until'] + timedelta(days=1), time.min))
+    return since, until
+
+
+# ===== CONSULTA =====
+
+def match_query(text):
+    """Raíces de la consulta entre comillas, todas requeridas"""
+    stems = query_stems(text)
+    if not stems:
+        return None
+    return ' '.join(f'"{term}"' for term in stems)
+
+
+def _fts_page(match, filters, offset, limit):
+    """(ids de la página por relevancia, total de coincidencias)"""
+    review_table = Review._meta.db_table
+    company_table = Company._meta.db_table
+    where = [f"{FTS_TABLE} MATCH %s", "r.status = 'approved'", "c.is_active = %s"]
+    params = [match, True]
+
+    if filters['company_id']:
+        where.append("r.company_id = %s")
+        params.append(filters['company_id'])
+    if filters['sector']:
+        where.append("c.sector = %s")
+        params.append(filters['sector'])
+    if filters['modality']:
+        where.append("r.modality = %s")
+        params.append(filters['modality'])
+    since, until = _date_bounds(filters)
+    if since:
+        where.append("r.submission_date >= %s")
+        params.append(connection.ops.adapt_datetimefield_value(since))
+    if until:
+        where.append("r.submission_date < %s")
+        params.append(connection.ops.adapt_datetimefield_value(until))
+
+    source = (
+        f"FROM {FTS_TABLE} "
+        f"JOIN {review_table} r ON r.id = {FTS_TABLE}.rowid "
+        f"JOIN {company_table} c ON c.id = r.company_id "
+        f"WHERE {' AND '.join(where)}"
+    )
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) {source}", params)
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT r.id {source} ORDER BY bm25({FTS_TABLE}, {weights}), r.id DESC LIMIT %s OFFSET %s",
+            params + [limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    return ids, total
+
+
+def _fallback_page(text, filters, offset, limit):
+    """Búsqueda sin índice: icontains por palabra, de la más reciente"""
+    reviews = Review.objects.filter(status='approved', company__is_active=True)
+    for word in text.split():
+        reviews = reviews.filter(
+            Q(pros__icontains=word) | Q(cons__icontains=word) | Q(interview_questions__icontains=word)
+        )
+    if filters['company_id']:
+        reviews = reviews.filter(company_id=filters['company_id'])
+    if filters['sector']:
+        reviews = reviews.filter(company__sector=filters['sector'])
+    if filters['modality']:
+        reviews = reviews.filter(modality=filters['modality'])
+    since, until = _date_bounds(filters)
+    if since:
+        reviews = reviews.filter(submission_date__gte=since)
+    if until:
+        reviews = reviews.filter(submission_date__lt=until)
+    ids = list(reviews.order_by('-submission_date', '-id').values_list('id', flat=True)[offset:offset + limit])
+    return ids, reviews.count()
+
+
+def search_reviews(filters, page_size=PAGE_SIZE):
+    """
+    Una página de resultados: reseñas con sus fragmentos resaltados, total
+    de coincidencias y si hay páginas anterior y siguiente.
+    """
+    result = {'results': [], 'total': 0, 'page': filters['page'], 'has_prev': False, 'has_next': False}
+    stems = query_stems(filters['q'])
+    if not stems:
+        return result
+
+    offset = (filters['page'] - 1) * page_size
+    ids = None
+    if fts_available():
+        try:
+            ids, total = _fts_page(match_query(filters['q']), filters, offset, page_size)
+        except DatabaseError as e:
+            logger.warning(f"Índice de búsqueda de reseñas no disponible: {e}")
+    if ids is None:
+        ids, total = _fallback_page(filters['q'], filters, offset, page_size)
+
+    reviews = Review.objects.select_related('company').in_bulk(ids)
+    result.update({
+        'results': [
+            {'review': reviews[pk], 'snippets': review_snippets(reviews[pk], stems)}
+            for pk in ids if pk in reviews
+        ],
+        'total': total,
+        'has_prev': filters['page'] > 1,
+        'has_next': offset + len(ids) < total,
+    })
+    return result
+
+
+# ===== FRAGMENTOS =====
+
+def highlight(text, stems, max_words=SNIPPET_WORDS):
+    """
+    Fragmento de 'text' alrededor de la primera palabra cuya raíz está en
+    'stems', con las coincidencias en <mark>. None si no hay coincidencias.
+    """
+    tokens = list(_token_re.finditer(text or ''))
+    matches = [index for index, token in enumerate(tokens) if stem(token.group()) in stems]
+    if not matches:
+        return None
+
+    first = max(matches[0] - max_words // 4, 0)
+    last = min(first + max_words, len(tokens)) - 1
+    start = tokens[first].start() if first > 0 else 0
+    end = tokens[last].end() if last < len(tokens) - 1 else len(text)
+
+    parts = ['… '] if start > 0 else []
+    position = start
+    for index in matches:
+        if index < first or index > last:
+            continue
+        token = tokens[index]
+        parts.append(escape(text[position:token.start()]))
+        parts.append(f'<mark>{escape(token.group())}</mark>')
+        position = token.end()
+    parts.append(escape(text[position:end]))
+    if end < len(text):
+        parts.append(' …')
+    return mark_safe(''.join(parts))
+
+
+def review_snippets(review, stems):
+    stems = set(stems)
+    snippets = []
+    for field in COLUMNS:
+        html = highlight(getattr(review, field), stems)
+        if html:
+            snippets.append({'field': field, 'label': FIELD_LABELS[field], 'html': html})
+    return snippets
+
+
+# ===== MANTENIMIENTO DEL ÍNDICE =====
+
+def _index_row(review):
+    return [review.pk] + [stem_text(getattr(review, field) or '') for field in COLUMNS]
+
+
+def sync_review(review):
+    """
+    Refleja una reseña en el índice (señal post_save): la agrega o
+    reemplaza si está aprobada y la quita si no.
+    """
+    if not fts_available():
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [review.pk])
+            if review.status == 'approved':
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s)",
+                    _index_row(review),
+                )
+    except DatabaseError as e:
+        logger.warning(f"No se pudo indexar la reseña {review.pk}: {e}")
+
+
+def remove_review(review_id):
+    """Quita la reseña del índice (señal post_delete)"""
+    if not fts_available():
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [review_id])
+    except DatabaseError as e:
+        logger.warning(f"No se pudo quitar la reseña {review_id} del índice: {e}")
+
+
+def rebuild_index(batch_size=2000):
+    """Vacía y vuelve a llenar el índice. Retorna la cantidad de reseñas."""
+    total = 0
+    insert = f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s)"
+    reviews = Review.objects.filter(status='approved').only('id', *COLUMNS).order_by('id')
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        batch = []
+        for review in reviews.iterator(chunk_size=batch_size):
+            batch.append(_index_row(review))
+            if len(batch) >= batch_size:
+                cursor.executemany(insert, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(insert, batch)
+            total += len(batch)
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return total
@@ -0,0 +1,367 @@
+# core/services/review_snapshot.py
+"""
+Snapshot columnar de reseñas en memoria para la analítica de la plataforma.
+
+Las estadísticas globales (distribución por sector, ciudad y calificación,
+top empresas, tendencia mensual) se calculan sobre arreglos NumPy compactos
+en lugar de repetir GROUP BY sobre el JOIN completo de reseñas en cada
+petición. Cada reseña ocupa una posición en todas las columnas:
+
+- company_id (int32), overall (int8), communication, difficulty y
+  response_time (int8, escala ordinal; 0 = sin dato), status y modality
+  (int8, índice en las choices del modelo), month (int32, año*12 + mes-1
+  en la zona horaria local) y submitted (int64, segundos epoch).
+
+El snapshot se reconstruye cuando vence REVIEW_SNAPSHOT_TTL y además cambió
+la generación 'platform' (ver core/services/cache_generations.py). Si
+REVIEW_SNAPSHOT_DIR está configurado, las columnas se guardan como .npy y
+los demás procesos las abren con memoria mapeada en lugar de reconstruirlas.
+
+NumPy es opcional: sin él get_snapshot() retorna None y los llamadores usan
+las consultas SQL equivalentes.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from reviews.models import Review
+from core.services.cache_generations import PLATFORM, get_generation
+
+logger = logging.getLogger(__name__)
+
+# Intentar importar NumPy
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+    logger.info("numpy no disponible: la analítica de plataforma usará SQL")
+
+# ===== CODIFICACIÓN DE COLUMNAS =====
+STATUS_CODES = {value: index for index, (value, _) in enumerate(Review.STATUS_CHOICES)}
+MODALITY_CODES = {value: index for index, (value, _) in enumerate(Review.MODALITY_CHOICES)}
+
+# Escalas ordinales: mayor valor = mejor experiencia (dificultad: más difícil).
+# Son las mismas que usa la analítica de empresas (companies/analytics.py).
+COMMUNICATION_SCORES = {'poor': 2, 'regular': 3, 'good': 4, 'excellent': 5}
+DIFFICULTY_SCORES = {'very_easy': 1, 'easy': 2, 'moderate': 3, 'difficult': 4, 'very_difficult': 5}
+RESPONSE_TIME_SCORES = {'slow': 1, 'few_days': 2, 'next_day': 3, 'same_day': 4, 'immediate': 5}
+
+COLUMNS = {
+    'company_id': 'int32',
+    'overall': 'int8',
+    'communication': 'int8',
+    'difficulty': 'int8',
+    'response_time': 'int8',
+    'status': 'int8',
+    'modality': 'int8',
+    'month': 'int32',
+    'submitted': 'int64',
+}
+
+# Columnas numéricas usadas en percentiles y correlaciones
+SCORE_COLUMNS = ['overall', 'communication', 'difficulty', 'response_time']
+
+CURRENT_FILE = 'current.json'
+
+# Versión del formato en disco: se incrementa al cambiar columnas o escalas,
+# así los procesos no abren snapshots escritos con la codificación anterior
+FORMAT_VERSION = 2
+
+
+def month_index(dt):
+    """Índice de mes (año*12 + mes-1) de una fecha en la zona horaria local"""
+    dt = timezone.localtime(dt) if timezone.is_aware(dt) else dt
+    return dt.year * 12 + dt.month - 1
+
+
+def month_label(index):
+    """Etiqueta 'Mon YYYY' de un índice de mes, igual que strftime('%b %Y')"""
+    year, month = divmod(int(index), 12)
+    return timezone.datetime(year, month + 1, 1).strftime('%b %Y')
+
+
+# ===== SNAPSHOT =====
+class ReviewSnapshot:
+    """Columnas NumPy de todas las reseñas y operaciones vectorizadas sobre ellas"""
+
+    def __init__(self, columns, generation, built_at):
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+        self.generation = generation
+        self.built_at = built_at
+        self.size = len(columns['company_id'])
+
+    # ----- Construcción -----
+    @classmethod
+    def build(cls, generation):
+        """Lee todas las reseñas de la base de datos en una sola pasada"""
+        rows = Review.objects.order_by().values_list(
+            'company_id', 'overall_rating', 'communication_rating',
+            'difficulty_rating', 'response_time_rating', 'status',
+            'modality', 'submission_date',
+        )
+        count = rows.count()
+        columns = {name: np.zeros(count, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+        index = -1
+        for index, (company_id, overall, communication, difficulty,
+                    response_time, status, modality, submitted) in enumerate(rows.iterator(chunk_size=5000)):
+            if index >= count:
+                # Reseñas creadas durante la lectura: se incluyen en el próximo snapshot
+                break
+            columns['company_id'][index] = company_id
+            columns['overall'][index] = overall or 0
+            columns['communication'][index] = COMMUNICATION_SCORES.get(communication, 0)
+            columns['difficulty'][index] = DIFFICULTY_SCORES.get(difficulty, 0)
+            columns['response_time'][index] = RESPONSE_TIME_SCORES.get(response_time, 0)
+            columns['status'][index] = STATUS_CODES.get(status, -1)
+            columns['modality'][index] = MODALITY_CODES.get(modality, -1)
+            columns['month'][index] = month_index(submitted)
+            columns['submitted'][index] = int(submitted.timestamp())
+
+        # Si se borraron reseñas durante la lectura, recortar las filas vacías
+        filled = index + 1
+        if filled < count:
+            columns = {name: values[:filled] for name, values in columns.items()}
+
+        return cls(columns, generation, time.time())
+
+    # ----- Persistencia -----
+    def save(self, directory):
+        """
+        Guarda las columnas en un subdirectorio nuevo y luego apunta
+        current.json a él con un reemplazo atómico.
+        """
+        os.makedirs(directory, exist_ok=True)
+        name = f'snapshot-{int(self.built_at * 1000)}-{os.getpid()}'
+        target = os.path.join(directory, name)
+        os.makedirs(target)
+        for column in COLUMNS:
+            np.save(os.path.join(target, f'{column}.npy'), getattr(self, column))
+
+        meta = {
+            'path': name, 'generation': self.generation, 'built_at': self.built_at,
+            'size': self.size, 'format': FORMAT_VERSION,
+        }
+        temp = os.path.join(directory, f'.{name}.json')
+        with open(temp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(temp, os.path.join(directory, CURRENT_FILE))
+
+        _remove_old_snapshots(directory, keep=name)
+
+    @classmethod
+    def load(cls, directory):
+        """Abre el snapshot vigente del directorio con memoria mapeada"""
+        try:
+            with open(os.path.join(directory, CURRENT_FILE)) as f:
+                meta = json.load(f)
+            if meta.get('format') != FORMAT_VERSION:
+                return None
+            target = os.path.join(directory, meta['path'])
+            columns = {
+                column: np.load(os.path.join(target, f'{column}.npy'), mmap_mode='r')
+                for column in COLUMNS
+            }
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"No se pudo abrir el snapshot en disco: {e}")
+            return None
+        return cls(columns, meta['generation'], meta['built_at'])
+
+    # ----- Máscaras -----
+    def company_mask(self, company_ids):
+        """Máscara booleana de las reseñas de las empresas indicadas"""
+        return np.isin(self.company_id, np.fromiter(company_ids, dtype='int32'))
+
+    def status_mask(self, status):
+        return self.status == STATUS_CODES[status]
+
+    def modality_mask(self, modality):
+        return self.modality == MODALITY_CODES.get(modality, -2)
+
+    def _select(self, column, mask=None):
+        values = getattr(self, column)
+        return values if mask is None else values[mask]
+
+    # ----- Agregados -----
+    def rating_distribution(self, mask=None):
+        """{calificación: cantidad} para calificaciones 1 a 5"""
+        counts = np.bincount(self._select('overall', mask), minlength=6)
+        return {rating: int(counts[rating]) for rating in range(1, 6) if counts[rating]}
+
+    def status_counts(self, mask=None):
+        """{status: cantidad} con las claves de Review.STATUS_CHOICES"""
+        values = self._select('status', mask)
+        values = values[values >= 0]
+        counts = np.bincount(values, minlength=len(STATUS_CODES))
+        return {status: int(counts[code]) for status, code in STATUS_CODES.items() if counts[code]}
+
+    def monthly_counts(self, since, mask=None):
+        """{índice de mes: cantidad} de las reseñas enviadas desde 'since'"""
+        recent = self.submitted >= int(since.timestamp())
+        if mask is not None:
+            recent &= mask
+        months, counts = np.unique(self.month[recent], return_counts=True)
+        return {int(month): int(count) for month, count in zip(months, counts)}
+
+    def mean(self, column='overall', mask=None):
+        """Promedio de una columna ignorando los valores sin dato (0)"""
+        values = self._select(column, mask)
+        values = values[values > 0]
+        return float(values.mean()) if values.size else None
+
+    def company_stats(self, mask=None):
+        """{company_id: (cantidad, promedio general)} de las reseñas seleccionadas"""
+        company_ids = self._select('company_id', mask)
+        overall = self._select('overall', mask)
+        if not company_ids.size:
+            return {}
+        ids, inverse = np.unique(company_ids, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=overall)
+        return {
+            int(company_id): (int(count), float(total) / int(count))
+            for company_id, count, total in zip(ids, counts, sums)
+        }
+
+    def group_stats(self, groups, mask=None):
+        """
+        Agrega reseñas por grupos de empresas (sector, ciudad...).
+
+        groups: {company_id: clave del grupo}. Retorna
+        {clave: {'companies', 'total_reviews', 'avg_rating'}}, donde
+        'companies' cuenta empresas distintas, tengan o no reseñas.
+        """
+        keys = sorted(set(groups.values()), key=str)
+        positions = {key: index for index, key in enumerate(keys)}
+        result = {key: {'companies': 0, 'total_reviews': 0, 'avg_rating': None} for key in keys}
+        for key in groups.values():
+            result[key]['companies'] += 1
+        if not groups:
+            return result
+
+        company_ids = self._select('company_id', mask)
+        overall = self._select('overall', mask)
+
+        # Tabla company_id -> índice de grupo (-1 = empresa fuera de los grupos)
+        size = max(int(company_ids.max()) if company_ids.size else 0, max(groups)) + 1
+        lookup = np.full(size, -1, dtype='int32')
+        lookup[np.fromiter(groups.keys(), dtype='int64')] = [positions[key] for key in groups.values()]
+
+        group_index = lookup[company_ids]
+        selected = group_index >= 0
+        group_index = group_index[selected]
+        counts = np.bincount(group_index, minlength=len(keys))
+        sums = np.bincount(group_index, weights=overall[selected], minlength=len(keys))
+
+        for key, position in positions.items():
+            if counts[position]:
+                result[key]['total_reviews'] = int(counts[position])
+                result[key]['avg_rating'] = float(sums[position]) / int(counts[position])
+        return result
+
+    def percentiles(self, column='overall', percentiles=(25, 50, 75, 90), mask=None):
+        """Percentiles de una columna ignorando los valores sin dato"""
+        values = self._select(column, mask)
+        values = values[values > 0]
+        if not values.size:
+            return {}
+        results = np.percentile(values, percentiles)
+        return {p: float(value) for p, value in zip(percentiles, results)}
+
+    def correlations(self, columns=SCORE_COLUMNS, mask=None):
+        """
+        Matriz de correlación de Pearson entre columnas de calificación,
+        usando solo las reseñas con todas las columnas informadas.
+        """
+        data = np.vstack([self._select(column, mask) for column in columns]).astype('float64')
+        complete = (data > 0).all(axis=0)
+        data = data[:, complete]
+        if data.shape[1] < 2:
+            return {}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = np.corrcoef(data)
+        return {
+            row: {
+                col: (None if np.isnan(matrix[i, j]) else round(float(matrix[i, j]), 3))
+                for j, col in enumerate(columns)
+            }
+            for i, row in enumerate(columns)
+        }
+
+
+def _remove_old_snapshots(directory, keep):
+    """Elimina los snapshots anteriores. Un proceso que aún los tenga mapeados
+    sigue leyendo su copia hasta cerrarla."""
+    for entry in os.listdir(directory):
+        if entry.startswith('snapshot-') and entry != keep:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+# ===== SNAPSHOT DEL PROCESO =====
+_lock = threading.Lock()
+_state = {'snapshot': None, 'checked_at': 0.0}
+
+
+def _ttl():
+    return getattr(settings, 'REVIEW_SNAPSHOT_TTL', 5 * 60)
+
+
+def _directory():
+    return getattr(settings, 'REVIEW_SNAPSHOT_DIR', None)
+
+
+def refresh_snapshot():
+    """Reconstruye el snapshot desde la base de datos y lo publica en disco"""
+    snapshot = ReviewSnapshot.build(get_generation(PLATFORM))
+    directory = _directory()
+    if directory:
+        try:
+            snapshot.save(directory)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el snapshot de reseñas: {e}")
+    with _lock:
+        _state['snapshot'] = snapshot
+        _state['checked_at'] = time.monotonic()
+    return snapshot
+
+
+def get_snapshot():
+    """
+    Retorna el snapshot vigente, o None si NumPy no está disponible.
+
+    Mientras no venza el TTL se reutiliza el snapshot en memoria. Al vencer
+    solo se reconstruye si la generación de la plataforma cambió; antes de
+    leer la base de datos se intenta el snapshot publicado en disco por otro
+    proceso o por el comando refresh_review_snapshot.
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+
+    with _lock:
+        snapshot = _state['snapshot']
+        if snapshot is not None and time.monotonic() - _state['checked_at'] < _ttl():
+            return snapshot
+
+    generation = get_generation(PLATFORM)
+    if snapshot is None or snapshot.generation != generation:
+        directory = _directory()
+        stored = ReviewSnapshot.load(directory) if directory else None
+        if stored is not None and stored.generation == generation:
+            snapshot = stored
+        else:
+            return refresh_snapshot()
+
+    with _lock:
+        _state['snapshot'] = snapshot
+        _state['checked_at'] = time.monotonic()
+    return snapshot
@@ -0,0 +1,205 @@
+# core/services/sitemaps.py
+"""
+Sitemap del sitio dividido en partes, con un índice en /sitemap.xml.
+
+Las empresas activas se reparten por rango de id: la parte N contiene las
+empresas con id entre N*SITEMAP_CHUNK_SIZE+1 y (N+1)*SITEMAP_CHUNK_SIZE.
+Como el rango es fijo, una empresa nueva o modificada solo cambia su parte
+y el buscador vuelve a descargar solo esa (ver el lastmod del índice).
+
+El lastmod de cada empresa es la fecha más reciente entre su última reseña
+aprobada y su updated_at; el de cada parte, el máximo de sus empresas.
+
+- El índice (partes, cantidad de URLs y lastmod) se calcula con una sola
+  consulta agrupada y se cachea con la generación de la plataforma.
+- Cada parte se genera por separado, ya comprimida con gzip, y se cachea
+  con una firma de su contenido (cantidad de URLs y lastmod). Un cambio en
+  una empresa no invalida las partes de las demás.
+
+Configuración opcional en settings.py:
+- SITEMAP_CHUNK_SIZE: URLs por parte (máximo 50.000 según el protocolo)
+- SITEMAP_CACHE_ALIAS: alias de CACHES donde se guardan índice y partes
+- SITEMAP_CACHE_TIMEOUT: TTL en segundos de las partes generadas
+"""
+
+import gzip
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from companies.models import Company
+from core.services.cache_generations import PLATFORM, versioned_key
+
+logger = logging.getLogger(__name__)
+
+# Límite de URLs por archivo del protocolo sitemaps.org
+MAX_CHUNK_SIZE = 50000
+
+KEY_PREFIX = 'sitemap'
+
+STATIC_SECTION = 'static'
+COMPANIES_SECTION = 'companies'
+
+# Páginas fijas: (nombre de la URL, changefreq, priority)
+STATIC_PAGES = [
+    ('root', 'daily', '1.0'),
+    ('dashboard', 'daily', '0.9'),
+    ('login', 'monthly', '0.7'),
+]
+
+
+def chunk_size():
+    return min(getattr(settings, 'SITEMAP_CHUNK_SIZE', MAX_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+
+def _cache():
+    return caches[getattr(settings, 'SITEMAP_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'SITEMAP_CACHE_TIMEOUT', 24 * 60 * 60)
+
+
+def _active_companies():
+    return Company.objects.filter(is_active=True)
+
+
+def _last_approved_review():
+    return Max('reviews__submission_date', filter=Q(reviews__status='approved'))
+
+
+# ===== ÍNDICE =====
+
+def _build_entries():
+    """Partes del sitemap con su cantidad de URLs y lastmod"""
+    size = chunk_size()
+    rows = (
+        _active_companies()
+        .annotate(chunk=(F('id') - 1) / size)
+        .values('chunk')
+        .annotate(
+            urls=Count('id', distinct=True),
+            last_review=_last_approved_review(),
+            last_update=Max('updated_at'),
+        )
+        .order_by('chunk')
+    )
+
+    entries = []
+    for row in rows:
+        dates = [value for value in (row['last_review'], row['last_update']) if value]
+        entries.append({
+            'section': COMPANIES_SECTION,
+            'chunk': row['chunk'],
+            'urls': row['urls'],
+            'lastmod': max(dates) if dates else None,
+        })
+
+    # Las páginas fijas (inicio, dashboard) cambian con cualquier empresa
+    dates = [entry['lastmod'] for entry in entries if entry['lastmod']]
+    entries.insert(0, {
+        'section': STATIC_SECTION,
+        'chunk': 0,
+        'urls': len(STATIC_PAGES),
+        'lastmod': max(dates) if dates else None,
+    })
+    return entries
+
+
+def sitemap_entries():
+    """Partes del sitemap (cacheadas hasta el próximo cambio en la plataforma)"""
+    cache = _cache()
+    key = versioned_key(PLATFORM, KEY_PREFIX, 'index', chunk_size())
+    entries = cache.get(key)
+    if entries is None:
+        entries = _build_entries()
+        try:
+            cache.set(key, entries, timeout=_timeout())
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el índice del sitemap en caché: {e}")
+    return entries
+
+
+def find_entry(section, chunk):
+    for entry in sitemap_entries():
+        if entry['section'] == section and entry['chunk'] == chunk:
+            return entry
+    return None
+
+
+def chunk_filename(entry):
+    return f"sitemap-{entry['section']}-{entry['chunk']}.xml.gz"
+
+
+def entry_signature(entry):
+    """Cambia solo si cambia el contenido de la parte"""
+    lastmod = entry['lastmod'].isoformat() if entry['lastmod'] else ''
+    return f"{entry['urls']}:{lastmod}"
+
+
+def render_index(base_url):
+    return render_to_string('core/sitemap_index.xml', {
+        'sitemaps': [
+            {'loc': f"{base_url}/{chunk_filename(entry)}", 'lastmod': entry['lastmod']}
+            for entry in sitemap_entries()
+        ],
+    })
+
+
+# ===== PARTES =====
+
+def _static_urls(base_url, entry):
+    return [
+        {'loc': f"{base_url}{reverse(name)}", 'lastmod': entry['lastmod'], 'changefreq': changefreq, 'priority': priority}
+        for name, changefreq, priority in STATIC_PAGES
+    ]
+
+
+def _company_urls(base_url, entry):
+    size = chunk_size()
+    first_id = entry['chunk'] * size + 1
+    rows = (
+        _active_companies()
+        .filter(id__gte=first_id, id__lt=first_id + size)
+        .annotate(lastmod=Greatest(Coalesce(_last_approved_review(), F('updated_at')), F('updated_at')))
+        .values_list('id', 'lastmod')
+        .order_by('id')
+    )
+    return [
+        {'loc': f"{base_url}{reverse('company_detail', args=[company_id])}", 'lastmod': lastmod,
+         'changefreq': 'weekly', 'priority': '0.8'}
+        for company_id, lastmod in rows
+    ]
+
+
+def _render_chunk(base_url, entry):
+    if entry['section'] == STATIC_SECTION:
+        urls = _static_urls(base_url, entry)
+    else:
+        urls = _company_urls(base_url, entry)
+    content = render_to_string('core/sitemap.xml', {'urls': urls})
+    return gzip.compress(content.encode('utf-8'), compresslevel=6)
+
+
+def chunk_gzip(base_url, entry):
+    """Bytes gzip de una parte del sitemap, cacheados por firma de contenido"""
+    cache = _cache()
+    host = hashlib.md5(base_url.encode('utf-8')).hexdigest()[:12]
+    key = ':'.join([
+        KEY_PREFIX, 'chunk', entry['section'], str(entry['chunk']), str(chunk_size()), host,
+        entry_signature(entry),
+    ])
+    data = cache.get(key)
+    if data is None:
+        data = _render_chunk(base_url, entry)
+        try:
+            cache.set(key, data, timeout=_timeout())
+        except Exception as e:
+            logger.warning(f"No se pudo guardar la parte del sitemap en caché ({key}): {e}")
+    return data
@@ -0,0 +1,94 @@
+# core/services/spanish_text.py
+"""
+Normalización de texto en español para los índices de búsqueda.
+
+- fold(): minúsculas y sin tildes ("Bogotá" -> "bogota"), igual que el
+  tokenizador unicode61 de FTS5 con remove_diacritics.
+- stem(): lematizador ligero por sufijos, inspirado en el algoritmo
+  Snowball para español. Quita primero un sufijo derivativo (-ción,
+  -miento, -mente, -idad...), después uno flexivo (plurales, participios,
+  gerundios, infinitivos) y por último la vocal final, de modo que
+  "entrevista", "entrevistas", "entrevistador" y "entrevistaron" quedan
+  en "entrevist". No es un analizador morfológico: solo debe ser estable,
+  porque se aplica igual al indexar y al buscar.
+
+Este módulo no depende de Django ni de los modelos (lo usan también las
+migraciones que crean los índices).
+"""
+
+import re
+import unicodedata
+
+_word_re = re.compile(r'\w+', re.UNICODE)
+
+# Longitud mínima de la raíz tras quitar un sufijo
+MIN_STEM = 3
+
+DERIVATIONAL_SUFFIXES = sorted([
+    'amientos', 'imientos', 'amiento', 'imiento',
+    'aciones', 'uciones', 'acion', 'ucion',
+    'adoras', 'adores', 'adora', 'ador',
+    'ancias', 'encias', 'ancia', 'encia',
+    'idades', 'idad',
+    'amente', 'mente',
+    'ables', 'ibles', 'able', 'ible',
+    'osos', 'osas', 'oso', 'osa',
+    'ivas', 'ivos', 'iva', 'ivo',
+], key=len, reverse=True)
+
+INFLECTIONAL_SUFFIXES = sorted([
+    'aremos', 'eremos', 'iremos', 'ieron', 'aron',
+    'ando', 'iendo', 'aban', 'aba',
+    'ados', 'adas', 'idos', 'idas', 'ado', 'ada', 'ido', 'ida',
+    'ar', 'er', 'ir',
+    'es', 'as', 'os', 's',
+], key=len, reverse=True)
+
+# Palabras vacías que se ignoran en las consultas (no en el índice)
+STOPWORDS = {
+    'a', 'al', 'algo', 'como', 'con', 'de', 'del', 'el', 'en', 'es', 'esta',
+    'este', 'fue', 'ha', 'la', 'las', 'le', 'lo', 'los', 'me', 'mi', 'muy',
+    'no', 'o', 'para', 'pero', 'por', 'que', 'se', 'si', 'sin', 'su', 'sus',
+    'te', 'un', 'una', 'uno', 'y', 'ya',
+}
+
+
+def fold(text):
+    """Minúsculas y sin tildes"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def words(text):
+    return _word_re.findall(fold(text))
+
+
+def _strip_suffix(word, suffixes):
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def stem(word):
+    """Raíz de una palabra (ya en minúsculas o no)"""
+    word = fold(word)
+    if len(word) <= MIN_STEM or not word.isalpha():
+        return word
+    word = _strip_suffix(word, DERIVATIONAL_SUFFIXES)
+    word = _strip_suffix(word, INFLECTIONAL_SUFFIXES)
+    if len(word) > MIN_STEM and word[-1] in 'aeo':
+        word = word[:-1]
+    return word
+
+
+def stem_text(text):
+    """Texto con cada palabra reemplazada por su raíz (contenido del índice)"""
+    return ' '.join(stem(word) for word in words(text))
+
+
+def query_stems(text):
+    """Raíces de una consulta sin palabras vacías (salvo que solo haya esas)"""
+    terms = words(text)
+    meaningful = [word for word in terms if word not in STOPWORDS]
+    return list(dict.fromkeys(stem(word) for word in (meaningful or terms)))
@@ -0,0 +1,162 @@
+# core/services/staff_console.py
+"""
+Consultas del dashboard de staff.
+
+Las métricas por empresa (cantidad de reseñas, promedio, tasa de rechazo y
+última actividad) se calculan con anotaciones en una sola consulta agregada,
+de modo que ordenar y filtrar ocurre en la base de datos y nunca se cargan
+las reseñas en memoria. La búsqueda usa el índice FTS5 de empresas
+(core/services/company_search.py) y permite ordenar por relevancia.
+"""
+
+from datetime import datetime, time
+
+from django.db.models import (
+    Avg, Case, Count, F, FloatField, ExpressionWrapper, Max, Q, Value, When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from companies.models import Company
+from core.services.company_search import filter_by_search
+from core.services.pagination import paginate_keyset
+
+# Tamaño de página del listado de empresas
+PAGE_SIZE = 24
+
+# Opciones de ordenamiento: clave en la URL -> (etiqueta, campo anotado)
+SORT_OPTIONS = {
+    'name': ('Nombre', 'name'),
+    'reviews': ('Cantidad de reseñas', 'total_reviews'),
+    'rating': ('Calificación promedio', 'avg_rating'),
+    'rejection': ('Tasa de rechazo', 'rejection_rate'),
+    'activity': ('Última actividad', 'last_activity'),
+    # Solo con búsqueda; ascendente = más relevante primero
+    'relevance': ('Relevancia', 'search_rank'),
+}
+
+DEFAULT_SORT = 'name'
+
+
+def annotated_companies():
+    """Empresas con sus métricas calculadas por la base de datos"""
+    return Company.objects.annotate(
+        total_reviews=Count('reviews'),
+        rejected_reviews=Count('reviews', filter=Q(reviews__status='rejected')),
+        avg_rating=Coalesce(Avg('reviews__overall_rating'), Value(0.0), output_field=FloatField()),
+        last_activity=Coalesce(Max('reviews__submission_date'), F('updated_at')),
+    ).annotate(
+        rejection_rate=Case(
+            When(total_reviews=0, then=Value(0.0)),
+            default=ExpressionWrapper(
+                F('rejected_reviews') * 100.0 / F('total_reviews'),
+                output_field=FloatField(),
+            ),
+            output_field=FloatField(),
+        )
+    )
+
+
+def _parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_date(value):
+    """Fecha AAAA-MM-DD o None (también si la fecha no existe, ej: 2024-02-31)"""
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+def parse_console_params(params):
+    """
+    Normaliza los parámetros GET del dashboard de staff.
+    Los valores inválidos se ignoran en lugar de producir un error.
+    """
+    search = params.get('search', '').strip()
+    # Con búsqueda y sin orden elegido, los resultados van por relevancia
+    sort = params.get('sort') or ('relevance' if search else DEFAULT_SORT)
+    descending = sort.startswith('-')
+    sort_key = sort.lstrip('-')
+    if sort_key not in SORT_OPTIONS or (sort_key == 'relevance' and not search):
+        sort_key, descending = DEFAULT_SORT, False
+
+    status = params.get('status', '')
+    if status not in ('active', 'inactive'):
+        status = ''
+
+    return {
+        'search': search,
+        'status': status,
+        'min_reviews': _parse_int(params.get('min_reviews')),
+        'min_rating': _parse_float(params.get('min_rating')),
+        'max_rating': _parse_float(params.get('max_rating')),
+        'min_rejection': _parse_float(params.get('min_rejection')),
+        'active_since': _parse_date(params.get('active_since')),
+        'sort_key': sort_key,
+        'descending': descending,
+        'sort': f'-{sort_key}' if descending else sort_key,
+    }
+
+
+def filter_console_queryset(queryset, filters):
+    """Aplica los filtros del dashboard sobre el queryset anotado"""
+    if filters['search']:
+        queryset, _ = filter_by_search(queryset, filters['search'])
+    if filters['status'] == 'active':
+        queryset = queryset.filter(is_active=True)
+    elif filters['status'] == 'inactive':
+        queryset = queryset.filter(is_active=False)
+    if filters['min_reviews'] is not None:
+        queryset = queryset.filter(total_reviews__gte=filters['min_reviews'])
+    if filters['min_rating'] is not None:
+        queryset = queryset.filter(avg_rating__gte=filters['min_rating'])
+    if filters['max_rating'] is not None:
+        queryset = queryset.filter(avg_rating__lte=filters['max_rating'])
+    if filters['min_rejection'] is not None:
+        queryset = queryset.filter(rejection_rate__gte=filters['min_rejection'])
+    if filters['active_since']:
+        since = timezone.make_aware(datetime.combine(filters['active_since'], time.min))
+        queryset = queryset.filter(last_activity__gte=since)
+    return queryset
+
+
+def console_page(params, cursor=None, page_size=PAGE_SIZE):
+    """
+    Retorna una página del listado de empresas para el staff junto con los
+    filtros normalizados y los cursores de navegación.
+    """
+    filters = parse_console_params(params)
+    queryset = filter_console_queryset(annotated_companies(), filters)
+
+    sort_field = SORT_OPTIONS[filters['sort_key']][1]
+    fields = [(sort_field, filters['descending'])]
+    if sort_field != 'name':
+        # El nombre como desempate hace el orden estable y legible
+        fields.append(('name', False))
+    fields.append(('id', filters['descending'] and sort_field == 'name'))
+
+    page = paginate_keyset(queryset, fields, cursor=cursor, page_size=page_size)
+    page['filters'] = filters
+    return page
+
+
+def platform_totals():
+    """Contadores globales del dashboard de staff en una sola consulta"""
+    return Company.objects.aggregate(
+        total_companies=Count('id'),
+        active_companies=Count('id', filter=Q(is_active=True)),
+        inactive_companies=Count('id', filter=Q(is_active=False)),
+    )
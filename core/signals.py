@@ -0,0 +1,142 @@
+# =============================================================================
+# SEÑALES DE LA APLICACIÓN CORE - SelecLoop
+# =============================================================================
+# Este archivo conecta los cambios en los modelos con los servicios que
+# mantienen datos derivados (cachés, índices, contadores).
+#
+# Se importa desde CoreConfig.ready() en core/apps.py
+# =============================================================================
+
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from companies.models import Company
+from reviews.models import Review, PendingReview
+from accounts.models import UserProfile
+from work_history.models import WorkHistory
+from achievements.models import Achievement, UserAchievement
+from core.services.cache_generations import (
+    CATALOG, PLATFORM, bump_generations, company_namespace, user_namespace,
+)
+from core.services import achievement_engine, badges, company_search, interview_questions, review_search
+from core.services.benchmarks import schedule_company_benchmark
+
+
+# ===== SEÑAL: INVALIDAR CACHÉS AL CAMBIAR UNA RESEÑA =====
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review_caches(sender, instance, **kwargs):
+    """Invalida la analítica de la empresa, del autor y de la plataforma"""
+    bump_generations(
+        company_namespace(instance.company_id),
+        user_namespace(instance.user_profile_id),
+        PLATFORM,
+    )
+    schedule_company_benchmark(instance.company_id)
+
+
+# ===== SEÑAL: ÍNDICE DE BÚSQUEDA DE RESEÑAS =====
+@receiver(post_save, sender=Review)
+def index_review_for_search(sender, instance, **kwargs):
+    """Agrega, reemplaza o quita la reseña del índice FTS5 según su estado"""
+    review_search.sync_review(instance)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_from_search(sender, instance, **kwargs):
+    review_search.remove_review(instance.pk)
+
+
+# ===== SEÑAL: ÍNDICE DE PREGUNTAS DE ENTREVISTA =====
+@receiver(post_save, sender=Review)
+def index_review_questions(sender, instance, **kwargs):
+    """Vuelve a extraer las preguntas de entrevista de la reseña (al confirmar)"""
+    interview_questions.schedule_review_index(instance.pk)
+
+
+@receiver(pre_delete, sender=Review)
+def remove_review_questions(sender, instance, **kwargs):
+    """Antes del borrado en cascada, para descontar las preguntas de la reseña"""
+    interview_questions.remove_review(instance)
+
+
+# ===== SEÑAL: CONTADORES DE INSIGNIA =====
+@receiver(post_save, sender=Review)
+def count_review_for_badge(sender, instance, created, **kwargs):
+    if created:
+        badges.review_added(instance.user_profile_id)
+
+
+@receiver(post_delete, sender=Review)
+def uncount_review_for_badge(sender, instance, **kwargs):
+    badges.review_removed(instance.user_profile_id)
+
+
+@receiver(post_save, sender=UserAchievement)
+def count_achievement_for_badge(sender, instance, created, **kwargs):
+    if created:
+        badges.achievement_added(instance.user_profile_id)
+
+
+@receiver(post_delete, sender=UserAchievement)
+def uncount_achievement_for_badge(sender, instance, **kwargs):
+    badges.achievement_removed(instance.user_profile_id)
+
+
+# ===== SEÑAL: LOGROS =====
+@receiver(post_save, sender=Review)
+def award_review_achievements(sender, instance, **kwargs):
+    """Evento de reseña aprobada: otorga los logros de reseñas y empresas"""
+    if instance.status == 'approved':
+        achievement_engine.safely(achievement_engine.review_approved, instance.user_profile_id)
+
+
+@receiver(post_save, sender=WorkHistory)
+def award_work_history_achievements(sender, instance, **kwargs):
+    achievement_engine.safely(achievement_engine.work_history_changed, instance.user_profile_id)
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def reload_achievement_rules(sender, instance, **kwargs):
+    achievement_engine.rules_changed()
+
+
+# ===== SEÑAL: INVALIDAR CACHÉS AL CAMBIAR UNA EMPRESA =====
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_caches(sender, instance, **kwargs):
+    """Invalida los datos cacheados de la empresa y de la plataforma"""
+    bump_generations(company_namespace(instance.pk), PLATFORM, CATALOG)
+    # Sector, ciudad o estado activo pueden haber cambiado
+    schedule_company_benchmark(instance.pk)
+
+
+# ===== SEÑAL: ÍNDICE DE BÚSQUEDA DE EMPRESAS =====
+@receiver(post_save, sender=Company)
+def index_company_for_search(sender, instance, **kwargs):
+    """Actualiza la empresa en el índice FTS5"""
+    company_search.index_company(instance)
+
+
+@receiver(post_delete, sender=Company)
+def remove_company_from_search(sender, instance, **kwargs):
+    company_search.remove_company(instance.pk)
+
+
+# ===== SEÑAL: INVALIDAR CACHÉS DEL USUARIO =====
+@receiver(post_save, sender=WorkHistory)
+@receiver(post_delete, sender=WorkHistory)
+@receiver(post_save, sender=UserAchievement)
+@receiver(post_delete, sender=UserAchievement)
+@receiver(post_save, sender=PendingReview)
+@receiver(post_delete, sender=PendingReview)
+def invalidate_user_caches(sender, instance, **kwargs):
+    """Invalida los datos cacheados del perfil del usuario"""
+    bump_generations(user_namespace(instance.user_profile_id))
+
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_profile_caches(sender, instance, **kwargs):
+    """Los datos del perfil se muestran en todas las páginas del usuario"""
+    bump_generations(user_namespace(instance.pk))
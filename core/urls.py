@@ -39,13 +39,6 @@ urlpatterns = [
     # Export CSV de reseñas por empresa (solo company_rep/staff)
     path('company/<int:company_id>/export-reviews.csv', views.export_company_reviews_csv, name='export_company_reviews_csv'),
 
-    # ===== VISTAS SEO =====
-    # Robots.txt para motores de búsqueda
-    path('robots.txt', views.robots_txt_view, name='robots_txt'),
-
-    # Sitemap.xml para motores de búsqueda
-    path('sitemap.xml', views.sitemap_xml_view, name='sitemap'),
-    
     # ===== VISTAS AEO (AI Engine Optimization) =====
     # Endpoint para datos estructurados para IA
     path('ai/data/', ai_views.ai_data_endpoint, name='ai_data'),
@@ -10,6 +10,7 @@
 from django import forms
 from .models import Review
 from companies.models import Company
+from companies.widgets import CompanyAutocompleteWidget
 
 
 # =============================================================================
@@ -40,10 +41,9 @@ class ReviewForm(forms.ModelForm):
     company = forms.ModelChoiceField(
         queryset=None,  # Se establece dinámicamente en la vista
         label="Empresa",
-        help_text="Selecciona la empresa donde participaste en el proceso de selección",
-        widget=forms.Select(attrs={
-            'class': 'form-control'
-        })
+        help_text="Escribe y selecciona la empresa donde participaste en el proceso de selección",
+        # Sugiere empresas mientras se escribe, sin enviar todo el listado en la página
+        widget=CompanyAutocompleteWidget()
     )
     
     job_title = forms.CharField(
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_availability_status_userprofile_city_and_more'),
+        ('companies', '0006_bulk_export_jobs'),
+        ('reviews', '0003_review_is_verified_review_verification_category_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['status', 'submission_date', 'id'], name='review_status_date_idx'),
+        ),
+    ]
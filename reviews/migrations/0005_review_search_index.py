@@ -0,0 +1,43 @@
+# Índice FTS5 de las reseñas aprobadas (ver core/services/review_search.py)
+
+from django.db import migrations
+
+from core.services.spanish_text import stem_text
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Review = apps.get_model('reviews', 'Review')
+    with schema_editor.connection.cursor() as cursor:
+        # El contenido ya va reducido a raíces; unicode61 solo separa palabras
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_review_fts USING fts5("
+            "pros, cons, interview_questions, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        rows = [
+            [review.pk, stem_text(review.pros), stem_text(review.cons), stem_text(review.interview_questions or '')]
+            for review in Review.objects.filter(status='approved').order_by('id')
+        ]
+        cursor.executemany(
+            "INSERT INTO reviews_review_fts (rowid, pros, cons, interview_questions) VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS reviews_review_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_review_status_date_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
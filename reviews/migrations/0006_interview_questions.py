@@ -0,0 +1,130 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+from core.services.interview_questions import (
+    SIMILARITY_THRESHOLD, normalize_job_title, similarity, split_questions,
+)
+
+
+def fill_interview_questions(apps, schema_editor):
+    """
+    Indexa las preguntas de las reseñas aprobadas existentes con la misma
+    extracción y agrupación que core/services/interview_questions.py, en
+    memoria y con inserciones masivas.
+    """
+    Review = apps.get_model('reviews', 'Review')
+    InterviewQuestion = apps.get_model('reviews', 'InterviewQuestion')
+    InterviewQuestionMention = apps.get_model('reviews', 'InterviewQuestionMention')
+
+    questions = []  # [empresa, texto, raíces, menciones, última vez]
+    by_company = {}
+    mentions = []  # (posición de la pregunta, reseña, cargo, texto)
+    reviews = (
+        Review.objects.filter(status='approved')
+        .exclude(interview_questions__isnull=True).exclude(interview_questions='')
+        .only('id', 'company_id', 'job_title', 'interview_questions', 'submission_date')
+        .order_by('submission_date', 'id')
+    )
+    for review in reviews.iterator(chunk_size=500):
+        job_title_key = normalize_job_title(review.job_title or '')
+        seen_at = review.submission_date or timezone.now()
+        linked = set()
+        for text, terms in split_questions(review.interview_questions):
+            company_questions = by_company.setdefault(review.company_id, [])
+            match, best_score = None, SIMILARITY_THRESHOLD
+            for position in company_questions:
+                if questions[position][2] == terms:
+                    match = position
+                    break
+                score = similarity(terms, questions[position][2])
+                if score >= best_score:
+                    match, best_score = position, score
+            if match is None:
+                match = len(questions)
+                questions.append([review.company_id, text, terms, 0, seen_at])
+                company_questions.append(match)
+            if match in linked:
+                continue
+            linked.add(match)
+            question = questions[match]
+            question[3] += 1
+            question[4] = max(question[4], seen_at)
+            mentions.append((match, review.pk, job_title_key, text))
+
+    created = InterviewQuestion.objects.bulk_create([
+        InterviewQuestion(
+            company_id=company_id, text=text, signature=' '.join(terms)[:255],
+            mention_count=mention_count, last_seen_at=last_seen_at,
+        )
+        for company_id, text, terms, mention_count, last_seen_at in questions
+    ], batch_size=1000)
+    if created and created[0].pk is None:
+        # Sin ids en bulk_create (backends sin RETURNING): se leen en orden
+        ids = list(InterviewQuestion.objects.order_by('id').values_list('id', flat=True))
+    else:
+        ids = [question.pk for question in created]
+    InterviewQuestionMention.objects.bulk_create([
+        InterviewQuestionMention(question_id=ids[position], review_id=review_id, job_title_key=job_title_key, text=text)
+        for position, review_id, job_title_key, text in mentions
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_company_search_index'),
+        ('reviews', '0005_review_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.CharField(help_text='Texto representativo (la primera versión encontrada)', max_length=300, verbose_name='Pregunta')),
+                ('signature', models.CharField(help_text='Raíces de las palabras significativas, ordenadas', max_length=255, verbose_name='Firma')),
+                ('mention_count', models.PositiveIntegerField(default=0, help_text='Reseñas aprobadas en las que aparece', verbose_name='Menciones')),
+                ('last_seen_at', models.DateTimeField(verbose_name='Última mención')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interview_question_index', to='companies.company', verbose_name='Empresa')),
+            ],
+            options={
+                'verbose_name': 'Pregunta de entrevista',
+                'verbose_name_plural': 'Preguntas de entrevista',
+                'ordering': ['-mention_count', '-last_seen_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='InterviewQuestionMention',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_title_key', models.CharField(help_text='Cargo sin tildes y reducido a raíces (agrupa variantes)', max_length=200, verbose_name='Cargo normalizado')),
+                ('text', models.CharField(max_length=300, verbose_name='Texto original')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mentions', to='reviews.interviewquestion', verbose_name='Pregunta')),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_mentions', to='reviews.review', verbose_name='Reseña')),
+            ],
+            options={
+                'verbose_name': 'Mención de pregunta',
+                'verbose_name_plural': 'Menciones de preguntas',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='interviewquestion',
+            index=models.Index(fields=['company', 'signature'], name='question_company_sig_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewquestion',
+            index=models.Index(fields=['company', '-mention_count'], name='question_company_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewquestionmention',
+            index=models.Index(fields=['job_title_key', 'question'], name='mention_title_question_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='interviewquestionmention',
+            unique_together={('question', 'review')},
+        ),
+        migrations.RunPython(fill_interview_questions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_badge_counters'),
+        ('companies', '0007_company_search_index'),
+        ('reviews', '0006_interview_questions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['company', 'status', 'submission_date', 'id'], name='review_company_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['company', 'status', 'overall_rating', 'submission_date'], name='review_company_rating_idx'),
+        ),
+    ]
@@ -6,6 +6,8 @@
 # Modelos:
 # - Review: Reseñas de procesos de selección
 # - PendingReview: Reseñas pendientes asignadas por staff
+# - InterviewQuestion: Pregunta de entrevista (agrupa las casi iguales) por empresa
+# - InterviewQuestionMention: Aparición de una pregunta en una reseña
 # =============================================================================
 
 from django.db import models
@@ -319,6 +321,13 @@ class Review(models.Model):
         verbose_name = "Reseña"
         verbose_name_plural = "Reseñas"
         ordering = ['-submission_date']  # Ordenar por fecha de envío (más reciente primero)
+        indexes = [
+            # Recorrido por cursor de reseñas aprobadas (endpoint de datos para IA)
+            models.Index(fields=['status', 'submission_date', 'id'], name='review_status_date_idx'),
+            # Listado por cursor de las reseñas de una empresa (core/services/review_feed.py)
+            models.Index(fields=['company', 'status', 'submission_date', 'id'], name='review_company_date_idx'),
+            models.Index(fields=['company', 'status', 'overall_rating', 'submission_date'], name='review_company_rating_idx'),
+        ]
 
 
 # ===== MODELO: RESEÑA PENDIENTE =====
@@ -378,4 +387,95 @@ class PendingReview(models.Model):
         verbose_name = "Reseña Pendiente"
         verbose_name_plural = "Reseñas Pendientes"
         ordering = ['-participation_date']  # Ordenar por fecha de participación
-        unique_together = ['user_profile', 'company', 'job_title']  # Evitar duplicados
\ No newline at end of file
+        unique_together = ['user_profile', 'company', 'job_title']  # Evitar duplicados
+
+
+# ===== MODELO: PREGUNTA DE ENTREVISTA =====
+class InterviewQuestion(models.Model):
+    """
+    Pregunta de entrevista de una empresa extraída de las reseñas aprobadas.
+    Agrupa las preguntas casi iguales (misma firma de raíces o muy parecida);
+    la mantiene core/services/interview_questions.py.
+    """
+
+    company = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        verbose_name="Empresa",
+        related_name="interview_question_index"
+    )
+
+    text = models.CharField(
+        max_length=300,
+        verbose_name="Pregunta",
+        help_text="Texto representativo (la primera versión encontrada)"
+    )
+
+    signature = models.CharField(
+        max_length=255,
+        verbose_name="Firma",
+        help_text="Raíces de las palabras significativas, ordenadas"
+    )
+
+    mention_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Menciones",
+        help_text="Reseñas aprobadas en las que aparece"
+    )
+
+    last_seen_at = models.DateTimeField(
+        verbose_name="Última mención"
+    )
+
+    def __str__(self):
+        return f"{self.text} ({self.mention_count})"
+
+    class Meta:
+        verbose_name = "Pregunta de entrevista"
+        verbose_name_plural = "Preguntas de entrevista"
+        ordering = ['-mention_count', '-last_seen_at']
+        indexes = [
+            models.Index(fields=['company', 'signature'], name='question_company_sig_idx'),
+            models.Index(fields=['company', '-mention_count'], name='question_company_top_idx'),
+        ]
+
+
+# ===== MODELO: MENCIÓN DE PREGUNTA =====
+class InterviewQuestionMention(models.Model):
+    """Aparición de una pregunta en una reseña, con el cargo normalizado"""
+
+    question = models.ForeignKey(
+        InterviewQuestion,
+        on_delete=models.CASCADE,
+        verbose_name="Pregunta",
+        related_name="mentions"
+    )
+
+    review = models.ForeignKey(
+        Review,
+        on_delete=models.CASCADE,
+        verbose_name="Reseña",
+        related_name="question_mentions"
+    )
+
+    job_title_key = models.CharField(
+        max_length=200,
+        verbose_name="Cargo normalizado",
+        help_text="Cargo sin tildes y reducido a raíces (agrupa variantes)"
+    )
+
+    text = models.CharField(
+        max_length=300,
+        verbose_name="Texto original"
+    )
+
+    def __str__(self):
+        return f"{self.question_id} en reseña {self.review_id}"
+
+    class Meta:
+        verbose_name = "Mención de pregunta"
+        verbose_name_plural = "Menciones de preguntas"
+        unique_together = ['question', 'review']
+        indexes = [
+            models.Index(fields=['job_title_key', 'question'], name='mention_title_question_idx'),
+        ]
@@ -12,6 +12,9 @@ urlpatterns = [
     
     # Ver las reseñas del usuario actual
     path('my-reviews/', views.my_reviews_view, name='my_reviews'),
+
+    # Buscar en el contenido de las reseñas aprobadas
+    path('reviews/search/', views.search_reviews_view, name='search_reviews'),
     
     # Eliminar una reseña
     path('delete-review/<int:review_id>/', views.delete_review_view, name='delete_review'),
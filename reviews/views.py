@@ -6,6 +6,7 @@
 # Vistas principales:
 # - create_review_view: Crear una nueva reseña
 # - my_reviews_view: Ver las reseñas del usuario
+# - search_reviews_view: Buscar en el contenido de las reseñas aprobadas
 # =============================================================================
 
 from django.shortcuts import render, redirect, get_object_or_404
@@ -16,61 +17,10 @@ from django.core.paginator import Paginator
 from .models import Review, PendingReview
 from .forms import ReviewForm
 from accounts.models import OnboardingStatus
-from achievements.models import Achievement, UserAchievement
 from work_history.models import WorkHistory
 from companies.models import Company
-
-
-def check_and_award_achievements(user_profile):
-    """
-    Verifica y otorga logros automáticamente al usuario.
-    Se ejecuta después de acciones importantes como crear reseñas.
-    """
-    try:
-        # Obtener logros activos
-        active_achievements = Achievement.objects.filter(is_active=True)
-        
-        # Obtener logros ya obtenidos por el usuario
-        user_achievements = UserAchievement.objects.filter(user_profile=user_profile).values_list('achievement_id', flat=True)
-        
-        # Contar solo reseñas APROBADAS del usuario (las rechazadas no cuentan para logros)
-        review_count = Review.objects.filter(user_profile=user_profile, status='approved').count()
-        
-        # Contar empresas únicas en reseñas APROBADAS
-        company_count = Review.objects.filter(user_profile=user_profile, status='approved').values('company').distinct().count()
-        
-        # Contar experiencias laborales
-        work_history_count = WorkHistory.objects.filter(user_profile=user_profile).count()
-        
-        new_achievements = []
-        
-        for achievement in active_achievements:
-            # Saltar si ya tiene el logro
-            if achievement.id in user_achievements:
-                continue
-                
-            # Verificar criterios según el tipo de logro
-            if achievement.achievement_type == 'first_review' and review_count >= 1:
-                new_achievements.append(achievement)
-            elif achievement.achievement_type == 'review_count' and review_count >= achievement.required_value:
-                new_achievements.append(achievement)
-            elif achievement.achievement_type == 'company_count' and company_count >= achievement.required_value:
-                new_achievements.append(achievement)
-            elif achievement.achievement_type == 'work_history' and work_history_count >= achievement.required_value:
-                new_achievements.append(achievement)
-        
-        # Otorgar nuevos logros
-        for achievement in new_achievements:
-            UserAchievement.objects.create(
-                user_profile=user_profile,
-                achievement=achievement
-            )
-            
-        return new_achievements
-        
-    except Exception as e:
-        print(f"Error al verificar logros: {e}")
-        return []
+from core.services import review_search
+from core.services.achievement_engine import recent_awards
 
 
 @login_required
@@ -122,6 +72,8 @@ def create_review_view(request):
                 review.user_profile = request.user.profile
                 review.is_approved = False
                 # No establecer status aquí - el método save() del modelo lo manejará con la verificación automática
+                # Los logros se otorgan al aprobarse la reseña (core/signals.py)
+                saved_at = timezone.now()
                 review.save()
                 
                 # Marcar pendiente como completada (sistema anterior)
@@ -162,8 +114,8 @@ def create_review_view(request):
                 # Mensaje según el estado de la reseña
                 if review.status == 'approved':
                     messages.success(request, f'✅ ¡Reseña aprobada exitosamente! Tu reseña para {company.name} ha sido publicada.')
-                    # Solo otorgar logros si la reseña fue APROBADA
-                    new_achievements = check_and_award_achievements(request.user.profile)
+                    # Solo se otorgan logros si la reseña fue APROBADA
+                    new_achievements = recent_awards(request.user.profile, saved_at)
                     # Mostrar logros obtenidos
                     if new_achievements:
                         for achievement in new_achievements:
@@ -256,6 +208,43 @@ def my_reviews_view(request):
     return render(request, 'core/my_reviews.html', context)
 
 
+@login_required
+def search_reviews_view(request):
+    """
+    Búsqueda de texto completo en las reseñas aprobadas de todas las empresas
+    (aspectos positivos, a mejorar y preguntas de entrevista), con filtros
+    por empresa, sector, modalidad y fechas. Ver core/services/review_search.py.
+    """
+    # Los candidatos con reseñas pendientes no ven el contenido de las empresas
+    profile = getattr(request.user, 'profile', None)
+    if profile and profile.role == 'candidate' and not request.user.is_staff:
+        if PendingReview.objects.filter(user_profile=profile, is_reviewed=False).exists():
+            messages.warning(request, '⚠️ Completa tu reseña pendiente para ver esta información.')
+            return redirect('my_reviews')
+
+    filters = review_search.parse_search_params(request.GET)
+    search = review_search.search_reviews(filters)
+
+    # Parámetros actuales sin la página, para los enlaces de paginación
+    query_params = request.GET.copy()
+    query_params.pop('page', None)
+
+    active_companies = Company.objects.filter(is_active=True)
+    context = {
+        'filters': filters,
+        'results': search['results'],
+        'total': search['total'],
+        'page': search['page'],
+        'has_prev': search['has_prev'],
+        'has_next': search['has_next'],
+        'query_string': query_params.urlencode(),
+        'companies': active_companies.order_by('name').values('id', 'name'),
+        'sectors': active_companies.values_list('sector', flat=True).distinct().order_by('sector'),
+        'modality_choices': Review.MODALITY_CHOICES,
+    }
+    return render(request, 'reviews/search_reviews.html', context)
+
+
 @login_required
 def delete_review_view(request, review_id):
     """Vista para eliminar una reseña del usuario"""
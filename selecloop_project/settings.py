@@ -8,6 +8,7 @@ configuración de seguridad y más.
 Generado automáticamente por Django 5.2.4
 """
 
+import os
 from pathlib import Path
 
 # ===== CONFIGURACIÓN DE RUTAS =====
@@ -57,6 +58,7 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 # Capas de procesamiento que se ejecutan en cada request
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',        # Seguridad básica
+    'common.middleware.CompressionMiddleware',              # Compresión brotli/gzip de la API
     'django.contrib.sessions.middleware.SessionMiddleware', # Gestión de sesiones
     'django.middleware.common.CommonMiddleware',            # Funcionalidad común
     'django.middleware.csrf.CsrfViewMiddleware',            # Protección CSRF
@@ -146,4 +148,124 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # URLs para el sistema de login/logout
 LOGIN_URL = 'login'                  # Página de login
 LOGIN_REDIRECT_URL = 'dashboard'     # Página después del login exitoso
-LOGOUT_REDIRECT_URL = 'login'        # Página después del logout
\ No newline at end of file
+LOGOUT_REDIRECT_URL = 'login'        # Página después del logout
+
+# ===== CONFIGURACIÓN DE CACHÉ =====
+# Dos niveles:
+# - 'default': memoria local del proceso (rápida, no se comparte)
+# - 'shared': compartida entre procesos y servidores. Por defecto usa
+#   archivos en disco; con REDIS_URL o MEMCACHED_LOCATION en el entorno se
+#   usa Redis o Memcached sin cambiar código. En pruebas puede reemplazarse
+#   por LocMemCache con override_settings.
+if os.environ.get('REDIS_URL'):
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+elif os.environ.get('MEMCACHED_LOCATION'):
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ['MEMCACHED_LOCATION'],
+    }
+else:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('SHARED_CACHE_DIR', str(BASE_DIR / 'var' / 'cache')),
+    }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'selecloop-local',
+    },
+    'shared': {
+        **SHARED_CACHE,
+        'KEY_PREFIX': 'selecloop',
+        'TIMEOUT': 60 * 60,
+    },
+}
+
+# Invalidación entre nodos: cada nodo memoriza la generación de un espacio
+# de nombres (company:<id>, user:<id>, platform) durante estos segundos
+# antes de volver a leerla de la base de datos (tabla CacheGeneration)
+CACHE_GENERATION_LOCAL_ALIAS = 'default'
+CACHE_GENERATION_LOCAL_TTL = 5
+
+# ===== CACHÉ DE ANALÍTICA POR EMPRESA =====
+# Alias de CACHES donde se guardan chart_data, company_stats y role_kpis
+ANALYTICS_CACHE_ALIAS = 'shared'
+ANALYTICS_CACHE_TIMEOUT = 60 * 60    # 1 hora
+
+# ===== SNAPSHOT COLUMNAR DE RESEÑAS =====
+# Analítica de plataforma sobre arreglos NumPy (core/services/review_snapshot.py).
+# Se reconstruye al vencer el TTL si cambió alguna reseña o empresa. En el
+# directorio se publica para que los demás procesos lo abran con memoria
+# mapeada; se puede refrescar por cron con "manage.py refresh_review_snapshot".
+REVIEW_SNAPSHOT_TTL = 5 * 60         # 5 minutos
+REVIEW_SNAPSHOT_DIR = os.environ.get('REVIEW_SNAPSHOT_DIR', str(BASE_DIR / 'var' / 'snapshots'))
+
+# ===== PETICIONES CONDICIONALES (ETag / Last-Modified) =====
+# Ver core/services/http_caching.py. Cambiar HTTP_ETAG_VERSION en cada
+# despliegue invalida los ETag de las páginas (las plantillas cambiaron).
+HTTP_ETAG_VERSION = os.environ.get('HTTP_ETAG_VERSION', '')
+HTTP_PUBLIC_MAX_AGE = 5 * 60         # Datos públicos (endpoints para IA)
+HTTP_SEO_MAX_AGE = 60 * 60           # sitemap.xml y robots.txt
+
+# ===== COMPRESIÓN DE RESPUESTAS =====
+# common/middleware.py: brotli (si está instalado) o gzip para JSON, NDJSON,
+# XML y texto a partir de este tamaño. HTML queda fuera (BREACH).
+COMPRESSION_MIN_SIZE = 1024
+
+# ===== LÍMITE DE PETICIONES =====
+# Token bucket por cliente y endpoint (core/services/rate_limit.py).
+# capacity: ráfaga máxima; per_minute: ritmo sostenido. El staff no tiene límite.
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() != 'false'
+RATE_LIMITS = {
+    'ai': {'capacity': 60, 'per_minute': 60},
+    'export': {'capacity': 10, 'per_minute': 10},
+}
+RATE_LIMIT_CACHE_ALIAS = 'shared'
+RATE_LIMIT_EXEMPT_IPS = [ip for ip in os.environ.get('RATE_LIMIT_EXEMPT_IPS', '').split(',') if ip]
+RATE_LIMIT_PROXY_COUNT = int(os.environ.get('RATE_LIMIT_PROXY_COUNT', '0'))
+
+# ===== BÚSQUEDA DE TEXTO COMPLETO =====
+# Índices FTS5 de SQLite (core/services/company_search.py); se reconstruyen
+# con "manage.py rebuild_search_index". El tope aplica solo a las listas
+# cortas (search_company_ids); el dashboard y la consola filtran sin tope.
+SEARCH_MAX_RESULTS = 500
+
+# ===== AUTOCOMPLETADO DE EMPRESAS =====
+# Índice en memoria por proceso (core/services/company_autocomplete.py)
+AUTOCOMPLETE_LIMIT = 8
+# Similitud de trigramas a partir de la cual un nombre escrito a mano se
+# asigna a una empresa existente (historial laboral, merge_companies --list)
+COMPANY_DEDUP_THRESHOLD = 0.6
+HTTP_AUTOCOMPLETE_MAX_AGE = 60       # Sugerencias en caché del navegador
+
+# ===== LISTADO DE RESEÑAS =====
+# Reseñas por página en el detalle de empresa (las siguientes se cargan al bajar)
+REVIEW_FEED_PAGE_SIZE = 12
+
+# ===== SITEMAP =====
+# Índice en /sitemap.xml y partes gzip de hasta 50.000 URLs
+# (core/services/sitemaps.py)
+SITEMAP_CHUNK_SIZE = 50000
+SITEMAP_CACHE_ALIAS = 'shared'
+SITEMAP_CACHE_TIMEOUT = 24 * 60 * 60  # 1 día (se regeneran al cambiar su contenido)
+
+# ===== DOCUMENTOS PRECALCULADOS PARA IA =====
+# JSON (y .gz) de /ai/data/ y /ai/company/<id>/ (core/services/ai_snapshots.py).
+# Se regeneran al cambiar la generación de la plataforma o de la empresa, o
+# con "manage.py refresh_ai_snapshots".
+AI_SNAPSHOT_DIR = os.environ.get('AI_SNAPSHOT_DIR', str(BASE_DIR / 'var' / 'ai'))
+AI_SNAPSHOT_MIN_AGE = 60             # segundos entre regeneraciones de un documento
+AI_SNAPSHOT_MAX_AGE = 5 * 60         # Cache-Control max-age de las respuestas
+
+# ===== EXPORTACIONES EN SEGUNDO PLANO =====
+# Los reportes se generan en MEDIA_ROOT/exports con el comando
+# "manage.py run_export_jobs" (cron o --loop). Con RUN_IN_THREAD además se
+# lanza un hilo por trabajo al encolarlo (suficiente con un solo servidor).
+EXPORT_JOBS_RUN_IN_THREAD = os.environ.get('EXPORT_JOBS_RUN_IN_THREAD', 'True') == 'True'
+EXPORT_JOB_TIMEOUT = 30 * 60         # 30 minutos
+EXPORT_JOBS_RETENTION_DAYS = 7
+BULK_EXPORT_WORKERS = 4              # Procesos del pool en la exportación masiva
@@ -10,6 +10,8 @@
 from django import forms
 from .models import WorkHistory
 from companies.models import Company
+from companies.widgets import CompanyAutocompleteWidget
+from core.services.company_autocomplete import resolve_company
 
 
 # ===== FORMULARIO: HISTORIAL LABORAL =====
@@ -24,11 +26,8 @@ class WorkHistoryForm(forms.ModelForm):
         max_length=200,
         label="Empresa",
         help_text="Escribe el nombre de la empresa o selecciona una existente",
-        widget=forms.TextInput(attrs={
-            'class': 'form-control',
+        widget=CompanyAutocompleteWidget(free_text=True, attrs={
             'placeholder': 'Ej: Google, Microsoft, Empresa Local...',
-            'list': 'companies-list',
-            'autocomplete': 'off',
             'id': 'company-input'
         })
     )
@@ -91,7 +90,12 @@ class WorkHistoryForm(forms.ModelForm):
         if not company_name:
             raise forms.ValidationError("Debes especificar el nombre de la empresa.")
         
-        # Buscar empresa existente
+        # Empresa existente con el mismo nombre sin importar tildes, mayúsculas,
+        # espacios ni razón social, o con un nombre casi igual (errores de tipeo)
+        company = resolve_company(company_name)
+        if company:
+            return company
+        
         company, created = Company.objects.get_or_create(
             name=company_name.strip(),
             defaults={
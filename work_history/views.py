@@ -11,49 +11,10 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.utils import timezone
 from .models import WorkHistory
 from .forms import WorkHistoryForm
-from achievements.models import Achievement, UserAchievement
-
-
-def check_and_award_achievements(user_profile):
-    """
-    Verifica y otorga logros automáticamente al usuario.
-    Se ejecuta después de acciones importantes como agregar historial laboral.
-    """
-    try:
-        # Obtener logros activos
-        active_achievements = Achievement.objects.filter(is_active=True)
-        
-        # Obtener logros ya obtenidos por el usuario
-        user_achievements = UserAchievement.objects.filter(user_profile=user_profile).values_list('achievement_id', flat=True)
-        
-        # Contar experiencias laborales
-        work_history_count = WorkHistory.objects.filter(user_profile=user_profile).count()
-        
-        new_achievements = []
-        
-        for achievement in active_achievements:
-            # Saltar si ya tiene el logro
-            if achievement.id in user_achievements:
-                continue
-                
-            # Verificar criterios según el tipo de logro
-            if achievement.achievement_type == 'work_history' and work_history_count >= achievement.required_value:
-                new_achievements.append(achievement)
-        
-        # Otorgar nuevos logros
-        for achievement in new_achievements:
-            UserAchievement.objects.create(
-                user_profile=user_profile,
-                achievement=achievement
-            )
-            
-        return new_achievements
-        
-    except Exception as e:
-        print(f"Error al verificar logros: {e}")
-        return []
+from core.services.achievement_engine import recent_awards
 
 
 @login_required
@@ -98,10 +59,11 @@ def edit_work_history_view(request, work_id):
         if form.is_valid():
             work_history = form.save(commit=False)
             work_history.user_profile = request.user.profile
+            saved_at = timezone.now()
             work_history.save()
             
-            # Verificar logros después de editar
-            new_achievements = check_and_award_achievements(request.user.profile)
+            # Logros otorgados al guardar (core/signals.py)
+            new_achievements = recent_awards(request.user.profile, saved_at)
             if new_achievements:
                 for achievement in new_achievements:
                     messages.success(request, f'🏆 ¡Nuevo logro desbloqueado: {achievement.name}!')
@@ -175,13 +137,14 @@ def add_work_history_view(request):
                 # Crear la experiencia laboral
                 work_history = form.save(commit=False)
                 work_history.user_profile = request.user.profile
+                saved_at = timezone.now()
                 work_history.save()
                 
                 # Crear reseña pendiente automáticamente
                 work_history.create_pending_review()
                 
-                # Verificar y otorgar logros
-                new_achievements = check_and_award_achievements(request.user.profile)
+                # Logros otorgados al guardar (core/signals.py)
+                new_achievements = recent_awards(request.user.profile, saved_at)
                 
                 messages.success(request, f'✅ Experiencia laboral agregada exitosamente para {work_history.company.name}. Se ha creado una reseña pendiente.')
                 
@@ -198,14 +161,9 @@ def add_work_history_view(request):
     else:
         form = WorkHistoryForm()
     
-    # Obtener empresas existentes para autocompletado
-    from companies.models import Company
-    existing_companies = Company.objects.filter(is_active=True).order_by('name')
-    
     context = {
         'form': form,
         'title': 'Agregar Experiencia Laboral',
-        'existing_companies': existing_companies
     }
     
     return render(request, 'core/add_work_history.html', context)
\ No newline at end of file